@@ -10,5 +10,5 @@ class AccountsConfig(AppConfig):
     # Définir une priorité haute pour cette app
     def ready(self):
         """Initialisation de l'application accounts."""
-        # Vous pouvez ajouter d'autres initialisations ici si nécessaire
-        pass
+        # Invalidation du cache des utilisateurs authentifiés par jeton
+        from . import signals  # noqa: F401
@@ -0,0 +1,123 @@
+"""
+Authentification JWT sans requête sur la table des utilisateurs.
+
+request.user est un TokenPrincipal construit depuis les claims du jeton
+(identifiant, username, is_staff). La ligne complète de l'utilisateur est
+mise en cache (USER_CACHE_TIMEOUT) et n'est lue qu'au premier accès à un
+autre champ.
+
+Chaque sauvegarde ou suppression d'un utilisateur supprime sa ligne du
+cache et le marque « modifié » pour la durée de vie des jetons de
+rafraîchissement : tant que ce marqueur existe, la ligne fait foi sur les
+claims, ce qui applique immédiatement une désactivation ou un retrait des
+droits. Les claims d'un jeton de rafraîchissement sont recopiés dans chaque
+jeton d'accès qu'il produit : un marqueur limité à la durée des jetons
+d'accès laisserait un jeton rafraîchi rendre des droits retirés. Les
+modifications par QuerySet.update() ne passent pas par les signaux.
+
+Ce marqueur n'atteint les autres workers que si le cache est partagé
+(Redis) : avec un cache propre au processus (LocMemCache, par défaut sans
+REDIS_URL), la ligne est relue en base à chaque requête.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User, TokenPrincipal
+
+# Claims ajoutés au jeton d'accès (voir TokenObtainPairWithClaimsSerializer)
+PRINCIPAL_CLAIMS = ('username', 'is_staff')
+
+# Caches propres à chaque processus : les invalidations n'y sont pas partagées
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Le hash du mot de passe ne va pas dans le cache
+CACHED_USER_FIELDS = [
+    field.attname for field in User._meta.concrete_fields if field.attname != 'password'
+]
+
+
+def _row_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def _changed_key(user_id):
+    return f'accounts:user:{user_id}:changed'
+
+
+def cache_is_shared():
+    """Indique si le cache par défaut est partagé entre les processus"""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+
+
+def get_user_row(user_id):
+    """
+    Retourne les champs de l'utilisateur (hors mot de passe), depuis le cache
+    ou la base ; toujours depuis la base si le cache n'est pas partagé.
+    """
+    shared = cache_is_shared()
+    row = cache.get(_row_key(user_id)) if shared else None
+    if row is None:
+        row = User.objects.filter(pk=user_id).values(*CACHED_USER_FIELDS).first()
+        if row is not None and shared:
+            cache.set(_row_key(user_id), row, timeout=settings.USER_CACHE_TIMEOUT)
+    return row
+
+
+def invalidate_user(user_id):
+    """Oublie la ligne en cache et fait primer la base sur les claims des jetons en cours"""
+    cache.delete(_row_key(user_id))
+    # Un jeton de rafraîchissement émis avant la modification porte encore les anciens claims
+    lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    timeout = int(lifetime.total_seconds())
+    cache.set(_changed_key(user_id), True, timeout=timeout)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Variante de JWTAuthentication qui construit request.user depuis les
+    claims du jeton, sans requête tant que l'utilisateur n'a pas changé.
+    Sans cache partagé, la ligne est lue en base à chaque requête (une
+    requête, comme JWTAuthentication).
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # La vérification porte sur le mot de passe, absent du cache
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if cache_is_shared():
+            cached = cache.get_many([_row_key(user_id), _changed_key(user_id)])
+            row = cached.get(_row_key(user_id))
+            claims_usable = (
+                _changed_key(user_id) not in cached
+                and all(claim in validated_token for claim in PRINCIPAL_CLAIMS)
+            )
+        else:
+            # Les invalidations des autres workers n'atteignent pas ce cache
+            row, claims_usable = None, False
+        if row is None and not claims_usable:
+            row = get_user_row(user_id)
+            if row is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if row is not None:
+            if api_settings.CHECK_USER_IS_ACTIVE and not row['is_active']:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+            return TokenPrincipal.from_db('default', list(row), list(row.values()))
+
+        values = {
+            api_settings.USER_ID_FIELD: user_id,
+            **{claim: validated_token[claim] for claim in PRINCIPAL_CLAIMS},
+        }
+        return TokenPrincipal.from_db('default', list(values), list(values.values()))
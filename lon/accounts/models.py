@@ -11,17 +11,48 @@ class User(AbstractUser):
     phone = models.CharField(max_length=15, blank=True, null=True, verbose_name="Téléphone")
     function = models.CharField(max_length=100, blank=True, null=True, verbose_name="Fonction")
     company = models.CharField(max_length=100, blank=True, null=True, verbose_name="Entreprise")
+    # Entre dans l'ETag des flux qui reprennent le nom de l'utilisateur (calendrier)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
     
     class Meta:
         verbose_name = "Utilisateur"
         verbose_name_plural = "Utilisateurs"
 
+
+class TokenPrincipal(User):
+    """
+    Utilisateur reconstruit depuis les claims du jeton d'accès
+    (voir accounts.authentication). Les champs absents des claims sont
+    chargés tous ensemble au premier accès, depuis le cache puis la base.
+    """
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        if fields is None or from_queryset is not None:
+            return super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        from .authentication import get_user_row
+        row = get_user_row(self.pk) or {}
+        for attname, value in row.items():
+            self.__dict__.setdefault(attname, value)
+        missing = [name for name in fields if name not in self.__dict__]
+        if missing:
+            # Champs hors cache (mot de passe) ou utilisateur supprimé
+            super().refresh_from_db(using=using, fields=missing)
+
+
 class Notification(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
     message = models.TextField(verbose_name="Message")
     is_read = models.BooleanField(default=False, verbose_name="Lue")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
 
+    class Meta:
+        indexes = [
+            # Notifications (non lues) d'un utilisateur, des plus récentes aux plus anciennes
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notification_user_read_idx'),
+        ]
+
     def __str__(self):
         return f"Notification pour {self.user.username}"
 
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .authentication import PRINCIPAL_CLAIMS
 from .models import User, Notification
 
 class UserSerializer(serializers.ModelSerializer):
@@ -11,4 +13,15 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'user', 'message', 'is_read', 'created_at']
-        read_only_fields = ['created_at']
\ No newline at end of file
+        read_only_fields = ['created_at']
+
+
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    """Ajoute au jeton les claims lus par CachedJWTAuthentication"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in PRINCIPAL_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
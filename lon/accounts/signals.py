@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+from .models import User, Notification
+from .utils import forget_unread, increment_unread
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def user_changed(sender, instance, **kwargs):
+    # Sans filtre sur sender : les sauvegardes de TokenPrincipal sont
+    # émises avec le proxy pour expéditeur
+    if isinstance(instance, User):
+        invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    user_id = instance.user_id
+    if created and not instance.is_read:
+        transaction.on_commit(lambda: increment_unread([user_id]))
+    elif not created:
+        # Lue ou non lue : le compteur sera recompté à la prochaine lecture
+        transaction.on_commit(lambda: forget_unread(user_id))
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: forget_unread(user_id))
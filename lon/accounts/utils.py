@@ -1,8 +1,202 @@
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.dispatch import Signal
+
 from .models import Notification
 
+logger = logging.getLogger(__name__)
+
+# Taille des lots d'INSERT des notifications
+NOTIFICATION_BATCH_SIZE = 500
+
+_executor = None
+
+# Envoyé après un envoi groupé (bulk_create n'émet pas post_save).
+# Arguments : user_ids, message
+notifications_created = Signal()
+
 
 def create_notification(user, message):
     """
        Crée une notification pour un utilisateur spécifique.
        """
     Notification.objects.create(user=user, message=message)
+
+
+def _unread_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _unread_generation_key(user_id):
+    return f'notifications:unread:{user_id}:generation'
+
+
+def _bump_unread_generation(user_id):
+    """Signale une modification du compteur, avant de le modifier (voir unread_count)"""
+    key = _unread_generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=settings.NOTIFICATION_COUNT_CACHE_TIMEOUT)
+
+
+def unread_count(user_id):
+    """
+    Nombre de notifications non lues de l'utilisateur, servi par un compteur en
+    cache ; compté en base (index user, is_read) seulement si le compteur est absent.
+
+    Une notification validée entre le comptage et la mise en cache manquerait
+    au compteur : chaque modification incrémente d'abord une génération, relue
+    après la mise en cache ; si elle a changé, le compteur est supprimé et
+    sera recompté.
+    """
+    key = _unread_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        generation = cache.get(_unread_generation_key(user_id))
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, timeout=settings.NOTIFICATION_COUNT_CACHE_TIMEOUT)
+        if cache.get(_unread_generation_key(user_id)) != generation:
+            cache.delete(key)
+    return count
+
+
+def increment_unread(user_ids):
+    """Incrémente les compteurs présents en cache (les absents seront recomptés)"""
+    for user_id in user_ids:
+        _bump_unread_generation(user_id)
+        try:
+            cache.incr(_unread_key(user_id))
+        except ValueError:
+            pass
+
+
+def forget_unread(user_id):
+    _bump_unread_generation(user_id)
+    cache.delete(_unread_key(user_id))
+
+
+def mark_all_read(user_id):
+    """
+    Marque toutes les notifications de l'utilisateur comme lues en un seul
+    UPDATE. Le compteur est supprimé plutôt que remis à zéro, ce qui
+    écraserait les incréments de notifications créées entre-temps.
+    """
+    updated = Notification.objects.filter(user_id=user_id, is_read=False).update(is_read=True)
+    transaction.on_commit(lambda: forget_unread(user_id))
+    return updated
+
+
+def _executor_instance():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.NOTIFICATION_WORKERS, thread_name_prefix='notifications'
+        )
+    return _executor
+
+
+def _user_ids(users):
+    """Accepte des utilisateurs, des identifiants ou un QuerySet d'utilisateurs"""
+    if hasattr(users, 'values_list'):
+        return set(users.values_list('pk', flat=True))
+    return {getattr(user, 'pk', user) for user in users}
+
+
+def _write_notifications(user_ids, message):
+    Notification.objects.bulk_create(
+        [Notification(user_id=user_id, message=message) for user_id in user_ids],
+        batch_size=NOTIFICATION_BATCH_SIZE
+    )
+    # bulk_create n'émet pas post_save
+    transaction.on_commit(lambda: increment_unread(user_ids))
+    notifications_created.send(sender=Notification, user_ids=user_ids, message=message)
+
+
+def _write_in_background(user_ids, message):
+    try:
+        _write_notifications(user_ids, message)
+    except Exception:
+        logger.exception("Envoi de %d notifications impossible", len(user_ids))
+    finally:
+        # Le thread ouvre sa propre connexion : la fermer après chaque tâche
+        connection.close()
+
+
+def notify_users(users, message, background=False):
+    """
+    Crée la même notification pour plusieurs utilisateurs en un seul bulk_create.
+
+    Avec background=True, l'écriture a lieu après le commit de la transaction
+    courante dans un thread de fond (NOTIFICATION_WORKERS), pour que la durée
+    de la requête ne dépende pas du nombre de destinataires ; si
+    NOTIFICATION_BACKGROUND est désactivé, elle a lieu au commit dans le
+    thread courant. Retourne le nombre de destinataires.
+    """
+    user_ids = _user_ids(users)
+    if not user_ids:
+        return 0
+    if not background:
+        _write_notifications(user_ids, message)
+    elif settings.NOTIFICATION_BACKGROUND:
+        transaction.on_commit(
+            lambda: _executor_instance().submit(_write_in_background, user_ids, message)
+        )
+    else:
+        transaction.on_commit(lambda: _write_notifications(user_ids, message))
+    return len(user_ids)
+
+
+def notify_each(messages):
+    """
+    Crée des notifications personnalisées, données par couples
+    (utilisateur ou identifiant, message) : une notification par couple,
+    doublons compris. Les couples sont consommés au fil de l'itération et
+    écrits par lots de NOTIFICATION_BATCH_SIZE, sans être tous gardés en
+    mémoire. Retourne le nombre de notifications créées.
+    """
+    count = 0
+    batch = []
+    for user, message in messages:
+        batch.append(Notification(user_id=getattr(user, 'pk', user), message=message))
+        if len(batch) >= NOTIFICATION_BATCH_SIZE:
+            _write_batch(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        _write_batch(batch)
+        count += len(batch)
+    return count
+
+
+def _write_batch(notifications):
+    Notification.objects.bulk_create(notifications)
+    # Un incrément par notification
+    user_ids = [notification.user_id for notification in notifications]
+    transaction.on_commit(lambda: increment_unread(user_ids))
+    recipients = defaultdict(list)
+    for notification in notifications:
+        recipients[notification.message].append(notification.user_id)
+    for message, message_user_ids in recipients.items():
+        notifications_created.send(sender=Notification, user_ids=message_user_ids, message=message)
+
+
+def notify_project_team(project, message, include_manager=True, exclude=None, background=False):
+    """
+    Notifie les membres de l'équipe d'un projet (et son chef de projet),
+    sauf les utilisateurs de `exclude` (typiquement l'auteur de l'action).
+    """
+    user_ids = set(
+        project.team_members.through.objects.filter(project_id=project.pk)
+        .values_list('user_id', flat=True)
+    )
+    if include_manager:
+        user_ids.add(project.manager_id)
+    if exclude:
+        user_ids -= _user_ids(exclude)
+    return notify_users(user_ids, message, background=background)
@@ -1,7 +1,12 @@
 # ... existing imports ...
 from rest_framework import viewsets, generics
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from .serializers import UserSerializer, NotificationSerializer
+from .models import Notification
+from .utils import mark_all_read, unread_count
+from api.pagination import CreatedAtKeysetPagination, UserKeysetPagination
 from django.contrib.auth import get_user_model
 
 User = get_user_model() 
@@ -9,6 +14,7 @@ User = get_user_model()
 class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserKeysetPagination
 
     def get_queryset(self):
         # Pour la création/édition de projet, on permet de voir tous les utilisateurs
@@ -22,10 +28,26 @@ class UserViewSet(viewsets.ModelViewSet):
 class NotificationViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtKeysetPagination
 
     def get_queryset(self):
         # Les utilisateurs ne voient que leurs propres notifications
-        return Notification.objects.filter(user=self.request.user)
+        queryset = Notification.objects.filter(user=self.request.user).order_by('-created_at')
+        is_read = self.request.query_params.get('is_read')
+        if is_read in ('true', 'false'):
+            queryset = queryset.filter(is_read=is_read == 'true')
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """Nombre de notifications non lues, lu depuis le cache (appelé en boucle par le frontend)"""
+        return Response({'unread_count': unread_count(request.user.pk)})
+
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        """Marque toutes les notifications de l'utilisateur comme lues"""
+        updated = mark_all_read(request.user.pk)
+        return Response({'updated': updated, 'unread_count': 0})
 
 class UserListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
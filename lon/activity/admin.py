@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import ActivityEvent
+
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'summary', 'verb', 'target_type', 'project', 'actor')
+    list_filter = ('verb', 'target_type')
+    search_fields = ('summary', 'project__name', 'actor__username')
+    list_select_related = ('project', 'actor')
+
+    # Journal en ajout seul
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
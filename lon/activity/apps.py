@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ActivityConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'activity'
+    verbose_name = "Journal d'activité"
+
+    def ready(self):
+        # Enregistrement des événements depuis les sauvegardes de projets, tâches et documents
+        from . import signals  # noqa: F401
@@ -0,0 +1,63 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import transaction
+
+from .recorder import open_buffer, reset_buffer
+
+
+class ActivityMiddleware:
+    """
+    Exécute les requêtes d'écriture dans une transaction et regroupe leurs
+    événements d'activité : ils sont écrits en un seul lot au commit de
+    cette transaction (voir activity.recorder). Une réponse 5xx annule la
+    transaction, et avec elle les événements ; une erreur d'écriture du
+    journal n'est pas masquée. Les lectures (GET, HEAD, OPTIONS) ne
+    paient pas de transaction.
+
+    Sous ASGI, les lectures restent asynchrones de bout en bout ; les
+    écritures sont traitées dans un thread, où la transaction et la vue
+    partagent la même connexion.
+    """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request, self.get_response)
+
+    async def __acall__(self, request):
+        if request.method not in self.safe_methods:
+            return await sync_to_async(self.handle)(request, async_to_sync(self.get_response))
+        buffer, token = open_buffer(request)
+        try:
+            response = await self.get_response(request)
+            if buffer.events:
+                await sync_to_async(buffer.flush)()
+            else:
+                buffer.flush()
+        finally:
+            reset_buffer(token)
+        return response
+
+    def handle(self, request, get_response):
+        buffer, token = open_buffer(request)
+        try:
+            if request.method in self.safe_methods:
+                response = get_response(request)
+                buffer.flush()
+                return response
+            with transaction.atomic():
+                response = get_response(request)
+                if response.status_code >= 500:
+                    transaction.set_rollback(True)
+                else:
+                    transaction.on_commit(buffer.flush)
+        finally:
+            reset_buffer(token)
+        return response
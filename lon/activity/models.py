@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from projects.models import Project
+
+
+class ActivityEventQuerySet(models.QuerySet):
+    def visible_to(self, user, project_ids):
+        """
+        Événements visibles par l'utilisateur : tous pour le personnel, sinon
+        ceux des projets accessibles (`project_ids`) et ses propres actions.
+        """
+        if user.is_staff:
+            return self
+        return self.filter(Q(project_id__in=project_ids) | Q(actor=user))
+
+
+class ActivityEvent(models.Model):
+    """
+    Événement du journal d'activité. Le journal est en ajout seul : les
+    événements sont écrits par lots (voir activity.recorder) et jamais modifiés.
+    """
+    VERB_CHOICES = [
+        ('created', 'Création'),
+        ('updated', 'Modification'),
+        ('status_changed', 'Changement de statut'),
+    ]
+
+    TARGET_CHOICES = [
+        ('project', 'Projet'),
+        ('task', 'Tâche'),
+        ('document', 'Document'),
+    ]
+
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events',
+        verbose_name="Projet"
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events',
+        verbose_name="Auteur"
+    )
+    verb = models.CharField(max_length=20, choices=VERB_CHOICES, verbose_name="Action")
+    target_type = models.CharField(max_length=20, choices=TARGET_CHOICES, verbose_name="Type d'objet")
+    target_id = models.PositiveBigIntegerField(verbose_name="Identifiant de l'objet")
+    summary = models.CharField(max_length=255, verbose_name="Résumé")
+    changes = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder, verbose_name="Modifications")
+    # Horodaté à l'enregistrement de l'événement, pas à l'écriture du lot
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Date")
+
+    objects = ActivityEventQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Événement"
+        verbose_name_plural = "Événements"
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Flux d'un projet et flux d'un utilisateur, paginés par (created_at, id)
+            models.Index(fields=['project', '-created_at', '-id'], name='activity_project_created_idx'),
+            models.Index(fields=['actor', '-created_at', '-id'], name='activity_actor_created_idx'),
+            # Flux global (personnel)
+            models.Index(fields=['-created_at', '-id'], name='activity_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.summary
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Les événements d'activité ne peuvent pas être modifiés.")
+        super().save(*args, **kwargs)
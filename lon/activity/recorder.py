@@ -0,0 +1,81 @@
+"""
+Écriture groupée des événements d'activité.
+
+Pendant une requête HTTP, ActivityMiddleware ouvre un tampon et une
+transaction : chaque événement est ajouté au tampon au commit de cette
+transaction, sauf s'il a été produit dans un bloc annulé, puis le tampon est
+écrit en un seul bulk_create, par un rappel on_commit enregistré en dernier
+dans la même transaction. Les événements sans
+auteur reçoivent l'utilisateur authentifié de la requête. Hors requête
+(commandes, shell), chaque événement est écrit après le commit.
+"""
+from contextvars import ContextVar
+
+from django.db import transaction
+
+from .models import ActivityEvent
+
+# Taille des lots d'INSERT
+BATCH_SIZE = 500
+
+_current_buffer = ContextVar('activity_buffer', default=None)
+
+
+class ActivityBuffer:
+    def __init__(self, request=None):
+        self.request = request
+        self.events = []
+        self.closed = False
+
+    def add(self, event):
+        if self.closed:
+            # Transaction validée après la fin de la requête
+            self.write([event])
+        else:
+            self.events.append(event)
+
+    def actor(self):
+        user = getattr(self.request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user
+        return None
+
+    def write(self, events):
+        actor = self.actor()
+        for event in events:
+            if event.actor_id is None and actor is not None:
+                event.actor_id = actor.pk
+        ActivityEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+
+    def flush(self):
+        self.closed = True
+        events, self.events = self.events, []
+        if events:
+            self.write(events)
+
+
+def open_buffer(request=None):
+    """Ouvre un tampon pour le contexte courant ; retourne (tampon, jeton de reset_buffer)"""
+    buffer = ActivityBuffer(request)
+    return buffer, _current_buffer.set(buffer)
+
+
+def reset_buffer(token):
+    _current_buffer.reset(token)
+
+
+def record(**fields):
+    """
+    Enregistre un événement (champs d'ActivityEvent). L'écriture est
+    différée au commit de la transaction courante.
+    """
+    summary = fields.get('summary', '')
+    max_length = ActivityEvent._meta.get_field('summary').max_length
+    if len(summary) > max_length:
+        fields['summary'] = summary[:max_length - 1] + '…'
+    event = ActivityEvent(**fields)
+    buffer = _current_buffer.get()
+    if buffer is None:
+        transaction.on_commit(lambda: ActivityBuffer().write([event]))
+    else:
+        transaction.on_commit(lambda: buffer.add(event))
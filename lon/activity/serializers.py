@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from .models import ActivityEvent
+
+
+class ActivityEventSerializer(serializers.ModelSerializer):
+    actor_name = serializers.CharField(source='actor.username', read_only=True, default=None)
+
+    class Meta:
+        model = ActivityEvent
+        fields = [
+            'id', 'project', 'actor', 'actor_name', 'verb', 'target_type', 'target_id',
+            'summary', 'changes', 'created_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,127 @@
+"""
+Alimentation du journal d'activité depuis les écritures de projets,
+de tâches et de documents.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from projects.models import Project
+from tasks.models import Task, TaskDocument
+from tasks.signals import task_status_changed, tasks_bulk_saved
+from .recorder import record
+
+# Champs mis à jour automatiquement, non reportés dans les modifications
+IGNORED_FIELDS = {'created_at', 'updated_at', 'priority_rank'}
+
+TASK_STATUS_LABELS = dict(Task.STATUS_CHOICES)
+
+
+def tracked_changes(instance, update_fields):
+    """
+    Retourne {champ: [ancienne, nouvelle valeur]} des champs sauvegardés dont
+    la valeur a changé, d'après les valeurs chargées (TrackedFieldsMixin).
+    """
+    if not update_fields:
+        return {}
+    changes = {}
+    for name in update_fields:
+        field = instance._meta.get_field(name)
+        if field.name in IGNORED_FIELDS:
+            continue
+        old = instance.get_loaded_value(field.attname)
+        new = getattr(instance, field.attname)
+        if old != new:
+            changes[field.name] = [old, new]
+    return changes
+
+
+def status_summary(title, old_status, new_status):
+    return (
+        f"Tâche « {title} » : {TASK_STATUS_LABELS.get(old_status, old_status)}"
+        f" → {TASK_STATUS_LABELS.get(new_status, new_status)}"
+    )
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        record(
+            project_id=instance.pk, verb='created', target_type='project', target_id=instance.pk,
+            summary=f"Projet « {instance.name} » créé",
+        )
+        return
+    changes = tracked_changes(instance, update_fields)
+    if update_fields and not changes:
+        return
+    record(
+        project_id=instance.pk, verb='updated', target_type='project', target_id=instance.pk,
+        summary=f"Projet « {instance.name} » modifié", changes=changes,
+    )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        record(
+            project_id=instance.project_id, actor_id=instance.created_by_id, verb='created',
+            target_type='task', target_id=instance.pk, summary=f"Tâche « {instance.title} » créée",
+        )
+        return
+    changes = tracked_changes(instance, update_fields)
+    if update_fields and not changes:
+        return
+    if list(changes) == ['status']:
+        verb, summary = 'status_changed', status_summary(instance.title, *changes['status'])
+    else:
+        verb, summary = 'updated', f"Tâche « {instance.title} » modifiée"
+    record(
+        project_id=instance.project_id, verb=verb, target_type='task', target_id=instance.pk,
+        summary=summary, changes=changes,
+    )
+
+
+@receiver(task_status_changed)
+def tasks_transitioned(sender, transitions, **kwargs):
+    for transition in transitions:
+        old_status, new_status = transition['old_status'], transition['new_status']
+        record(
+            project_id=transition['project_id'], verb='status_changed', target_type='task',
+            target_id=transition['task_id'],
+            summary=status_summary(transition['title'], old_status, new_status),
+            changes={'status': [old_status, new_status]},
+        )
+
+
+@receiver(tasks_bulk_saved)
+def tasks_bulk_written(sender, tasks, created, changes, **kwargs):
+    for index, task in enumerate(tasks):
+        if created:
+            record(
+                project_id=task.project_id, actor_id=task.created_by_id, verb='created',
+                target_type='task', target_id=task.pk, summary=f"Tâche « {task.title} » créée",
+            )
+            continue
+        task_changes = {
+            name: values for name, values in changes[index].items() if values[0] != values[1]
+        }
+        if task_changes:
+            record(
+                project_id=task.project_id, verb='updated', target_type='task', target_id=task.pk,
+                summary=f"Tâche « {task.title} » modifiée", changes=task_changes,
+            )
+
+
+def document_project_id(document):
+    """Projet du document : depuis la tâche déjà chargée, sinon lu seul en base"""
+    if TaskDocument.task.is_cached(document):
+        return document.task.project_id
+    return Task.objects.filter(pk=document.task_id).values_list('project_id', flat=True).first()
+
+
+@receiver(post_save, sender=TaskDocument)
+def document_saved(sender, instance, created, **kwargs):
+    record(
+        project_id=document_project_id(instance), actor_id=instance.uploaded_by_id if created else None,
+        verb='created' if created else 'updated', target_type='document', target_id=instance.pk,
+        summary=f"Document « {instance.title} » {'ajouté' if created else 'modifié'}",
+    )
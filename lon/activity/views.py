@@ -0,0 +1,34 @@
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+
+from api.pagination import CreatedAtKeysetPagination
+from projects.access import request_project_ids
+from .models import ActivityEvent
+from .serializers import ActivityEventSerializer
+
+
+class ActivityEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Flux d'activité, du plus récent au plus ancien.
+    Filtres : ?project=<id>, ?actor=<id>, ?target_type=<type>&target_id=<id>
+    """
+    serializer_class = ActivityEventSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtKeysetPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        project_ids = None if user.is_staff else request_project_ids(self.request)
+        queryset = ActivityEvent.objects.visible_to(user, project_ids).select_related('actor')
+
+        params = self.request.query_params
+        for param in ('project', 'actor', 'target_id'):
+            value = params.get(param)
+            if value:
+                if not value.isdigit():
+                    raise ValidationError({param: ["Un identifiant entier est attendu."]})
+                queryset = queryset.filter(**{param: int(value)})
+        if params.get('target_type'):
+            queryset = queryset.filter(target_type=params['target_type'])
+        return queryset
@@ -0,0 +1,79 @@
+"""
+Chemins de lecture asynchrones, utilisés quand l'application est servie en
+ASGI (réglage ASYNC_VIEWS, voir gunicorn.conf.py).
+
+Django REST framework ne gère que des vues synchrones : les GET des vues
+enveloppées sont servis par une coroutine qui reprend les étapes de
+APIView.dispatch() (authentification, permissions, gestion des erreurs,
+négociation du rendu) et lit la base avec l'ORM asynchrone ; les autres
+méthodes passent par la vue synchrone d'origine. Sous WSGI, les vues sont
+laissées telles quelles.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+
+async def adispatch(view, request, handler, args, kwargs):
+    """Équivalent asynchrone de APIView.dispatch() pour le gestionnaire `handler`"""
+    view.args = args
+    view.kwargs = kwargs
+    request = view.initialize_request(request, *args, **kwargs)
+    view.request = request
+    view.headers = view.default_response_headers
+    try:
+        # Authentification (cache, éventuellement base) et permissions
+        await sync_to_async(view.initial)(request, *args, **kwargs)
+        response = await handler(request, *args, **kwargs)
+    except Exception as exc:
+        response = view.handle_exception(exc)
+    view.response = view.finalize_response(request, response, *args, **kwargs)
+    return view.response
+
+
+def _async_wrapper(view, make_handler):
+    """Vue asynchrone servant les GET par make_handler(instance) et le reste par `view`"""
+    sync_view = sync_to_async(view)
+
+    async def async_view(request, *args, **kwargs):
+        if request.method != 'GET':
+            return await sync_view(request, *args, **kwargs)
+        instance = view.cls(**view.initkwargs)
+        return await adispatch(instance, request, make_handler(instance), args, kwargs)
+
+    # cls, initkwargs, actions, csrf_exempt... (utilisés par le routeur et les schémas)
+    async_view.__dict__.update(view.__dict__)
+    async_view.__name__ = view.__name__
+    async_view.__doc__ = view.__doc__
+    return async_view
+
+
+def async_read_view(view, handler):
+    """
+    Enveloppe une vue fonction DRF (@api_view) : en mode asynchrone, ses GET
+    sont servis par la coroutine `handler(request, *args, **kwargs)`.
+    """
+    if not settings.ASYNC_VIEWS:
+        return view
+    return _async_wrapper(view, lambda instance: handler)
+
+
+class AsyncListMixin:
+    """
+    ViewSet dont la liste est servie, en mode asynchrone, par la coroutine
+    alist() à définir par la vue.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ASYNC_VIEWS or not actions or actions.get('get') != 'list':
+            return view
+
+        def make_handler(instance):
+            # Ce que fait la vue de ViewSetMixin.as_view() avant dispatch()
+            instance.action_map = actions
+            for method, action in actions.items():
+                setattr(instance, method, getattr(instance, action))
+            return instance.alist
+
+        return _async_wrapper(view, make_handler)
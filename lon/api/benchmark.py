@@ -0,0 +1,110 @@
+"""
+Mesure de la latence et du nombre de requêtes SQL des principaux endpoints.
+
+Chaque endpoint est appelé à travers toute la pile Django (middlewares,
+authentification JWT, sérialisation) avec le client de test ; les résultats
+(percentiles de latence, requêtes par appel) forment une base de référence
+JSON que compare() confronte à une nouvelle mesure.
+Utilisé par la commande bench_api.
+"""
+import statistics
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from accounts.serializers import TokenObtainPairWithClaimsSerializer
+from projects.models import Project
+from tasks.models import Task
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def endpoints(project, task):
+    """
+    Endpoints mesurés : nom -> fonction(itération) retournant (méthode, chemin, données).
+    La tâche `task` alterne entre « À faire » et « En cours ».
+    """
+    def change_status(iteration):
+        status = 'in_progress' if iteration % 2 == 0 else 'todo'
+        return 'post', f'/api/tasks/{task.pk}/change_status/', {'status': status}
+
+    return {
+        'projects_list': lambda iteration: ('get', '/api/projects/', None),
+        'tasks_list': lambda iteration: ('get', '/api/tasks/', None),
+        'tasks_calendar': lambda iteration: ('get', '/api/tasks/calendar/', None),
+        'tasks_by_project': lambda iteration: ('get', f'/api/tasks/project/{project.pk}/', None),
+        'task_change_status': change_status,
+    }
+
+
+def benchmark_target(users):
+    """Choisit l'utilisateur mesuré (chef d'un projet), son projet et une tâche de ce projet"""
+    project = Project.objects.filter(manager__in=users, tasks__isnull=False).order_by('pk').first()
+    if project is None:
+        raise ValueError("Aucun projet avec des tâches pour le benchmark.")
+    task = project.tasks.order_by('pk').first()
+    Task.objects.filter(pk=task.pk).update(status='todo')
+    return project.manager, project, task
+
+
+def measure(user, project, task, iterations=30, warmup=3):
+    """Mesure chaque endpoint ; retourne {nom: {p50, p95, p99, mean, queries}} (latences en ms)"""
+    token = TokenObtainPairWithClaimsSerializer.get_token(user).access_token
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+    cache.clear()
+
+    results = {}
+    for name, make_request in endpoints(project, task).items():
+        durations = []
+        queries = 0
+        for iteration in range(warmup + iterations):
+            method, path, data = make_request(iteration)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                if method == 'get':
+                    response = client.get(path, data)
+                else:
+                    response = client.post(path, data, content_type='application/json')
+                elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                raise ValueError(f"{name} : réponse {response.status_code} pour {path}")
+            if iteration >= warmup:
+                durations.append(elapsed)
+                queries = max(queries, len(captured))
+        results[name] = {
+            'p50': round(statistics.median(durations), 3),
+            'p95': round(percentile(durations, 0.95), 3),
+            'p99': round(percentile(durations, 0.99), 3),
+            'mean': round(statistics.fmean(durations), 3),
+            'queries': queries,
+        }
+    return results
+
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    Compare deux mesures endpoint par endpoint.
+    Régression : p95 au-delà de la référence de plus de `tolerance` (fraction),
+    ou davantage de requêtes SQL qu'en référence.
+    Retourne la liste des lignes de comparaison (dict) ; `regressions` liste
+    les critères dépassés.
+    """
+    rows = []
+    for name, result in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append({'endpoint': name, 'current': result, 'baseline': None, 'regressions': []})
+            continue
+        regressions = []
+        if result['p95'] > reference['p95'] * (1 + tolerance):
+            regressions.append('latency')
+        if result['queries'] > reference['queries']:
+            regressions.append('queries')
+        rows.append({'endpoint': name, 'current': result, 'baseline': reference, 'regressions': regressions})
+    return rows
@@ -0,0 +1,102 @@
+"""
+Résumé du tableau de bord, calculé par agrégats et mis en cache par utilisateur.
+
+Les membres du personnel voient l'ensemble des projets ; les autres
+utilisateurs, les projets dont ils sont chef ou membre et les tâches qui
+leur sont visibles.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from activity.models import ActivityEvent
+from projects.access import request_project_ids
+from projects.models import Project, TASK_STATS_ANNOTATIONS, task_stats_aggregates
+from tasks.models import Task
+
+# Nombre de projets récents et d'activités récentes renvoyés
+RECENT_PROJECTS = 5
+RECENT_ACTIVITIES = 10
+
+
+def _cache_key(user_id):
+    return f'dashboard:summary:{user_id}'
+
+
+def _project_counts(projects):
+    aggregates = {
+        f'status_{status}': Count('id', filter=Q(status=status))
+        for status, _ in Project.STATUS_CHOICES
+    }
+    values = projects.aggregate(
+        total=Count('id'), clients=Count('client', distinct=True), **aggregates
+    )
+    return {
+        'total': values['total'],
+        'clients': values['clients'],
+        'by_status': {
+            status: values[f'status_{status}'] for status, _ in Project.STATUS_CHOICES
+        },
+    }
+
+
+def _task_counts(tasks):
+    values = tasks.order_by().aggregate(**task_stats_aggregates())
+    counts = {key: values[name] for key, name in TASK_STATS_ANNOTATIONS.items()}
+    return {
+        'total': counts.pop('total'),
+        'overdue': counts.pop('overdue'),
+        'by_status': counts,
+    }
+
+
+def _recent_projects(projects):
+    return list(projects.order_by('-created_at', '-id').values(
+        'id', 'name', 'status', 'start_date', 'budget', 'created_at',
+        client_name=F('client__name'),
+    )[:RECENT_PROJECTS])
+
+
+def _recent_activities(user, project_ids):
+    """Derniers événements du journal d'activité visibles par l'utilisateur"""
+    events = ActivityEvent.objects.visible_to(user, project_ids).values(
+        'id', 'verb', 'target_type', 'summary', 'created_at', user_name=F('actor__username')
+    )[:RECENT_ACTIVITIES]
+    return [
+        {
+            'id': event['id'],
+            'type': f"{event['target_type']}_{event['verb']}".upper(),
+            'description': event['summary'],
+            'user_name': event['user_name'],
+            'created_at': event['created_at'],
+        }
+        for event in events
+    ]
+
+
+def build_summary(request):
+    user = request.user
+    if user.is_staff:
+        project_ids = None
+        projects = Project.objects.all()
+        tasks = Task.objects.all()
+    else:
+        project_ids = request_project_ids(request)
+        projects = Project.objects.filter(pk__in=project_ids)
+        tasks = Task.objects.visible_to(user, project_ids)
+    return {
+        'projects': _project_counts(projects),
+        'tasks': _task_counts(tasks),
+        'recent_projects': _recent_projects(projects),
+        'recent_activities': _recent_activities(user, project_ids),
+    }
+
+
+def dashboard_summary(request):
+    """Retourne le résumé du tableau de bord de l'utilisateur, depuis le cache si possible"""
+    key = _cache_key(request.user.pk)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_summary(request)
+        cache.set(key, summary, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+    return summary
@@ -0,0 +1,237 @@
+"""
+Générateur de données synthétiques (benchmarks, tests de montée en charge).
+
+Toutes les valeurs sont tirées d'un random.Random initialisé par `seed` : à
+paramètres égaux, deux exécutions produisent les mêmes données. Les lignes
+sont écrites par bulk_create, par lots de `batch_size` ; les signaux post_save
+(journal d'activité, notifications, temps réel) ne sont donc pas émis, et
+les statistiques des projets sont recalculées une fois les tâches créées.
+"""
+import itertools
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from accounts.models import Notification
+from clients.models import Client
+from projects.models import Project
+from projects.stats import refresh_project_stats
+from tasks.models import Task, TaskDocument
+
+User = get_user_model()
+
+# Mot de passe de tous les comptes générés
+DEFAULT_PASSWORD = 'bench-password'
+
+CITIES = ['Paris', 'Lyon', 'Marseille', 'Lille', 'Nantes', 'Bordeaux', 'Toulouse', 'Rennes']
+TRADES = ['Maçonnerie', 'Plomberie', 'Électricité', 'Charpente', 'Peinture', 'Carrelage', 'Toiture']
+FIRST_NAMES = ['Jean', 'Marie', 'Luc', 'Sophie', 'Paul', 'Claire', 'Hugo', 'Emma', 'Louis', 'Julie']
+LAST_NAMES = ['Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Richard', 'Petit', 'Durand']
+
+# Répartition des statuts et priorités des tâches générées
+PROJECT_STATUS_WEIGHTS = {'NEW': 2, 'SIGNED': 2, 'IN_PROGRESS': 5, 'PAID': 2, 'LOST': 1}
+TASK_STATUS_WEIGHTS = {'todo': 4, 'in_progress': 3, 'review': 1, 'done': 4}
+TASK_PRIORITY_WEIGHTS = {'low': 3, 'medium': 5, 'high': 2, 'urgent': 1}
+# Statuts des tâches dont l'échéance est passée depuis plus d'un mois
+PAST_TASK_STATUS_WEIGHTS = {'todo': 1, 'in_progress': 1, 'review': 1, 'done': 12}
+
+DOCUMENT_KINDS = [('Plan', 'pdf'), ('Devis', 'pdf'), ('Photo', 'jpg'), ('Métré', 'xlsx'), ('Compte rendu', 'docx')]
+NOTIFICATION_MESSAGES = [
+    "La tâche « {title} » vous a été assignée.",
+    "La tâche « {title} » est passée en révision.",
+    "La tâche « {title} » est terminée.",
+    "Un document a été ajouté à la tâche « {title} ».",
+]
+
+
+class DataGenerator:
+    """
+    Crée clients, utilisateurs, projets (avec équipes), tâches, documents
+    et notifications.
+    `today` sert de référence aux dates générées (par défaut la date du jour) ;
+    `progress(modèle, nombre)` est appelé après chaque lot écrit.
+    """
+
+    def __init__(self, seed=0, batch_size=1000, today=None, prefix='bench', progress=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.today = today or date.today()
+        self.prefix = prefix
+        self.progress = progress
+        self._cumulative = {}
+
+    def choice(self, weights):
+        # Poids cumulés calculés une fois par table de répartition
+        key = id(weights)
+        if key not in self._cumulative:
+            self._cumulative[key] = (list(weights), list(itertools.accumulate(weights.values())))
+        population, cum_weights = self._cumulative[key]
+        return self.random.choices(population, cum_weights=cum_weights)[0]
+
+    def bulk_create(self, model, objects):
+        """Écrit les objets par lots ; retourne les instances créées (avec leur pk)"""
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        if self.progress:
+            self.progress(model, len(created))
+        return created
+
+    def stream(self, model, objects):
+        """Écrit un flux d'objets lot par lot sans les conserver ; retourne le nombre créé"""
+        objects = iter(objects)
+        created = 0
+        while batch := list(itertools.islice(objects, self.batch_size)):
+            created += len(self.bulk_create(model, batch))
+        return created
+
+    def create_clients(self, count):
+        return self.bulk_create(Client, [
+            Client(
+                name=f"{self.random.choice(LAST_NAMES)} {index}",
+                email=f"{self.prefix}-client{index}@example.com",
+                phone=f"06{self.random.randrange(10 ** 8):08d}",
+                address=f"{self.random.randint(1, 200)} rue de {self.random.choice(CITIES)}",
+                company_name=f"{self.random.choice(TRADES)} {index}",
+            )
+            for index in range(count)
+        ])
+
+    def create_users(self, count, is_staff=False):
+        password = make_password(DEFAULT_PASSWORD)
+        return self.bulk_create(User, [
+            User(
+                username=f"{self.prefix}-user{index}",
+                email=f"{self.prefix}-user{index}@example.com",
+                first_name=self.random.choice(FIRST_NAMES),
+                last_name=self.random.choice(LAST_NAMES),
+                password=password,
+                is_staff=is_staff,
+            )
+            for index in range(count)
+        ])
+
+    def create_projects(self, count, clients, users, team_size=5):
+        """Crée les projets et leurs équipes (`team_size` membres au plus par projet)"""
+        projects = []
+        for index in range(count):
+            start_date = self.today + timedelta(days=self.random.randint(-365, 60))
+            projects.append(Project(
+                name=f"Chantier {index}",
+                description=f"{self.random.choice(TRADES)} à {self.random.choice(CITIES)}",
+                client=self.random.choice(clients) if clients else None,
+                location=self.random.choice(CITIES),
+                start_date=start_date,
+                end_date=start_date + timedelta(days=self.random.randint(30, 400)),
+                status=self.choice(PROJECT_STATUS_WEIGHTS),
+                budget=Decimal(self.random.randrange(10_000, 2_000_000)),
+                manager=self.random.choice(users),
+            ))
+        projects = self.bulk_create(Project, projects)
+
+        Membership = Project.team_members.through
+        memberships = []
+        for project in projects:
+            members = self.random.sample(users, min(len(users), self.random.randint(0, team_size)))
+            memberships.extend(Membership(project_id=project.pk, user_id=user.pk) for user in members)
+        self.bulk_create(Membership, memberships)
+        return projects
+
+    def task(self, project, users, index):
+        """Tâche d'un projet : période dans celle du projet, statut cohérent avec les dates"""
+        start_date = project.start_date + timedelta(days=self.random.randint(0, 120))
+        end_date = start_date + timedelta(days=int(self.random.expovariate(1 / 10)))
+        if start_date > self.today:
+            status = 'todo'
+        elif end_date < self.today - timedelta(days=30):
+            status = self.choice(PAST_TASK_STATUS_WEIGHTS)
+        else:
+            status = self.choice(TASK_STATUS_WEIGHTS)
+        task = Task(
+            title=f"{self.random.choice(TRADES)} — lot {index}",
+            description='',
+            project_id=project.pk,
+            created_by_id=project.manager_id,
+            assigned_to_id=self.random.choice(users).pk if self.random.random() < 0.8 else None,
+            status=status,
+            priority=self.choice(TASK_PRIORITY_WEIGHTS),
+            start_date=start_date,
+            end_date=end_date if self.random.random() < 0.95 else None,
+        )
+        task.update_overdue_since(self.today)
+        return task
+
+    def create_tasks(self, projects, users, per_project):
+        """
+        Crée les tâches des projets, lot par lot ; retourne le nombre créé.
+        `per_project` est un nombre de tâches par projet, ou une liste de
+        nombres alignée sur `projects` (voir spread()).
+        """
+        if isinstance(per_project, int):
+            per_project = [per_project] * len(projects)
+        created = self.stream(Task, (
+            self.task(project, users, index)
+            for project, count in zip(projects, per_project)
+            for index in range(count)
+        ))
+        refresh_project_stats(project.pk for project in projects)
+        return created
+
+    def spread(self, total, count):
+        """Répartit `total` tâches sur `count` projets, de tailles inégales (loi log-normale)"""
+        weights = [self.random.lognormvariate(0, 1) for _ in range(count)]
+        scale = total / sum(weights)
+        counts = [int(weight * scale) for weight in weights]
+        for index in range(total - sum(counts)):
+            counts[index % count] += 1
+        return counts
+
+    def create_documents(self, projects, ratio):
+        """
+        Crée les métadonnées de documents (sans fichier) d'environ `ratio`
+        document par tâche des projets ; retourne le nombre créé.
+        """
+        # Projets créés d'un seul bulk_create : identifiants contigus
+        project_ids = [project.pk for project in projects]
+        tasks = Task.objects.filter(
+            project__gte=min(project_ids), project__lte=max(project_ids)
+        ).order_by('pk').values_list('pk', 'title', 'created_by_id')
+
+        def documents():
+            for task_id, title, user_id in tasks.iterator(chunk_size=self.batch_size):
+                while self.random.random() < ratio / (1 + ratio):
+                    kind, extension = self.random.choice(DOCUMENT_KINDS)
+                    yield TaskDocument(
+                        task_id=task_id, title=f"{kind} — {title}", uploaded_by_id=user_id,
+                        file=f"task_documents/{self.today:%Y/%m}/{kind.lower()}-{task_id}.{extension}",
+                    )
+
+        return self.stream(TaskDocument, documents())
+
+    def create_notifications(self, users, per_user, read_ratio=0.7):
+        """Crée `per_user` notifications par utilisateur, dont `read_ratio` déjà lues"""
+        return self.stream(Notification, (
+            Notification(
+                user_id=user.pk,
+                message=self.random.choice(NOTIFICATION_MESSAGES).format(
+                    title=f"{self.random.choice(TRADES)} — lot {index}"
+                ),
+                is_read=self.random.random() < read_ratio,
+            )
+            for user in users
+            for index in range(per_user)
+        ))
+
+    def generate(self, clients, users, projects, tasks_per_project, team_size=5):
+        """Crée un jeu de données complet ; retourne les objets créés et le nombre de tâches"""
+        client_objects = self.create_clients(clients)
+        user_objects = self.create_users(users)
+        project_objects = self.create_projects(projects, client_objects, user_objects, team_size)
+        task_count = self.create_tasks(project_objects, user_objects, tasks_per_project)
+        return {
+            'clients': client_objects,
+            'users': user_objects,
+            'projects': project_objects,
+            'tasks': task_count,
+        }
@@ -0,0 +1,138 @@
+"""
+Benchmark de l'API REST sur un jeu de données synthétique reproductible.
+
+Une base de test jetable est créée sur le SGBD configuré (SQLite ou
+PostgreSQL, voir DATABASE_URL), remplie par api.datagen, puis chaque endpoint
+est mesuré (percentiles de latence, requêtes SQL). Les résultats peuvent être
+enregistrés comme référence (--output) ou comparés à une référence existante
+(--compare) : la commande échoue si une régression est détectée.
+
+    python manage.py bench_api --output benchmarks/baseline.json
+    python manage.py bench_api --compare benchmarks/baseline.json
+"""
+import json
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from api import benchmark
+from api.datagen import DataGenerator
+
+# Cache propre au benchmark : les clés de la base jetable ne doivent ni
+# rencontrer ni effacer celles du cache partagé (REDIS_URL)
+BENCHMARK_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench-api'},
+}
+
+
+class Command(BaseCommand):
+    help = "Mesure latence et requêtes SQL des endpoints principaux sur des données synthétiques"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=20)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--projects', type=int, default=100)
+        parser.add_argument('--tasks-per-project', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--iterations', type=int, default=30, help="Appels mesurés par endpoint")
+        parser.add_argument('--warmup', type=int, default=3, help="Appels d'échauffement non mesurés")
+        parser.add_argument('--output', help="Fichier JSON où enregistrer les résultats")
+        parser.add_argument('--compare', help="Référence JSON à laquelle comparer les résultats")
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help="Dégradation du p95 tolérée avant de signaler une régression (0.2 = 20 %%)"
+        )
+
+    def handle(self, *args, **options):
+        sizes = {
+            'clients': options['clients'],
+            'users': options['users'],
+            'projects': options['projects'],
+            'tasks_per_project': options['tasks_per_project'],
+        }
+        baseline = self.load(options['compare']) if options['compare'] else None
+
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            results = self.run(sizes, options)
+
+        report = {
+            'meta': {
+                'vendor': connection.vendor,
+                'seed': options['seed'],
+                'sizes': sizes,
+                'iterations': options['iterations'],
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            },
+            'endpoints': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, indent=2)
+                output.write('\n')
+            self.stdout.write(f"Résultats enregistrés dans {options['output']}")
+
+        if baseline is None:
+            self.print_results(results)
+        else:
+            self.print_comparison(baseline, report, options['tolerance'])
+
+    def run(self, sizes, options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f"Génération des données ({connection.vendor}) : {sizes}")
+            data = DataGenerator(seed=options['seed']).generate(**sizes)
+            user, project, task = benchmark.benchmark_target(data['users'])
+            return benchmark.measure(user, project, task, options['iterations'], options['warmup'])
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def load(self, path):
+        try:
+            with open(path, encoding='utf-8') as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Référence illisible ({path}) : {error}") from error
+
+    def print_results(self, results):
+        self.stdout.write(f"{'endpoint':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'requêtes':>9}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<20} {result['p50']:>9.2f} {result['p95']:>9.2f} "
+                f"{result['p99']:>9.2f} {result['queries']:>9}"
+            )
+
+    def print_comparison(self, baseline, report, tolerance):
+        for key in ('vendor', 'sizes', 'seed'):
+            if baseline['meta'].get(key) != report['meta'][key]:
+                self.stdout.write(self.style.WARNING(
+                    f"Attention : {key} diffère de la référence "
+                    f"({baseline['meta'].get(key)} / {report['meta'][key]})"
+                ))
+
+        rows = benchmark.compare(baseline['endpoints'], report['endpoints'], tolerance)
+        self.stdout.write(f"{'endpoint':<20} {'p95 réf.':>9} {'p95':>9} {'écart':>8} {'req. réf.':>9} {'req.':>6}")
+        for row in rows:
+            current, reference = row['current'], row['baseline']
+            if reference is None:
+                self.stdout.write(f"{row['endpoint']:<20} {'-':>9} {current['p95']:>9.2f} {'nouveau':>8}")
+                continue
+            delta = (current['p95'] / reference['p95'] - 1) * 100 if reference['p95'] else 0
+            line = (
+                f"{row['endpoint']:<20} {reference['p95']:>9.2f} {current['p95']:>9.2f} {delta:>+7.1f}% "
+                f"{reference['queries']:>9} {current['queries']:>6}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['regressions'] else line)
+
+        regressions = [row for row in rows if row['regressions']]
+        if regressions:
+            raise CommandError(", ".join(
+                f"{row['endpoint']} ({'/'.join(row['regressions'])})" for row in regressions
+            ) + " : régression par rapport à la référence")
+        self.stdout.write(self.style.SUCCESS("Aucune régression."))
@@ -0,0 +1,135 @@
+"""
+Compare le débit des modes de service WSGI et ASGI à nombre de workers fixe.
+
+Pour chaque mode, un gunicorn est lancé avec gunicorn.conf.py (SERVER_MODE,
+WEB_CONCURRENCY, PORT), puis des requêtes GET concurrentes sont envoyées sur
+les chemins demandés ; le débit et les latences p50/p95 sont affichés.
+
+    python manage.py bench_server_modes --workers 1 --concurrency 32 \\
+        --username admin --password secret --path /api/tasks/ --path /api/projects/
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmark import percentile
+
+HEALTH_PATH = '/api/health-check/'
+
+
+class Command(BaseCommand):
+    help = "Compare le débit des modes WSGI et ASGI à nombre de workers fixe"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default='wsgi,asgi', help="Modes à comparer (séparés par des virgules)")
+        parser.add_argument(
+            '--workers', type=int, default=1, help="Nombre de workers gunicorn (plus d'un : REDIS_URL requis)"
+        )
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--concurrency', type=int, default=32, help="Requêtes simultanées")
+        parser.add_argument('--requests', type=int, default=500, help="Requêtes par chemin et par mode")
+        parser.add_argument('--path', action='append', dest='paths', help="Chemin à mesurer (répétable)")
+        parser.add_argument('--username', help="Compte utilisé pour obtenir un jeton JWT")
+        parser.add_argument('--password')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/api/tasks/', '/api/projects/', '/api/tasks/calendar/', HEALTH_PATH]
+        base_url = f"http://127.0.0.1:{options['port']}"
+        results = {}
+        for mode in options['modes'].split(','):
+            server = self.start_server(mode, options['workers'], options['port'])
+            try:
+                self.wait_ready(base_url, server)
+                token = self.obtain_token(base_url, options['username'], options['password'])
+                for path in paths:
+                    results[(mode, path)] = self.measure(
+                        base_url + path, token, options['concurrency'], options['requests']
+                    )
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+        self.stdout.write(f"{'mode':<6} {'chemin':<28} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'erreurs':>8}")
+        for (mode, path), result in results.items():
+            self.stdout.write(
+                f"{mode:<6} {path:<28} {result['rps']:>9.1f} {result['p50']:>9.1f} "
+                f"{result['p95']:>9.1f} {result['errors']:>8}"
+            )
+
+    def start_server(self, mode, workers, port):
+        env = {
+            **os.environ,
+            'SERVER_MODE': mode,
+            'WEB_CONCURRENCY': str(workers),
+            'PORT': str(port),
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'lon.settings'),
+        }
+        try:
+            return subprocess.Popen(
+                [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', os.devnull],
+                cwd=settings.BASE_DIR, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError as error:
+            raise CommandError(f"Impossible de lancer gunicorn : {error}") from error
+
+    def wait_ready(self, base_url, server, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("gunicorn s'est arrêté au démarrage (uvicorn-worker installé ?)")
+            try:
+                urllib.request.urlopen(base_url + HEALTH_PATH, timeout=1).close()
+                return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        raise CommandError("Le serveur n'a pas répondu à temps")
+
+    def obtain_token(self, base_url, username, password):
+        if not username:
+            return None
+        request = urllib.request.Request(
+            base_url + '/api/token/',
+            data=json.dumps({'username': username, 'password': password}).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return json.load(response)['access']
+        except urllib.error.URLError as error:
+            raise CommandError(f"Authentification impossible : {error}") from error
+
+    def measure(self, url, token, concurrency, count):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=60) as response:
+                    response.read()
+                ok = True
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(fetch, range(count)))
+        elapsed = time.perf_counter() - started
+
+        durations = [duration * 1000 for duration, _ in samples]
+        return {
+            'rps': count / elapsed,
+            'p50': statistics.median(durations),
+            'p95': percentile(durations, 0.95),
+            'errors': sum(1 for _, ok in samples if not ok),
+        }
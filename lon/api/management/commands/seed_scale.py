@@ -0,0 +1,70 @@
+"""
+Génère un jeu de données volumineux et reproductible pour les tests de charge.
+
+    python manage.py seed_scale --projects 2000 --tasks 1000000 --seed 1
+
+Les lignes sont écrites par bulk_create, par lots (--batch-size) : aucun
+signal post_save n'est émis, donc ni journal d'activité ni notifications
+temps réel. Les comptes générés partagent le mot de passe
+api.datagen.DEFAULT_PASSWORD ; leurs noms commencent par --prefix.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.datagen import DataGenerator
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Génère clients, utilisateurs, projets, tâches, documents et notifications en masse"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200)
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--projects', type=int, default=2000)
+        parser.add_argument('--tasks', type=int, default=100_000, help="Nombre total de tâches")
+        parser.add_argument('--team-size', type=int, default=8, help="Membres au plus par équipe")
+        parser.add_argument('--documents-per-task', type=float, default=0.3, help="Documents par tâche (moyenne)")
+        parser.add_argument('--notifications-per-user', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='scale', help="Préfixe des noms d'utilisateur générés")
+
+    def handle(self, *args, **options):
+        if options['projects'] < 1 or options['users'] < 1:
+            raise CommandError("Il faut au moins un projet et un utilisateur.")
+        if User.objects.filter(username__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(
+                f"Des comptes « {options['prefix']}-* » existent déjà : choisissez un autre --prefix."
+            )
+
+        self.verbosity = options['verbosity']
+        self.started = time.monotonic()
+        self.written = {}
+        generator = DataGenerator(
+            seed=options['seed'], batch_size=options['batch_size'],
+            prefix=options['prefix'], progress=self.progress
+        )
+        clients = generator.create_clients(options['clients'])
+        users = generator.create_users(options['users'])
+        projects = generator.create_projects(options['projects'], clients, users, options['team_size'])
+        generator.create_tasks(projects, users, generator.spread(options['tasks'], len(projects)))
+        generator.create_documents(projects, options['documents_per_task'])
+        generator.create_notifications(users, options['notifications_per_user'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Terminé en {time.monotonic() - self.started:.1f} s ({connection.vendor}) : "
+            + ", ".join(f"{count} {label}" for label, count in self.written.items())
+        ))
+
+    def progress(self, model, count):
+        label = model._meta.verbose_name_plural
+        self.written[label] = self.written.get(label, 0) + count
+        if self.verbosity > 1:
+            self.stdout.write(
+                f"  {self.written[label]} {label} ({time.monotonic() - self.started:.1f} s)"
+            )
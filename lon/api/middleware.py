@@ -0,0 +1,143 @@
+"""
+Instrumentation des requêtes SQL, activée par le réglage QUERY_INSTRUMENTATION.
+
+Pour chaque requête HTTP, le middleware relève le nombre de requêtes SQL,
+leur durée totale, les requêtes répétées (même SQL exécuté plusieurs fois,
+signe typique d'un N+1) et les plus lentes. Le résumé est renvoyé dans
+l'en-tête Server-Timing et journalisé sur le logger api.instrumentation
+sous forme d'une ligne JSON (niveau WARNING si des requêtes sont répétées).
+
+Sous ASGI, les requêtes SQL s'exécutent dans les threads de sync_to_async,
+sur des connexions propres à chaque thread : un execute_wrapper permanent,
+posé à l'ouverture de chaque connexion, les transmet à l'enregistreur de la
+requête HTTP en cours, lu dans le contexte (current_recorder).
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('api.instrumentation')
+
+# Longueur maximale du SQL reproduit dans les journaux
+MAX_LOGGED_SQL = 500
+
+# Enregistreur de la requête HTTP asynchrone en cours
+current_recorder = ContextVar('query_recorder', default=None)
+
+
+class QueryRecorder:
+    """execute_wrapper qui mémorise le SQL et la durée de chaque requête"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def total_time(self):
+        return sum(duration for _, duration in self.queries)
+
+    def duplicates(self, threshold):
+        """Retourne les (sql, nombre) exécutés au moins `threshold` fois"""
+        counts = Counter(sql for sql, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= threshold]
+
+    def slowest(self, count):
+        return sorted(self.queries, key=lambda query: query[1], reverse=True)[:count]
+
+
+def record_in_context(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_context_wrapper(sender, connection, **kwargs):
+    if record_in_context not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_in_context)
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            connection_created.connect(install_context_wrapper, dispatch_uid='query_instrumentation')
+            for connection in connections.all(initialized_only=True):
+                install_context_wrapper(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        return self.report(request, response, recorder, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        token = current_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.report(request, response, recorder, time.perf_counter() - start)
+
+    def report(self, request, response, recorder, total_time):
+        duplicates = recorder.duplicates(settings.QUERY_INSTRUMENTATION_DUPLICATE_THRESHOLD)
+        response['Server-Timing'] = self.server_timing(recorder, duplicates, total_time)
+        self.log(request, response, recorder, duplicates, total_time)
+        return response
+
+    def server_timing(self, recorder, duplicates, total_time):
+        metrics = [
+            f'db;dur={recorder.total_time * 1000:.2f};desc="{len(recorder.queries)} queries"',
+            f'app;dur={total_time * 1000:.2f}',
+        ]
+        if duplicates:
+            repeated = sum(count for _, count in duplicates)
+            metrics.append(f'db-dup;desc="{repeated} repeated"')
+        return ', '.join(metrics)
+
+    def log(self, request, response, recorder, duplicates, total_time):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': len(recorder.queries),
+            'db_ms': round(recorder.total_time * 1000, 2),
+            'total_ms': round(total_time * 1000, 2),
+            'duplicates': [
+                {'sql': sql[:MAX_LOGGED_SQL], 'count': count} for sql, count in duplicates
+            ],
+            'slowest': [
+                {'sql': sql[:MAX_LOGGED_SQL], 'ms': round(duration * 1000, 2)}
+                for sql, duration in recorder.slowest(settings.QUERY_INSTRUMENTATION_SLOWEST)
+            ],
+        }
+        level = logging.WARNING if duplicates else logging.INFO
+        logger.log(level, json.dumps(record), extra={'query_stats': record})
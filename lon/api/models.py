@@ -1,3 +1,73 @@
 from django.db import models
 
-# Create your models here.
+
+class TrackedFieldsMixin:
+    """
+    Mémorise les valeurs des champs telles que chargées depuis la base.
+
+    Les valeurs sont relevées dans from_db() (sans requête supplémentaire) et
+    mises à jour après chaque save() ou refresh_from_db(). Elles permettent de
+    connaître l'ancienne valeur d'un champ modifié et de limiter save() aux
+    colonnes réellement modifiées via update_fields.
+    Les valeurs mutables (JSON, listes) modifiées en place ne sont pas détectées.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values)
+            if value is not models.DEFERRED
+        }
+        return instance
+
+    def _tracked_fields(self):
+        return [
+            field for field in self._meta.concrete_fields
+            if not field.primary_key and not field.generated
+        ]
+
+    def _remember_loaded_values(self, fields=None):
+        loaded = getattr(self, '_loaded_values', {})
+        for field in self._tracked_fields():
+            if fields is not None and field.name not in fields and field.attname not in fields:
+                continue
+            if field.attname in self.__dict__:
+                loaded[field.attname] = self.__dict__[field.attname]
+        self._loaded_values = loaded
+
+    def get_loaded_value(self, attname, default=None):
+        """Retourne la valeur du champ lors du dernier chargement ou de la dernière sauvegarde"""
+        return getattr(self, '_loaded_values', {}).get(attname, default)
+
+    def changed_fields(self):
+        """
+        Retourne les noms des champs modifiés depuis le chargement,
+        ou None si l'instance n'a pas été chargée depuis la base.
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        changed = []
+        for field in self._tracked_fields():
+            if field.attname not in self.__dict__:
+                continue  # Champ différé jamais lu ni modifié
+            if field.attname not in loaded or loaded[field.attname] != self.__dict__[field.attname]:
+                changed.append(field.name)
+        return changed
+
+    def save(self, *args, **kwargs):
+        if not args and kwargs.get('update_fields') is None and not self._state.adding:
+            changed = self.changed_fields()
+            if changed is not None:
+                auto_now = [
+                    field.name for field in self._tracked_fields()
+                    if getattr(field, 'auto_now', False)
+                ]
+                kwargs['update_fields'] = set(changed) | set(auto_now)
+        super().save(*args, **kwargs)
+        self._remember_loaded_values(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_loaded_values(fields)
@@ -0,0 +1,171 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur (keyset) sur un tri composite stable.
+
+    Le curseur encode les valeurs des champs de tri de la dernière ligne
+    renvoyée ; la page suivante est obtenue par une comparaison de tuples
+    (a, b, ...) > (x, y, ...) plutôt que par un OFFSET, ce qui garde un coût
+    constant quelle que soit la profondeur de la page. Le dernier champ de
+    `ordering` doit être unique (typiquement l'identifiant). Les valeurs
+    NULL sont toujours triées en dernier, quel que soit le SGBD.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Curseur invalide.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.page_from_rows(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Variante asynchrone de paginate_queryset() (ORM asynchrone)"""
+        return self.page_from_rows([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """Retourne la requête de la page (une ligne de plus pour savoir s'il y a une suite)"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering_fields(queryset.model)
+
+        queryset = queryset.order_by(*self.get_order_by())
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.after_position(self.fields, position))
+        return queryset[:self.page_size + 1]
+
+    def page_from_rows(self, rows):
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = self.position_of(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size or settings.API_PAGE_SIZE
+
+    def get_ordering_fields(self, model):
+        """Retourne la liste des (champ du modèle, tri décroissant) de `ordering`"""
+        fields = []
+        for name in self.ordering:
+            descending = name.startswith('-')
+            fields.append((model._meta.get_field(name.lstrip('-')), descending))
+        return fields
+
+    def get_order_by(self):
+        order_by = []
+        for field, descending in self.fields:
+            expression = F(field.name)
+            if descending:
+                order_by.append(expression.desc(nulls_last=True) if field.null else expression.desc())
+            else:
+                order_by.append(expression.asc(nulls_last=True) if field.null else expression.asc())
+        return order_by
+
+    def after_position(self, fields, position):
+        """Construit le filtre « strictement après `position` » pour le tri donné"""
+        (field, descending), value = fields[0], position[0]
+        strictly_after = self.strictly_after(field, descending, value)
+        if len(fields) == 1:
+            return strictly_after
+        if value is None:
+            same_value = Q(**{f'{field.name}__isnull': True})
+        else:
+            same_value = Q(**{field.name: value})
+        return strictly_after | (same_value & self.after_position(fields[1:], position[1:]))
+
+    def strictly_after(self, field, descending, value):
+        if value is None:
+            # Les NULL sont en dernier : rien ne les suit sur ce champ
+            return Q(pk__in=[])
+        lookup = 'lt' if descending else 'gt'
+        condition = Q(**{f'{field.name}__{lookup}': value})
+        if field.null:
+            condition |= Q(**{f'{field.name}__isnull': True})
+        return condition
+
+    def position_of(self, instance):
+        return [getattr(instance, field.attname) for field, _ in self.fields]
+
+    def encode_cursor(self, position):
+        values = [
+            value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else value
+            for value in position
+        ]
+        encoded = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(encoded).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, UnicodeEncodeError, binascii.Error, ValidationError) as error:
+            raise NotFound(self.invalid_cursor_message) from error
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    """Pagination des projets et des clients, du plus récent au plus ancien"""
+    ordering = ('-created_at', '-id')
+
+
+class TaskKeysetPagination(KeysetPagination):
+    """Pagination des tâches selon le tri par défaut de Task, départagé par l'id"""
+    ordering = ('-priority_rank', 'end_date', '-created_at', '-id')
+
+
+class UserKeysetPagination(KeysetPagination):
+    """Pagination des utilisateurs par nom d'utilisateur"""
+    ordering = ('username', 'id')
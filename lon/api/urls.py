@@ -3,5 +3,6 @@ from . import views
 
 urlpatterns = [
     path('health-check/', views.health_check, name='health-check'),
+    path('dashboard/summary/', views.dashboard_summary_view, name='dashboard-summary'),
 ]
 
@@ -1,33 +1,60 @@
 from django.shortcuts import render
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from asgiref.sync import sync_to_async
 from django.db import connection
+from .async_views import async_read_view
+from .dashboard import dashboard_summary
 
 # Create your views here.
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def health_check(request):
-    """
-    Endpoint de vérification de santé qui permet de vérifier 
-    que l'API est en cours d'exécution et que la connexion à la base de données fonctionne.
-    """
+def database_status():
+    """Vérifie la connexion à la base de données ; retourne (réponse, code HTTP)"""
     try:
-        # Vérifier la connexion à la base de données
         with connection.cursor() as cursor:
             cursor.execute("SELECT 1")
             db_status = cursor.fetchone()[0] == 1
         
-        return Response({
+        return {
             "status": "ok",
             "database": "connected" if db_status else "disconnected"
-        }, status=status.HTTP_200_OK)
+        }, status.HTTP_200_OK
     
     except Exception as e:
-        return Response({
+        return {
             "status": "error",
             "database": "disconnected",
             "error": str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def health_check(request):
+    """
+    Endpoint de vérification de santé qui permet de vérifier 
+    que l'API est en cours d'exécution et que la connexion à la base de données fonctionne.
+    """
+    data, code = database_status()
+    return Response(data, status=code)
+
+
+async def ahealth_check(request):
+    """Variante asynchrone de health_check (mode ASGI)"""
+    data, code = await sync_to_async(database_status)()
+    return Response(data, status=code)
+
+
+health_check = async_read_view(health_check, ahealth_check)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard_summary_view(request):
+    """
+    Résumé du tableau de bord : projets par statut, clients distincts,
+    tâches par statut et en retard, projets et activités récents.
+    """
+    return Response(dashboard_summary(request))
@@ -1,7 +1,9 @@
 from rest_framework import viewsets
+from api.pagination import CreatedAtKeysetPagination
 from .models import Client
 from .serializers import ClientSerializer
 
 class ClientViewSet(viewsets.ModelViewSet):
     queryset = Client.objects.all()
-    serializer_class = ClientSerializer
\ No newline at end of file
+    serializer_class = ClientSerializer
+    pagination_class = CreatedAtKeysetPagination
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Configuration de gunicorn (gunicorn -c gunicorn.conf.py).
+
+SERVER_MODE choisit le mode de service :
+- wsgi (défaut) : workers synchrones sur lon.wsgi ;
+- asgi : workers uvicorn sur lon.asgi ; les listes en lecture seule sont
+  alors servies par des vues asynchrones (voir api.async_views).
+
+Sans REDIS_URL, le cache et la diffusion temps réel sont propres à chaque
+processus : un seul worker par défaut, et WEB_CONCURRENCY > 1 est refusé.
+Avec REDIS_URL, WEB_CONCURRENCY vaut par défaut 2 × CPU + 1.
+"""
+import multiprocessing
+import os
+
+server_mode = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+if server_mode == 'asgi':
+    wsgi_app = 'lon.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'lon.wsgi:application'
+    worker_class = 'sync'
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+redis_url = os.environ.get('REDIS_URL')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1 if redis_url else 1))
+if workers > 1 and not redis_url:
+    raise RuntimeError(
+        f"WEB_CONCURRENCY={workers} sans REDIS_URL : les invalidations de cache et les "
+        "événements temps réel n'atteindraient qu'un worker. Définir REDIS_URL ou "
+        "servir avec un seul worker."
+    )
+# Transmis aux workers (réglage WEB_CONCURRENCY, voir realtime.broker)
+os.environ['WEB_CONCURRENCY'] = str(workers)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+accesslog = '-'
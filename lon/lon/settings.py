@@ -45,33 +45,48 @@ INSTALLED_APPS = [
     'projects',
     'tasks',
     'clients',
+    'activity',
+    'realtime',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
 
+# Taille de page par défaut des listes paginées (surchargeable via ?page_size=)
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 50))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.TokenObtainPairWithClaimsSerializer',
 }
 
 MIDDLEWARE = [
+    'api.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'activity.middleware.ActivityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Instrumentation des requêtes SQL (en-tête Server-Timing et journal api.instrumentation)
+QUERY_INSTRUMENTATION = os.environ.get('QUERY_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+# Nombre d'exécutions d'un même SQL à partir duquel il est signalé comme répété
+QUERY_INSTRUMENTATION_DUPLICATE_THRESHOLD = int(os.environ.get('QUERY_INSTRUMENTATION_DUPLICATE_THRESHOLD', 3))
+# Nombre de requêtes les plus lentes journalisées
+QUERY_INSTRUMENTATION_SLOWEST = int(os.environ.get('QUERY_INSTRUMENTATION_SLOWEST', 3))
+
 ROOT_URLCONF = 'lon.urls'
 
 TEMPLATES = [
@@ -104,6 +119,66 @@ DATABASES = {
 }
 
 
+# Cache
+# Redis (REDIS_URL) partage le cache entre les workers ; à défaut, cache mémoire
+# local au processus. Les invalidations (projets accessibles, utilisateurs
+# authentifiés par jeton, compteurs de notifications) n'atteignent alors que
+# le processus qui les émet : les autres workers servent des valeurs périmées
+# jusqu'à l'expiration de leur cache (PROJECT_ACCESS_CACHE_TIMEOUT...). Sans
+# REDIS_URL, un seul worker (gunicorn.conf.py refuse WEB_CONCURRENCY > 1).
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Durée de vie (secondes) du cache des utilisateurs authentifiés par jeton
+USER_CACHE_TIMEOUT = int(os.environ.get('USER_CACHE_TIMEOUT', 300))
+
+# Écriture des notifications groupées dans un thread de fond (notify_users(background=True))
+NOTIFICATION_BACKGROUND = os.environ.get('NOTIFICATION_BACKGROUND', 'true').lower() in ('1', 'true', 'yes')
+NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', 2))
+# Durée de vie (secondes) des compteurs de notifications non lues
+NOTIFICATION_COUNT_CACHE_TIMEOUT = int(os.environ.get('NOTIFICATION_COUNT_CACHE_TIMEOUT', 3600))
+
+# Durée de vie (secondes) du résumé du tableau de bord de chaque utilisateur
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 60))
+
+# Durée de vie (secondes) du cache des projets accessibles par utilisateur
+PROJECT_ACCESS_CACHE_TIMEOUT = int(os.environ.get('PROJECT_ACCESS_CACHE_TIMEOUT', 300))
+
+
+# Nombre de processus servant l'application (voir gunicorn.conf.py)
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Diffusion des événements temps réel : InProcessBroker n'atteint que les flux
+# du processus qui publie et est refusé avec plusieurs workers ;
+# realtime.broker.RedisBroker par défaut dès que REDIS_URL est défini
+REALTIME_BROKER = os.environ.get(
+    'REALTIME_BROKER',
+    'realtime.broker.RedisBroker' if REDIS_URL else 'realtime.broker.InProcessBroker',
+)
+# Durée de vie (secondes) des tickets d'ouverture des flux SSE
+REALTIME_TICKET_TIMEOUT = int(os.environ.get('REALTIME_TICKET_TIMEOUT', 30))
+# Intervalle (secondes) des messages de maintien des flux SSE
+REALTIME_KEEPALIVE = int(os.environ.get('REALTIME_KEEPALIVE', 15))
+
+# Mode de service : 'wsgi' (workers synchrones) ou 'asgi' (workers uvicorn),
+# voir gunicorn.conf.py. En ASGI, les listes en lecture seule sont servies
+# par des vues asynchrones (api.async_views).
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+ASYNC_VIEWS = SERVER_MODE == 'asgi'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -54,6 +54,12 @@ LOGGING = {
         'handlers': ['console'],
         'level': 'WARNING',
     },
+    'loggers': {
+        # Résumés de QueryInstrumentationMiddleware, quand QUERY_INSTRUMENTATION est activé
+        'api.instrumentation': {
+            'level': 'INFO',
+        },
+    },
 }
 
 # S'assurer que les migrations sont appliquées automatiquement
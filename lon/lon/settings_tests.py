@@ -64,8 +64,12 @@ DEFAULT_FILE_STORAGE = 'django.core.files.storage.InMemoryStorage'
 # Backend d'email pour les tests
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
+# Notifications écrites au commit dans le thread du test
+NOTIFICATION_BACKGROUND = False
+
 # Réduire la durée des tokens JWT pour les tests
 SIMPLE_JWT = {
+    **SIMPLE_JWT,
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(minutes=15),
 }
@@ -22,7 +22,7 @@ from accounts import views as accounts_views
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
-from accounts.views import UserViewSet
+from accounts.views import UserViewSet, NotificationViewSet
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from tasks.views import TaskViewSet  # Ajoutez cette ligne
 
@@ -30,16 +30,21 @@ from tasks.views import TaskViewSet  # Ajoutez cette ligne
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
 router.register(r'tasks', TaskViewSet, basename='task')
+router.register(r'notifications', NotificationViewSet, basename='notification')
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # Avant le routeur principal, dont la route de détail des tâches
+    # masquerait /api/tasks/calendar/
+    path('api/tasks/', include('tasks.urls')),
     path('api/', include(router.urls)),
     path('accounts/', include('accounts.urls')),
     path('api/projects/', include('projects.urls')),
     path('api/', include('clients.urls')),
-    path('api/tasks/', include('tasks.urls')),
     path('api/', include('api.urls')),  # Inclure les URLs de l'API
+    path('api/', include('activity.urls')),
+    path('api/realtime/', include('realtime.urls')),
 
 
     # URLs pour l'authentification
@@ -0,0 +1,59 @@
+"""
+Périmètre d'accès des utilisateurs aux projets.
+
+L'ensemble des projets accessibles à un utilisateur est mis en cache dans le
+cache Django ; il est invalidé par les signaux de projects.signals lorsque
+l'équipe ou le chef d'un projet change.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+
+from .models import Project
+
+
+def _cache_key(user_id):
+    return f'projects:accessible:{user_id}'
+
+
+def _query_accessible_project_ids(user):
+    memberships = Project.team_members.through.objects.filter(
+        project_id=OuterRef('pk'), user_id=user.pk
+    )
+    return list(
+        Project.objects.filter(Q(manager=user) | Exists(memberships))
+        .order_by().values_list('pk', flat=True)
+    )
+
+
+def accessible_project_ids(user):
+    """
+    Retourne l'ensemble des identifiants des projets dont l'utilisateur est
+    chef de projet ou membre de l'équipe. Calculé en une requête (sans
+    DISTINCT) puis servi depuis le cache.
+    """
+    key = _cache_key(user.pk)
+    project_ids = cache.get(key)
+    if project_ids is None:
+        project_ids = _query_accessible_project_ids(user)
+        cache.set(key, project_ids, timeout=settings.PROJECT_ACCESS_CACHE_TIMEOUT)
+    return frozenset(project_ids)
+
+
+def invalidate_accessible_projects(user_ids):
+    """Supprime du cache les projets accessibles des utilisateurs donnés"""
+    keys = [_cache_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        cache.delete_many(keys)
+
+
+def request_project_ids(request):
+    """
+    Retourne les projets accessibles à l'utilisateur de la requête,
+    lus une seule fois par requête.
+    """
+    project_ids = getattr(request, '_accessible_project_ids', None)
+    if project_ids is None:
+        project_ids = accessible_project_ids(request.user)
+        request._accessible_project_ids = project_ids
+    return project_ids
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        # Cache des projets accessibles et statistiques matérialisées
+        from . import signals  # noqa: F401
+        from .stats import create_missing_stats
+        # Projets antérieurs à la table ProjectStats (ou créés sans signaux)
+        post_migrate.connect(create_missing_stats, sender=self)
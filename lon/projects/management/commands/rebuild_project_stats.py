@@ -0,0 +1,23 @@
+"""
+Recalcule les statistiques matérialisées (ProjectStats) de tous les projets.
+
+À lancer après un import ou une écriture directe en base, et chaque nuit
+(cron) pour mettre à jour les retards et prochaines échéances, qui ne
+dépendent que de la date du jour.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.stats import rebuild_project_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcule les statistiques de tâches de tous les projets"
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = rebuild_project_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Statistiques de {count} projets recalculées en {time.monotonic() - started:.1f} s"
+        ))
@@ -1,9 +1,83 @@
 from django.db import models
+from django.db.models import Count, Prefetch, Q
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.contrib.auth import get_user_model
 from django.utils import timezone
 from clients.models import Client
+from api.models import TrackedFieldsMixin
 
-class Project(models.Model):
+# Pondération des statuts de tâche pour le calcul de la progression
+TASK_PROGRESS_WEIGHTS = {
+    'done': 1.0,
+    'review': 0.75,
+    'in_progress': 0.5,
+    'todo': 0.0
+}
+
+# Colonnes utilisateur effectivement sérialisées avec un projet
+SERIALIZED_USER_FIELDS = ['id', 'username', 'email', 'first_name', 'last_name']
+
+# Noms des annotations posées par ProjectQuerySet.with_task_stats()
+TASK_STATS_ANNOTATIONS = {
+    'total': 'tasks_total',
+    'todo': 'tasks_todo',
+    'in_progress': 'tasks_in_progress',
+    'review': 'tasks_review',
+    'done': 'tasks_done',
+    'overdue': 'tasks_overdue',
+}
+
+
+def task_stats_aggregates(prefix=''):
+    """
+    Construit les agrégats conditionnels des statistiques de tâches.
+    `prefix` vaut 'tasks__' pour annoter des projets et '' pour agréger
+    directement un queryset de tâches.
+    """
+    task_id = f'{prefix}id'
+    aggregates = {
+        TASK_STATS_ANNOTATIONS['total']: Count(task_id, distinct=True),
+        # Retards signalés par Task.overdue_since (voir tasks.overdue)
+        TASK_STATS_ANNOTATIONS['overdue']: Count(
+            task_id, filter=Q(**{f'{prefix}overdue_since__isnull': False}), distinct=True
+        ),
+    }
+    for status in TASK_PROGRESS_WEIGHTS:
+        aggregates[TASK_STATS_ANNOTATIONS[status]] = Count(
+            task_id, filter=Q(**{f'{prefix}status': status}), distinct=True
+        )
+    return aggregates
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_relations(self):
+        """
+        Charge le chef de projet, le client et les membres de l'équipe
+        (limités aux colonnes sérialisées) en un nombre constant de requêtes.
+        """
+        users = get_user_model().objects.only(*SERIALIZED_USER_FIELDS)
+        return self.select_related('manager', 'client').prefetch_related(
+            Prefetch('team_members', queryset=users)
+        )
+
+    def with_stats(self):
+        """Joint la ligne ProjectStats de chaque projet (statistiques matérialisées)"""
+        return self.select_related('stats')
+
+    def delayed(self):
+        """Projets ayant au moins une tâche en retard (statistiques matérialisées)"""
+        return self.filter(stats__overdue__gt=0)
+
+    def with_task_stats(self):
+        """
+        Annote chaque projet avec le nombre de tâches par statut et le nombre
+        de tâches en retard, calculés dans la même requête SQL que la liste.
+        """
+        return self.annotate(**task_stats_aggregates('tasks__'))
+
+
+class Project(TrackedFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('NEW', 'Nouveau'),
         ('SIGNED', 'Signé'),
@@ -45,6 +119,8 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Projet"
         verbose_name_plural = "Projets"
@@ -53,15 +129,44 @@ class Project(models.Model):
     def __str__(self):
         return self.name
 
+    def _stored_stats(self):
+        """Retourne la ligne ProjectStats déjà chargée (with_stats()), sinon None"""
+        if not type(self).stats.is_cached(self):
+            return None
+        try:
+            return self.stats
+        except ObjectDoesNotExist:
+            return None  # Pas encore calculées
+
+    def _task_counts(self):
+        """
+        Retourne les compteurs de tâches du projet.
+        Utilise, par ordre de préférence, les statistiques matérialisées jointes
+        par with_stats(), les annotations de with_task_stats(), ou une seule
+        requête groupée mise en cache sur l'instance.
+        """
+        names = TASK_STATS_ANNOTATIONS
+        stored = self._stored_stats()
+        if stored is not None:
+            return {key: getattr(stored, key) for key in names}
+        if all(hasattr(self, name) for name in names.values()):
+            return {key: getattr(self, name) for key, name in names.items()}
+
+        if not hasattr(self, '_task_counts_cache'):
+            values = self.tasks.aggregate(**task_stats_aggregates())
+            self._task_counts_cache = {key: values[name] for key, name in names.items()}
+        return self._task_counts_cache
+
     @property
     def task_statistics(self):
         """Retourne les statistiques des tâches du projet"""
+        counts = self._task_counts()
         stats = {
-            'total': self.tasks.count(),
-            'todo': self.tasks.filter(status='todo').count(),
-            'in_progress': self.tasks.filter(status='in_progress').count(),
-            'review': self.tasks.filter(status='review').count(),
-            'done': self.tasks.filter(status='done').count()
+            'total': counts['total'],
+            'todo': counts['todo'],
+            'in_progress': counts['in_progress'],
+            'review': counts['review'],
+            'done': counts['done']
         }
         stats['completion_rate'] = (stats['done'] / stats['total'] * 100) if stats['total'] > 0 else 0
         return stats
@@ -69,27 +174,58 @@ class Project(models.Model):
     @property
     def is_delayed(self):
         """Vérifie si le projet a des tâches en retard"""
-        return self.tasks.filter(end_date__lt=timezone.now().date()).exclude(status='done').exists()
+        return self._task_counts()['overdue'] > 0
+
+    @property
+    def next_due_date(self):
+        """Prochaine échéance d'une tâche non terminée (statistiques matérialisées uniquement)"""
+        stored = self._stored_stats()
+        return stored.next_due_date if stored is not None else None
 
     @property
     def progress(self):
         """Calcule la progression globale du projet"""
-        total_tasks = self.tasks.count()
+        stored = self._stored_stats()
+        if stored is not None:
+            return stored.progress
+        counts = self._task_counts()
+        total_tasks = counts['total']
         if total_tasks == 0:
             return 0
-        
-        # Pondération des statuts
-        weights = {
-            'done': 1.0,
-            'review': 0.75,
-            'in_progress': 0.5,
-            'todo': 0.0
-        }
-        
+
         weighted_sum = sum(
-            self.tasks.filter(status=status).count() * weight
-            for status, weight in weights.items()
+            counts[status] * weight
+            for status, weight in TASK_PROGRESS_WEIGHTS.items()
         )
-        
+
         progress = (weighted_sum / total_tasks) * 100
         return round(progress, 1)
+
+
+class ProjectStats(models.Model):
+    """
+    Statistiques de tâches d'un projet, matérialisées et tenues à jour après
+    chaque écriture de tâche (voir projects.stats). Les compteurs dépendant
+    de la date du jour (retards, prochaine échéance) sont ceux du dernier
+    recalcul.
+    """
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name='stats'
+    )
+    total = models.PositiveIntegerField(default=0)
+    todo = models.PositiveIntegerField(default=0)
+    in_progress = models.PositiveIntegerField(default=0)
+    review = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0)
+    overdue = models.PositiveIntegerField(default=0)
+    # Progression pondérée (TASK_PROGRESS_WEIGHTS), en pourcentage
+    progress = models.FloatField(default=0)
+    next_due_date = models.DateField(null=True, blank=True)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Statistiques de projet"
+        verbose_name_plural = "Statistiques de projets"
+
+    def __str__(self):
+        return f"Statistiques de {self.project_id}"
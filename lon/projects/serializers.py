@@ -18,6 +18,7 @@ class ProjectSerializer(serializers.ModelSerializer):
     task_statistics = serializers.ReadOnlyField()
     progress = serializers.ReadOnlyField()
     is_delayed = serializers.ReadOnlyField()
+    next_due_date = serializers.ReadOnlyField()
     client_name = serializers.SerializerMethodField()
     client_details = ClientSerializer(source='client', read_only=True)
     manager_name = serializers.SerializerMethodField()
@@ -27,7 +28,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'description', 'location', 'start_date', 'end_date',
             'status', 'status_display', 'budget', 'manager', 'team_members',
-            'created_at', 'updated_at', 'task_statistics', 'progress', 'is_delayed',
+            'created_at', 'updated_at', 'task_statistics', 'progress', 'is_delayed', 'next_due_date',
             'client', 'client_name', 'client_details', 'manager_name'
         ]
 
@@ -39,6 +40,12 @@ class ProjectSerializer(serializers.ModelSerializer):
             return f"{obj.manager.first_name} {obj.manager.last_name}".strip() or obj.manager.username
         return None
 
+class ProjectSummarySerializer(serializers.ModelSerializer):
+    """Représentation compacte d'un projet, utilisée dans les listes de tâches"""
+    class Meta:
+        model = Project
+        fields = ['id', 'name', 'status']
+
 class ProjectCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
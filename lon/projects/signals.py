@@ -0,0 +1,138 @@
+"""
+Invalidation du cache des projets accessibles (voir projects.access) et
+recalcul des statistiques matérialisées (voir projects.stats).
+
+Les invalidations sont différées après le commit : une requête concurrente
+qui recalculerait l'ensemble avant le commit y remettrait l'ancien état.
+"""
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from tasks.models import Task
+from tasks.signals import task_status_changed, tasks_bulk_saved
+from .access import invalidate_accessible_projects
+from .models import Project, ProjectStats
+from .stats import STATS_FIELDS, StatsDeltas, TaskState, refresh_on_commit
+
+
+def invalidate_on_commit(user_ids):
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: invalidate_accessible_projects(user_ids))
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def team_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.projects.add(...) : seul cet utilisateur est concerné
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_on_commit([instance.pk])
+        return
+
+    if action == 'pre_clear':
+        instance._cleared_member_ids = list(instance.team_members.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        invalidate_on_commit(getattr(instance, '_cleared_member_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_on_commit(pk_set or [])
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    # Les valeurs chargées sont encore celles d'avant la sauvegarde
+    old_manager_id = instance.get_loaded_value('manager_id')
+    if created or old_manager_id != instance.manager_id:
+        invalidate_on_commit([old_manager_id, instance.manager_id])
+    if created:
+        # Ligne créée dans la même transaction que le projet, qui n'a pas de tâches
+        ProjectStats.objects.create(project=instance)
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    member_ids = list(instance.team_members.values_list('pk', flat=True))
+    invalidate_on_commit([instance.manager_id, *member_ids])
+
+
+def task_state(task, update_fields=None):
+    """
+    État de la tâche après l'écriture : valeurs de l'instance pour les champs
+    écrits (tous sans update_fields), valeurs chargées pour les autres.
+    """
+    def value(attname):
+        if update_fields is None or attname in update_fields or attname.removesuffix('_id') in update_fields:
+            return getattr(task, attname)
+        return task.get_loaded_value(attname, getattr(task, attname))
+
+    return TaskState(value('project_id'), value('status'), value('overdue_since') is not None, value('end_date'))
+
+
+def loaded_task_state(task):
+    """État de la tâche en base avant l'écriture (valeurs chargées, voir TrackedFieldsMixin)"""
+    def value(attname):
+        return task.get_loaded_value(attname, getattr(task, attname))
+
+    return TaskState(value('project_id'), value('status'), value('overdue_since') is not None, value('end_date'))
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created and update_fields is not None and not STATS_FIELDS & set(update_fields):
+        return
+    if not created and getattr(instance, '_loaded_values', None) is None:
+        # Ancien état inconnu (instance non chargée depuis la base)
+        refresh_on_commit([instance.project_id])
+        return
+    # Les valeurs chargées sont encore celles d'avant la sauvegarde
+    deltas = StatsDeltas()
+    deltas.change(None if created else loaded_task_state(instance), task_state(instance, update_fields))
+    deltas.apply()
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    if origin is not instance:
+        # Suppression en masse ou en cascade d'un projet : un recalcul par projet
+        refresh_on_commit([instance.project_id])
+        return
+    deltas = StatsDeltas()
+    deltas.remove(loaded_task_state(instance))
+    deltas.apply()
+
+
+@receiver(task_status_changed)
+def tasks_transitioned(sender, transitions, **kwargs):
+    deltas = StatsDeltas()
+    for transition in transitions:
+        project_id, end_date = transition['project_id'], transition['end_date']
+        deltas.change(
+            TaskState(project_id, transition['old_status'], transition['old_overdue'], end_date),
+            TaskState(project_id, transition['new_status'], transition['new_overdue'], end_date),
+        )
+    deltas.apply()
+
+
+def bulk_task_state(task, changes, index):
+    """État de la tâche avant (index 0) ou après (index 1) un bulk_update"""
+    def value(name, attname):
+        return changes[name][index] if name in changes else getattr(task, attname)
+
+    return TaskState(
+        value('project', 'project_id'), value('status', 'status'),
+        value('overdue_since', 'overdue_since') is not None, value('end_date', 'end_date'),
+    )
+
+
+@receiver(tasks_bulk_saved)
+def tasks_bulk_written(sender, tasks, created, changes, **kwargs):
+    if not created and not any(STATS_FIELDS & set(task_changes) for task_changes in changes):
+        return
+    deltas = StatsDeltas()
+    for index, task in enumerate(tasks):
+        if created:
+            deltas.add(task_state(task))
+        else:
+            deltas.change(
+                bulk_task_state(task, changes[index], 0), bulk_task_state(task, changes[index], 1)
+            )
+    deltas.apply()
@@ -0,0 +1,194 @@
+"""
+Statistiques de tâches matérialisées (ProjectStats).
+
+Les écritures de tâches sont reportées par incréments, dans leur propre
+transaction : chaque tâche créée, supprimée ou modifiée est retirée de
+l'état de son ancien projet et ajoutée à celui du nouveau (StatsDeltas) ;
+les écarts cumulés sont appliqués par un UPDATE par projet, qui ajuste
+total, compteurs de statut et de retards par F() et en déduit la
+progression. Une opération en masse (bulk_create_tasks, bulk_change_status,
+bulk_update) cumule toutes ses tâches avant d'écrire. Seule la prochaine
+échéance est relue (requête indexée sur les échéances du projet), et
+seulement quand une tâche peut la modifier. Le coût d'une écriture ne
+dépend donc pas du nombre de tâches du projet, ni celui d'une liste de
+projets.
+
+Une ligne qui ne peut pas absorber l'écart (absente, ou qui ne compte pas
+encore une tâche retirée) n'est pas modifiée : son projet est recalculé
+après le commit, comme les suppressions en masse (QuerySet.delete()) et les
+projets du balayage nocturne des retards (tasks.overdue).
+rebuild_project_stats recalcule l'ensemble (réparation, ou chaque nuit
+pour les prochaines échéances, qui ne dépendent que de la date) ; les
+projets sans ligne sont complétés après chaque migrate.
+"""
+from collections import Counter, defaultdict, namedtuple
+
+from django.db import connections, router, transaction
+from django.db.models import Case, F, FloatField, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Round
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from .models import (
+    Project, ProjectStats, TASK_PROGRESS_WEIGHTS, TASK_STATS_ANNOTATIONS, task_stats_aggregates
+)
+
+# Champs de tâche dont dépendent les statistiques
+STATS_FIELDS = {'status', 'end_date', 'project', 'overdue_since'}
+
+# Nombre de projets recalculés par requête
+REFRESH_BATCH_SIZE = 1000
+
+STATS_COLUMNS = [*TASK_STATS_ANNOTATIONS, 'progress', 'next_due_date', 'computed_at']
+
+# Compteurs dont dépend la progression
+PROGRESS_COUNTS = ['total', *TASK_PROGRESS_WEIGHTS]
+
+# État d'une tâche vu par les statistiques
+TaskState = namedtuple('TaskState', ['project_id', 'status', 'overdue', 'end_date'])
+
+
+def _weighted_progress(counts):
+    if not counts['total']:
+        return 0
+    weighted_sum = sum(counts[status] * weight for status, weight in TASK_PROGRESS_WEIGHTS.items())
+    return round(weighted_sum / counts['total'] * 100, 1)
+
+
+def compute_stats(project_ids):
+    """Calcule les statistiques des projets en une requête ; retourne des ProjectStats non sauvegardés"""
+    from tasks.models import Task
+
+    today = timezone.now().date()
+    rows = Task.objects.filter(project_id__in=project_ids).order_by().values('project_id').annotate(
+        **task_stats_aggregates(),
+        next_due_date=Min('end_date', filter=Q(end_date__gte=today) & ~Q(status='done')),
+    )
+    now = timezone.now()
+    stats = {project_id: ProjectStats(project_id=project_id, computed_at=now) for project_id in project_ids}
+    for row in rows:
+        item = stats[row['project_id']]
+        counts = {key: row[name] for key, name in TASK_STATS_ANNOTATIONS.items()}
+        for key, value in counts.items():
+            setattr(item, key, value)
+        item.progress = _weighted_progress(counts)
+        item.next_due_date = row['next_due_date']
+    return list(stats.values())
+
+
+def refresh_project_stats(project_ids):
+    """Recalcule et enregistre les statistiques des projets (ignorés s'ils n'existent plus)"""
+    project_ids = list(Project.objects.filter(pk__in=set(project_ids)).values_list('pk', flat=True))
+    for start in range(0, len(project_ids), REFRESH_BATCH_SIZE):
+        _write(project_ids[start:start + REFRESH_BATCH_SIZE])
+
+
+def rebuild_project_stats():
+    """Recalcule les statistiques de tous les projets ; retourne le nombre de projets"""
+    project_ids = list(Project.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(project_ids), REFRESH_BATCH_SIZE):
+        _write(project_ids[start:start + REFRESH_BATCH_SIZE])
+    return len(project_ids)
+
+
+def create_missing_stats(**kwargs):
+    """Crée les statistiques des projets qui n'en ont pas encore (receveur de post_migrate)"""
+    refresh_project_stats(Project.objects.filter(stats__isnull=True).values_list('pk', flat=True))
+
+
+def next_due_date_subquery(today):
+    from tasks.models import Task
+
+    return Subquery(
+        Task.objects.filter(project_id=OuterRef('project_id'), end_date__gte=today)
+        .exclude(status='done').order_by('end_date').values('end_date')[:1]
+    )
+
+
+class StatsDeltas:
+    """
+    Écarts de statistiques cumulés par projet. apply() les écrit par un
+    UPDATE par projet ; à appeler dans la transaction des écritures.
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(Counter)
+        self.due_date_projects = set()
+        self.today = timezone.now().date()
+
+    def _add(self, state, sign):
+        if state is None or state.project_id is None:
+            return
+        counts = self.counts[state.project_id]
+        counts['total'] += sign
+        counts[state.status] += sign
+        if state.overdue:
+            counts['overdue'] += sign
+        if state.end_date is not None and state.end_date >= self.today and state.status != 'done':
+            self.due_date_projects.add(state.project_id)
+
+    def add(self, state):
+        self._add(state, 1)
+
+    def remove(self, state):
+        self._add(state, -1)
+
+    def change(self, old, new):
+        if old != new:
+            self.remove(old)
+            self.add(new)
+
+    def apply(self):
+        for project_id in set(self.counts) | self.due_date_projects:
+            counts = {field: delta for field, delta in self.counts[project_id].items() if delta}
+            if counts or project_id in self.due_date_projects:
+                _apply_deltas(project_id, counts, project_id in self.due_date_projects, self.today)
+
+
+def _apply_deltas(project_id, counts, due_date_changed, today):
+    values = {field: F(field) + delta for field, delta in counts.items()}
+    if set(counts) & set(PROGRESS_COUNTS):
+        # Les expressions de l'UPDATE lisent les anciennes valeurs
+        new = {field: F(field) + counts.get(field, 0) for field in PROGRESS_COUNTS}
+        weighted_sum = sum(new[status] * weight for status, weight in TASK_PROGRESS_WEIGHTS.items())
+        values['progress'] = Case(
+            When(GreaterThan(new['total'], 0), then=Round(weighted_sum * 100.0 / new['total'], 1)),
+            default=Value(0.0), output_field=FloatField(),
+        )
+    if due_date_changed:
+        values['next_due_date'] = next_due_date_subquery(today)
+    values['computed_at'] = timezone.now()
+    # Une ligne qui ne compte pas les tâches retirées est recalculée
+    guards = {f'{field}__gte': -delta for field, delta in counts.items() if delta < 0}
+    if not ProjectStats.objects.filter(project_id=project_id, **guards).update(**values):
+        refresh_on_commit([project_id])
+
+
+def _write(project_ids):
+    ProjectStats.objects.bulk_create(
+        compute_stats(project_ids),
+        update_conflicts=True, unique_fields=['project'], update_fields=STATS_COLUMNS,
+    )
+
+
+def refresh_on_commit(project_ids):
+    """
+    Planifie le recalcul des projets après le commit de la transaction en
+    cours. Les projets signalés pendant une même transaction sont recalculés
+    ensemble, par le premier rappel exécuté ; ceux d'une transaction annulée
+    le seront au commit suivant, sans effet sur le résultat.
+    """
+    project_ids = {project_id for project_id in project_ids if project_id}
+    if not project_ids:
+        return
+    connection = connections[router.db_for_write(ProjectStats)]
+    pending = connection.__dict__.setdefault('_project_stats_pending', set())
+    pending.update(project_ids)
+
+    def flush():
+        ids = set(pending)
+        pending.clear()
+        if ids:
+            refresh_project_stats(ids)
+
+    transaction.on_commit(flush, using=connection.alias)
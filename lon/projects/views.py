@@ -1,20 +1,47 @@
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from api.async_views import AsyncListMixin
+from api.pagination import CreatedAtKeysetPagination
 from .models import Project
 from .serializers import ProjectSerializer, ProjectCreateUpdateSerializer
 
-class ProjectViewSet(viewsets.ModelViewSet):
+
+class ProjectViewSet(AsyncListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
-    
+    pagination_class = CreatedAtKeysetPagination
+    # Actions d'écriture : le sérialiseur ne lit aucune relation imbriquée
+    write_actions = ['create', 'update', 'partial_update', 'destroy']
+
     def get_queryset(self):
-        return Project.objects.all()
+        queryset = Project.objects.all()
+        # ?overdue=true : projets ayant des tâches en retard
+        if self.request.query_params.get('overdue', '').lower() in ('1', 'true', 'yes'):
+            queryset = queryset.delayed()
+        return self.plan_queryset(queryset)
+
+    def plan_queryset(self, queryset):
+        """
+        Applique les jointures et préchargements nécessaires à l'action courante
+        afin que la sérialisation ne déclenche aucune requête par projet.
+        """
+        if self.action in self.write_actions:
+            return queryset
+        return queryset.with_relations().with_stats()
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return ProjectCreateUpdateSerializer
         return ProjectSerializer
 
+    async def alist(self, request, *args, **kwargs):
+        """Variante asynchrone de list() (mode ASGI)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        projects = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(projects, many=True)
+        return self.get_paginated_response(await sync_to_async(lambda: serializer.data)())
+
     def perform_create(self, serializer):
         # Si le manager n'est pas spécifié, utilisez l'utilisateur actuel
         if not serializer.validated_data.get('manager'):
@@ -25,9 +52,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['GET'])
     def managed(self, request):
         """Retourne les projets gérés par l'utilisateur"""
-        projects = Project.objects.filter(manager=request.user)
+        projects = self.paginate_queryset(self.plan_queryset(Project.objects.filter(manager=request.user)))
         serializer = self.get_serializer(projects, many=True)
-        return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['PATCH'])
     def update_status(self, request, pk=None):
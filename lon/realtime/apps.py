@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class RealtimeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'realtime'
+    verbose_name = "Temps réel"
+
+    def ready(self):
+        from .broker import check_broker_settings
+        check_broker_settings()
+        # Publication des changements de tâches et des nouvelles notifications
+        from . import signals  # noqa: F401
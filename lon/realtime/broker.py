@@ -0,0 +1,174 @@
+"""
+Diffusion des événements temps réel.
+
+Les événements sont publiés sur des canaux ('project:<id>', 'user:<id>')
+depuis le code synchrone, et lus par les flux SSE (code asynchrone).
+Le broker est choisi par le réglage REALTIME_BROKER :
+
+- InProcessBroker (par défaut sans REDIS_URL) : files asyncio en mémoire,
+  limité à un seul processus serveur (refusé si WEB_CONCURRENCY > 1) ;
+  utilisé par les tests.
+- RedisBroker : pub/sub Redis (REDIS_URL), pour plusieurs processus ou
+  serveurs ; nécessite le paquet redis.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+# Événements en attente par abonné au-delà desquels les plus anciens sont perdus
+MAX_PENDING_EVENTS = 100
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Retourne l'instance (unique par processus) du broker configuré"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.REALTIME_BROKER)()
+    return _broker
+
+
+def check_broker_settings():
+    """
+    Refuse au démarrage un broker limité à un processus lorsque plusieurs
+    workers servent l'application : les événements publiés par un worker
+    n'atteindraient pas les flux ouverts sur les autres.
+    """
+    broker_class = import_string(settings.REALTIME_BROKER)
+    if broker_class.single_process and settings.WEB_CONCURRENCY > 1:
+        raise ImproperlyConfigured(
+            f"{settings.REALTIME_BROKER} ne dessert qu'un processus : avec "
+            f"WEB_CONCURRENCY={settings.WEB_CONCURRENCY}, utiliser "
+            "realtime.broker.RedisBroker (REDIS_URL)."
+        )
+
+
+class BaseBroker:
+    # Vrai si les événements n'atteignent que les abonnés du processus qui publie
+    single_process = False
+
+    def publish(self, channel, event):
+        """Publie `event` (dict sérialisable en JSON) sur `channel` ; appelable depuis tout thread"""
+        raise NotImplementedError
+
+    def subscribe(self, channels):
+        """
+        Retourne un abonnement aux canaux, à utiliser avec `async with` ;
+        `await subscription.get(timeout)` renvoie l'événement suivant ou lève
+        asyncio.TimeoutError.
+        """
+        raise NotImplementedError
+
+
+class InProcessSubscription:
+    def __init__(self, broker, channels):
+        self.broker = broker
+        self.channels = list(channels)
+        self.queue = None
+        self.loop = None
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self.broker._add(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker._remove(self)
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # Boucle fermée : l'abonné est parti
+
+    def _put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InProcessBroker(BaseBroker):
+    single_process = True
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _add(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions[channel].add(subscription)
+
+    def _remove(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions[channel].discard(subscription)
+                if not self._subscriptions[channel]:
+                    del self._subscriptions[channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def subscribe(self, channels):
+        return InProcessSubscription(self, channels)
+
+
+class RedisSubscription:
+    def __init__(self, broker, channels):
+        self.broker = broker
+        self.channels = [broker.prefix + channel for channel in channels]
+
+    async def __aenter__(self):
+        from redis import asyncio as redis_asyncio
+        self.client = redis_asyncio.Redis.from_url(self.broker.url)
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.subscribe(*self.channels)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.pubsub.unsubscribe()
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+    async def get(self, timeout=None):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            raise asyncio.TimeoutError()
+        return json.loads(message['data'])
+
+
+class RedisBroker(BaseBroker):
+    prefix = 'realtime:'
+
+    def __init__(self):
+        try:
+            import redis
+        except ImportError as error:
+            raise ImproperlyConfigured("RedisBroker nécessite le paquet redis.") from error
+        self.url = getattr(settings, 'REDIS_URL', None)
+        if not self.url:
+            raise ImproperlyConfigured("RedisBroker nécessite le réglage REDIS_URL.")
+        self.client = redis.Redis.from_url(self.url)
+
+    def publish(self, channel, event):
+        self.client.publish(self.prefix + channel, json.dumps(event, cls=DjangoJSONEncoder))
+
+    def subscribe(self, channels):
+        return RedisSubscription(self, channels)
@@ -0,0 +1,26 @@
+"""
+Publication des événements temps réel après le commit de la transaction courante.
+"""
+from django.db import transaction
+
+from .broker import get_broker
+
+
+def project_channel(project_id):
+    return f'project:{project_id}'
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def publish(channels, event):
+    """Publie `event` sur chacun des canaux une fois la transaction validée"""
+    channels = [channel for channel in channels if channel]
+
+    def send():
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, event)
+
+    transaction.on_commit(send)
@@ -0,0 +1,91 @@
+"""
+Événements poussés aux clients : changements de statut et assignations de
+tâches (canal du projet, et canal de l'utilisateur assigné), nouvelles
+notifications (canal de l'utilisateur).
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.models import Notification
+from accounts.utils import notifications_created
+from tasks.models import Task
+from tasks.signals import task_status_changed, tasks_bulk_saved
+from .events import project_channel, publish, user_channel
+
+
+def publish_status_change(task_id, project_id, old_status, new_status):
+    publish([project_channel(project_id)], {
+        'type': 'task.status_changed',
+        'task_id': task_id,
+        'project_id': project_id,
+        'old_status': old_status,
+        'new_status': new_status,
+    })
+
+
+def publish_assignment(task_id, project_id, title, assigned_to_id):
+    channels = [project_channel(project_id)]
+    if assigned_to_id:
+        channels.append(user_channel(assigned_to_id))
+    publish(channels, {
+        'type': 'task.assigned',
+        'task_id': task_id,
+        'project_id': project_id,
+        'title': title,
+        'assigned_to': assigned_to_id,
+    })
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    # Les valeurs chargées sont encore celles d'avant la sauvegarde (TrackedFieldsMixin)
+    if created:
+        if instance.assigned_to_id:
+            publish_assignment(instance.pk, instance.project_id, instance.title, instance.assigned_to_id)
+        return
+    old_status = instance.get_loaded_value('status', instance.status)
+    if old_status != instance.status:
+        publish_status_change(instance.pk, instance.project_id, old_status, instance.status)
+    if instance.get_loaded_value('assigned_to_id', instance.assigned_to_id) != instance.assigned_to_id:
+        publish_assignment(instance.pk, instance.project_id, instance.title, instance.assigned_to_id)
+
+
+@receiver(task_status_changed)
+def tasks_transitioned(sender, transitions, **kwargs):
+    for transition in transitions:
+        publish_status_change(
+            transition['task_id'], transition['project_id'],
+            transition['old_status'], transition['new_status'],
+        )
+
+
+@receiver(tasks_bulk_saved)
+def tasks_bulk_written(sender, tasks, created, changes, **kwargs):
+    for index, task in enumerate(tasks):
+        if created:
+            assigned = task.assigned_to_id is not None
+        else:
+            old, new = changes[index].get('assigned_to', (None, None))
+            assigned = old != new
+        if assigned:
+            publish_assignment(task.pk, task.project_id, task.title, task.assigned_to_id)
+
+
+def publish_notification(user_id, message, notification_id=None):
+    publish([user_channel(user_id)], {
+        'type': 'notification.created',
+        'id': notification_id,
+        'message': message,
+    })
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        publish_notification(instance.user_id, instance.message, instance.pk)
+
+
+@receiver(notifications_created)
+def notifications_bulk_created(sender, user_ids, message, **kwargs):
+    for user_id in user_ids:
+        publish_notification(user_id, message)
@@ -0,0 +1,142 @@
+"""
+Flux Server-Sent Events des événements temps réel.
+
+La vue est asynchrone : sous ASGI chaque connexion ouverte ne mobilise
+qu'une coroutine. Sous WSGI, un flux occuperait un worker pour toute sa
+durée : le flux n'y est pas servi (204) et le client se rabat sur
+l'interrogation périodique.
+
+EventSource ne permettant pas d'envoyer d'en-têtes, le client obtient
+d'abord un ticket (POST ticket/, authentifié par jeton) puis ouvre le flux
+avec ?ticket= : le ticket est à usage unique et expire après
+REALTIME_TICKET_TIMEOUT secondes, le jeton d'accès n'apparaît donc jamais
+dans l'URL ni dans les journaux d'accès.
+"""
+import asyncio
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from accounts.authentication import CachedJWTAuthentication
+from projects.access import accessible_project_ids
+from .broker import get_broker
+from .events import project_channel, user_channel
+
+
+TICKET_KEY = 'realtime:ticket:{}'
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def issue_ticket(user):
+    ticket = secrets.token_urlsafe(32)
+    cache.set(TICKET_KEY.format(ticket), user.pk, settings.REALTIME_TICKET_TIMEOUT)
+    return ticket
+
+
+def redeem_ticket(ticket):
+    """Utilisateur actif du ticket, qui est consommé ; None s'il est inconnu ou expiré"""
+    key = TICKET_KEY.format(ticket)
+    user_id = cache.get(key)
+    # La suppression réclame le ticket : seule la requête qui l'a effectivement
+    # supprimé l'utilise, même si plusieurs l'ont lu en même temps
+    if user_id is None or not cache.delete(key):
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+
+def authenticate(request):
+    """
+    Authentifie par l'en-tête Authorization ou par un ticket (?ticket=).
+    """
+    ticket = request.GET.get('ticket')
+    if ticket:
+        return redeem_ticket(ticket)
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if not raw_token:
+        return None
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def ticket(request):
+    """
+    Ticket d'ouverture du flux. 204 sous WSGI : le flux n'y est pas servi.
+    """
+    if not is_asgi(request):
+        return Response(status=204)
+    return Response({
+        'ticket': issue_ticket(request.user),
+        'expires_in': settings.REALTIME_TICKET_TIMEOUT,
+    })
+
+
+def subscribed_channels(user, query_params):
+    """
+    Canal de l'utilisateur et canaux des projets demandés (?projects=1,2),
+    limités aux projets accessibles ; par défaut, tous les projets accessibles.
+    """
+    requested = {
+        int(value) for value in query_params.get('projects', '').split(',') if value.strip().isdigit()
+    }
+    if user.is_staff and requested:
+        project_ids = requested
+    else:
+        project_ids = accessible_project_ids(user)
+        if requested:
+            project_ids = project_ids & requested
+    return [user_channel(user.pk)] + [project_channel(project_id) for project_id in sorted(project_ids)]
+
+
+def format_event(event):
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+async def event_stream(channels):
+    async with get_broker().subscribe(channels) as subscription:
+        # Premier message immédiat : le client sait que l'abonnement est actif
+        yield ': connected\n\n'
+        while True:
+            try:
+                event = await subscription.get(timeout=settings.REALTIME_KEEPALIVE)
+            except asyncio.TimeoutError:
+                # Commentaire SSE : maintient la connexion ouverte à travers les proxys
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event)
+
+
+async def stream(request):
+    # 204 : EventSource ne se reconnecte pas, le client interroge l'API
+    if not is_asgi(request):
+        return HttpResponse(status=204)
+    user = await sync_to_async(authenticate)(request)
+    if user is None:
+        return JsonResponse({'detail': "Authentification requise."}, status=401)
+    channels = await sync_to_async(subscribed_channels)(user, request.GET)
+    response = StreamingHttpResponse(event_stream(channels), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Désactive la mise en tampon de nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
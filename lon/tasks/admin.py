@@ -2,14 +2,30 @@ from django.contrib import admin
 from django.utils.html import format_html
 from .models import Task, TaskDocument
 
+class OverdueFilter(admin.SimpleListFilter):
+    """Filtre sur l'indicateur de retard stocké (index partiel sur overdue_since)"""
+    title = "en retard"
+    parameter_name = 'overdue'
+
+    def lookups(self, request, model_admin):
+        return [('yes', "Oui"), ('no', "Non")]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(overdue_since__isnull=False)
+        if self.value() == 'no':
+            return queryset.filter(overdue_since__isnull=True)
+        return queryset
+
+
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ('title', 'project', 'colored_status', 'colored_priority', 
                    'assigned_to', 'start_date', 'end_date', 'is_overdue_status')
-    list_filter = ('status', 'priority', 'project', 'assigned_to')
+    list_filter = ('status', 'priority', OverdueFilter, 'project', 'assigned_to')
     search_fields = ('title', 'description', 'project__name')
     date_hierarchy = 'start_date'
-    readonly_fields = ('created_at', 'updated_at', 'created_by')
+    readonly_fields = ('created_at', 'updated_at', 'created_by', 'overdue_since')
 
     def colored_status(self, obj):
         colors = {
@@ -38,11 +54,13 @@ class TaskAdmin(admin.ModelAdmin):
             obj.get_priority_display()
         )
     colored_priority.short_description = 'Priorité'
+    colored_priority.admin_order_field = 'priority_rank'
 
     def is_overdue_status(self, obj):
         return obj.is_overdue
     is_overdue_status.boolean = True
     is_overdue_status.short_description = "En retard ?"
+    is_overdue_status.admin_order_field = 'overdue_since'
 
     def save_model(self, request, obj, form, change):
         if not change:  # Si c'est une nouvelle tâche
@@ -52,4 +70,10 @@ class TaskAdmin(admin.ModelAdmin):
 @admin.register(TaskDocument)
 class TaskDocumentAdmin(admin.ModelAdmin):
     list_display = ('title', 'task', 'uploaded_by', 'uploaded_at')
+    # str(task) lit le nom du projet
+    list_select_related = ('task__project', 'uploaded_by')
+
+    def get_queryset(self, request):
+        # Le journal d'activité lit le projet de la tâche à l'enregistrement
+        return super().get_queryset(request).select_related('task')
     search_fields = ('title', 'task__title')
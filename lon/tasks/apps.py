@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from .calendar import create_date_range_index
+        # Index GiST du calendrier (PostgreSQL uniquement)
+        post_migrate.connect(create_date_range_index, sender=self)
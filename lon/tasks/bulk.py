@@ -0,0 +1,219 @@
+"""
+Opérations en masse sur les tâches.
+
+Chaque opération valide l'ensemble des éléments en quelques requêtes
+groupées puis écrit tout dans une seule transaction : si un élément est
+invalide, rien n'est écrit et le résultat de chaque élément est renvoyé.
+"""
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from projects.models import Project
+from .models import Task, VALID_STATUS_TRANSITIONS, overdue_since_for, status_update_values
+from .signals import task_status_changed, tasks_bulk_saved
+from .serializers import TaskSerializer, BulkStatusItemSerializer, BulkReassignItemSerializer
+
+User = get_user_model()
+
+# Nombre maximal d'éléments par requête
+MAX_BULK_ITEMS = 1000
+
+# Taille des lots d'INSERT/UPDATE
+BULK_BATCH_SIZE = 500
+
+
+class BulkConflict(Exception):
+    """Levée quand des tâches ont changé de statut pendant l'opération"""
+
+
+def _results(count):
+    return [{'index': index, 'id': None, 'errors': None} for index in range(count)]
+
+
+def _has_errors(results):
+    return any(result['errors'] for result in results)
+
+
+def _parse(serializer_class, items, results):
+    """Valide la forme de chaque élément ; retourne les données validées (None si invalide)"""
+    validated = []
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item)
+        if serializer.is_valid():
+            validated.append(serializer.validated_data)
+        else:
+            results[index]['errors'] = serializer.errors
+            validated.append(None)
+    return validated
+
+
+def _existing_user_ids(user_ids):
+    user_ids = {user_id for user_id in user_ids if user_id}
+    return set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+
+
+def bulk_create_tasks(items, user, project_ids=None):
+    """
+    Crée des tâches en masse avec bulk_create.
+    `project_ids` restreint les projets autorisés (None : tous les projets).
+    Retourne (résultats par élément, succès).
+    """
+    results = _results(len(items))
+    validated = _parse(TaskSerializer, items, results)
+
+    referenced_projects = {data['project_id'] for data in validated if data}
+    existing_projects = set(
+        Project.objects.filter(pk__in=referenced_projects).values_list('pk', flat=True)
+    )
+    if project_ids is not None:
+        existing_projects &= set(project_ids)
+    existing_users = _existing_user_ids(data.get('assigned_to_id') for data in validated if data)
+
+    tasks = []
+    for index, data in enumerate(validated):
+        if data is None:
+            continue
+        errors = {}
+        if data['project_id'] not in existing_projects:
+            errors['project_id'] = ["Projet introuvable."]
+        assigned_to_id = data.get('assigned_to_id')
+        if assigned_to_id and assigned_to_id not in existing_users:
+            errors['assigned_to_id'] = ["Utilisateur introuvable."]
+        start_date, end_date = data.get('start_date'), data.get('end_date')
+        if start_date and end_date and start_date > end_date:
+            errors['start_date'] = ["La date de début ne peut pas être postérieure à la date de fin."]
+        if errors:
+            results[index]['errors'] = errors
+            continue
+        task = Task(created_by=user, **data)
+        # bulk_create n'appelle pas save()
+        task.update_overdue_since()
+        tasks.append((index, task))
+
+    if _has_errors(results):
+        return results, False
+
+    with transaction.atomic():
+        created = Task.objects.bulk_create([task for _, task in tasks], batch_size=BULK_BATCH_SIZE)
+        tasks_bulk_saved.send(sender=Task, tasks=created, created=True, changes=None)
+    for (index, _), task in zip(tasks, created):
+        results[index]['id'] = task.pk
+    return results, True
+
+
+def bulk_change_status(items, queryset):
+    """
+    Change le statut de tâches en masse.
+    Les transitions sont validées d'après les statuts lus en une requête, puis
+    appliquées par un UPDATE conditionnel par couple (ancien, nouveau) statut ;
+    si une tâche a changé de statut entre-temps, la transaction est annulée
+    et BulkConflict est levée.
+    """
+    results = _results(len(items))
+    validated = _parse(BulkStatusItemSerializer, items, results)
+    ids = [data['id'] for data in validated if data]
+    current = {
+        task['pk']: task
+        for task in queryset.filter(pk__in=ids).values(
+            'pk', 'status', 'project_id', 'title', 'end_date', 'overdue_since'
+        )
+    }
+
+    groups = defaultdict(list)
+    seen = set()
+    for index, data in enumerate(validated):
+        if data is None:
+            continue
+        task_id, new_status = data['id'], data['status']
+        results[index]['id'] = task_id
+        if task_id in seen:
+            results[index]['errors'] = {'id': ["Tâche présente plusieurs fois."]}
+            continue
+        seen.add(task_id)
+        if task_id not in current:
+            results[index]['errors'] = {'id': ["Tâche introuvable."]}
+            continue
+        old_status = current[task_id]['status']
+        if new_status == old_status:
+            continue
+        if new_status not in VALID_STATUS_TRANSITIONS.get(old_status, []):
+            results[index]['errors'] = {
+                'status': [f"Transition '{old_status}' → '{new_status}' non autorisée."]
+            }
+            continue
+        groups[(old_status, new_status)].append(task_id)
+
+    if _has_errors(results):
+        return results, False
+
+    now = timezone.now()
+    transitions = []
+    with transaction.atomic():
+        for (old_status, new_status), task_ids in groups.items():
+            updated = Task.objects.filter(pk__in=task_ids, status=old_status).update(
+                **status_update_values(new_status, now)
+            )
+            if updated != len(task_ids):
+                raise BulkConflict()
+            for task_id in task_ids:
+                task = current[task_id]
+                transitions.append({
+                    'task_id': task_id, 'project_id': task['project_id'], 'title': task['title'],
+                    'old_status': old_status, 'new_status': new_status, 'end_date': task['end_date'],
+                    'old_overdue': task['overdue_since'] is not None,
+                    'new_overdue': overdue_since_for(new_status, task['end_date'], now.date()) is not None,
+                })
+        # Un seul envoi : les statistiques de chaque projet sont ajustées en un UPDATE
+        task_status_changed.send(sender=Task, transitions=transitions)
+    return results, True
+
+
+def bulk_reassign(items, queryset):
+    """
+    Réassigne des tâches en masse avec bulk_update.
+    `assigned_to_id` à null désassigne la tâche.
+    """
+    results = _results(len(items))
+    validated = _parse(BulkReassignItemSerializer, items, results)
+    ids = [data['id'] for data in validated if data]
+    tasks = queryset.filter(pk__in=ids).only(
+        'id', 'title', 'project', 'assigned_to', 'updated_at'
+    ).in_bulk()
+    existing_users = _existing_user_ids(data['assigned_to_id'] for data in validated if data)
+
+    now = timezone.now()
+    changed = []
+    seen = set()
+    for index, data in enumerate(validated):
+        if data is None:
+            continue
+        task_id, assigned_to_id = data['id'], data['assigned_to_id']
+        results[index]['id'] = task_id
+        task = tasks.get(task_id)
+        if task_id in seen:
+            results[index]['errors'] = {'id': ["Tâche présente plusieurs fois."]}
+            continue
+        seen.add(task_id)
+        if task is None:
+            results[index]['errors'] = {'id': ["Tâche introuvable."]}
+        elif assigned_to_id and assigned_to_id not in existing_users:
+            results[index]['errors'] = {'assigned_to_id': ["Utilisateur introuvable."]}
+        else:
+            task.assigned_to_id = assigned_to_id
+            task.updated_at = now
+            changed.append(task)
+
+    if _has_errors(results):
+        return results, False
+
+    changes = [
+        {'assigned_to': [task.get_loaded_value('assigned_to_id'), task.assigned_to_id]}
+        for task in changed
+    ]
+    with transaction.atomic():
+        Task.objects.bulk_update(changed, ['assigned_to', 'updated_at'], batch_size=BULK_BATCH_SIZE)
+        tasks_bulk_saved.send(sender=Task, tasks=changed, created=False, changes=changes)
+    return results, True
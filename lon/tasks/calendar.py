@@ -0,0 +1,183 @@
+"""
+Requêtes du calendrier des tâches.
+
+Sous PostgreSQL, le chevauchement de périodes est exprimé avec des
+daterange et l'opérateur &&, servi par un index GiST sur l'expression
+(créé après les migrations, voir create_date_range_index). Les autres SGBD
+utilisent la comparaison de bornes classique, servie par l'index B-tree
+(start_date, end_date) de Task.
+"""
+import hashlib
+from datetime import datetime, timedelta
+
+from django.db import connections, models
+from django.db.models import Count, F, Max, Q, Value
+
+# Durée maximale d'une fenêtre de calendrier
+MAX_WINDOW_DAYS = 366
+
+# Index GiST sur la période de chaque tâche ; l'expression doit rester
+# identique à celle produite par DateRangeOverlaps pour que l'index serve.
+DATE_RANGE_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS task_date_range_gist ON tasks_task USING gist "
+    "(daterange(start_date, CASE WHEN end_date < start_date THEN start_date ELSE end_date END, '[]'))"
+)
+
+
+class DateRangeOverlaps(models.Func):
+    """
+    daterange(début, fin, '[]') && daterange(fenêtre_début, fenêtre_fin, '[]').
+    Une fin NULL est une période ouverte ; une fin antérieure au début est
+    ramenée au début (daterange la refuserait).
+    """
+    arity = 4
+    output_field = models.BooleanField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (start, start_params), (end, end_params), (lower, lower_params), (upper, upper_params) = [
+            compiler.compile(expression) for expression in self.get_source_expressions()
+        ]
+        sql = (
+            f"daterange({start}, CASE WHEN {end} < {start} THEN {start} ELSE {end} END, '[]') "
+            f"&& daterange({lower}, {upper}, '[]')"
+        )
+        params = (
+            *start_params, *end_params, *start_params, *start_params, *end_params,
+            *lower_params, *upper_params
+        )
+        return sql, params
+
+
+def create_date_range_index(using='default', **kwargs):
+    """Crée l'index GiST du calendrier sous PostgreSQL (signal post_migrate)"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(DATE_RANGE_INDEX_SQL)
+
+
+def overlapping(queryset, start_date, end_date):
+    """Filtre les tâches dont la période chevauche [start_date, end_date]"""
+    if connections[queryset.db].vendor == 'postgresql':
+        return queryset.filter(start_date__isnull=False).filter(DateRangeOverlaps(
+            F('start_date'), F('end_date'), Value(start_date), Value(end_date)
+        ))
+    return queryset.filter(
+        Q(start_date__lte=end_date) & (Q(end_date__gte=start_date) | Q(end_date__isnull=True))
+    )
+
+
+def parse_window(query_params):
+    """
+    Lit start_date/end_date (YYYY-MM-DD) ; par défaut le mois courant.
+    Lève ValueError si une date est invalide.
+    """
+    start_date = query_params.get('start_date')
+    end_date = query_params.get('end_date')
+    if start_date:
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    else:
+        # Par défaut, début du mois courant
+        start_date = datetime.now().date().replace(day=1)
+    if end_date:
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    else:
+        # Par défaut, fin du mois
+        next_month = start_date.replace(day=28) + timedelta(days=4)
+        end_date = next_month.replace(day=1) - timedelta(days=1)
+    return start_date, end_date
+
+
+# État d'une fenêtre servant à calculer son ETag : le flux reprend le nom
+# des projets et des assignés, leur dernière modification en fait donc partie
+ETAG_AGGREGATES = {
+    'count': Count('id'),
+    'last_update': Max('updated_at'),
+    'last_project_update': Max('project__updated_at'),
+    'last_assignee_update': Max('assigned_to__updated_at'),
+}
+ETAG_UPDATES = ('last_update', 'last_project_update', 'last_assignee_update')
+
+
+def compute_etag(queryset, *key_parts):
+    """
+    ETag de la fenêtre : dépend du nombre de tâches et de la date de dernière
+    modification des tâches, de leurs projets et de leurs assignés (une seule
+    requête d'agrégat).
+    """
+    return _etag(queryset.order_by().aggregate(**ETAG_AGGREGATES), key_parts)
+
+
+async def acompute_etag(queryset, *key_parts):
+    return _etag(await queryset.order_by().aaggregate(**ETAG_AGGREGATES), key_parts)
+
+
+def _etag(state, key_parts):
+    updates = [
+        state[name].isoformat() if state[name] else ''
+        for name in ETAG_UPDATES
+    ]
+    key = ':'.join(str(part) for part in (*key_parts, state['count'], *updates))
+    return '"%s"' % hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+def assignee_name(first_name, last_name, username):
+    if username is None:
+        return None
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    return username
+
+
+def build_feed(queryset, start_date, end_date):
+    """
+    Projection compacte des tâches de la fenêtre et index jour -> tâches.
+    """
+    return _feed(feed_rows(queryset), start_date, end_date)
+
+
+async def abuild_feed(queryset, start_date, end_date):
+    return _feed([row async for row in feed_rows(queryset)], start_date, end_date)
+
+
+def feed_rows(queryset):
+    return queryset.values(
+        'id', 'title', 'start_date', 'end_date', 'status', 'priority', 'project_id',
+        'assigned_to_id', project_name=F('project__name'),
+        assigned_first_name=F('assigned_to__first_name'),
+        assigned_last_name=F('assigned_to__last_name'),
+        assigned_username=F('assigned_to__username'),
+    )
+
+
+def _feed(rows, start_date, end_date):
+    tasks = []
+    days = {}
+    for row in rows:
+        tasks.append({
+            'id': row['id'],
+            'title': row['title'],
+            'start_date': row['start_date'],
+            'end_date': row['end_date'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'project_id': row['project_id'],
+            'project_name': row['project_name'],
+            'assigned_to_id': row['assigned_to_id'],
+            'assigned_to_name': assignee_name(
+                row['assigned_first_name'], row['assigned_last_name'], row['assigned_username']
+            ),
+        })
+        first_day = max(row['start_date'], start_date)
+        last_day = min(max(row['end_date'] or end_date, row['start_date']), end_date)
+        day = first_day
+        while day <= last_day:
+            days.setdefault(day.isoformat(), []).append(row['id'])
+            day += timedelta(days=1)
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'tasks': tasks,
+        'days': days,
+    }
@@ -1,5 +1,7 @@
 from django import forms
-from .models import Task, TaskDocument
+from .models import Task, TaskDocument, VALID_STATUS_TRANSITIONS
+from projects.access import accessible_project_ids
+from projects.models import Project
 
 class TaskForm(forms.ModelForm):
     class Meta:
@@ -21,7 +23,7 @@ class TaskForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         if user:
             # Filtrer les projets où l'utilisateur est membre ou manager
-            self.fields['project'].queryset = user.projects.all() | user.managed_projects.all()
+            self.fields['project'].queryset = Project.objects.filter(pk__in=accessible_project_ids(user))
             # Filtrer les assignations aux membres des projets
             if self.instance and self.instance.pk and self.instance.project:
                 self.fields['assigned_to'].queryset = self.instance.project.team_members.all()
@@ -33,7 +35,7 @@ class TaskForm(forms.ModelForm):
         start_date = cleaned_data.get('start_date')
         end_date = cleaned_data.get('end_date')
         status = cleaned_data.get('status')
-        old_status = self.instance.status if self.instance.pk else None
+        old_status = self.instance.get_loaded_value('status') if self.instance.pk else None
 
         # Validation des dates
         if start_date and end_date and start_date > end_date:
@@ -42,11 +44,11 @@ class TaskForm(forms.ModelForm):
             )
 
         # Validation du changement de statut
-        if old_status and status != old_status:
-            valid_transitions = Task.VALID_STATUS_TRANSITIONS.get(old_status, [])
+        if old_status and status and status != old_status:
+            valid_transitions = VALID_STATUS_TRANSITIONS.get(old_status, [])
             if status not in valid_transitions:
                 raise forms.ValidationError(
-                    f"Impossible de passer directement de '{self.instance.get_status_display()}' à '{dict(Task.STATUS_CHOICES)[status]}'"
+                    f"Impossible de passer directement de '{dict(Task.STATUS_CHOICES)[old_status]}' à '{dict(Task.STATUS_CHOICES)[status]}'"
                 )
 
         return cleaned_data
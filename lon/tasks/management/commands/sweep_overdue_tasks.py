@@ -0,0 +1,38 @@
+"""
+Signale les tâches en retard (Task.overdue_since) et notifie leurs responsables.
+
+À lancer chaque nuit, juste après minuit (cron) :
+
+    5 0 * * * python manage.py sweep_overdue_tasks
+
+--date rejoue le balayage pour une autre date (rattrapage) ; --no-notify
+signale les tâches sans créer de notifications.
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.overdue import sweep_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = "Signale les tâches en retard et notifie leurs responsables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Date de référence (AAAA-MM-JJ), par défaut aujourd'hui")
+        parser.add_argument('--no-notify', action='store_true', help="Ne crée aucune notification")
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Date invalide : {options['date']}")
+        started = time.monotonic()
+        result = sweep_overdue_tasks(today, notify=not options['no_notify'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['flagged']} tâches signalées en retard, {result['cleared']} retards levés, "
+            f"{result['notified']} notifications en {time.monotonic() - started:.1f} s"
+        ))
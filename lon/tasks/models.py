@@ -6,9 +6,42 @@ import os
 from django.core.exceptions import ValidationError
 from datetime import timedelta
 from datetime import datetime, time
+from api.models import TrackedFieldsMixin
+from .signals import task_status_changed
 
 
-class Task(models.Model):
+# Rang des priorités, de la plus basse à la plus haute
+PRIORITY_RANKS = {
+    'low': 0,
+    'medium': 1,
+    'high': 2,
+    'urgent': 3
+}
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user, project_ids=None):
+        """
+        Restreint aux tâches visibles par l'utilisateur : assignées à lui, ou
+        appartenant à un projet dont il est chef ou membre. Les membres du staff
+        voient toutes les tâches.
+        Sans `project_ids`, l'appartenance est vérifiée par des sous-requêtes
+        EXISTS (semi-jointures, pas de DISTINCT) ; sinon par un simple IN.
+        """
+        if user.is_staff:
+            return self
+        if project_ids is not None:
+            return self.filter(models.Q(assigned_to=user) | models.Q(project_id__in=project_ids))
+        memberships = Project.team_members.through.objects.filter(
+            project_id=models.OuterRef('project_id'), user_id=user.pk
+        )
+        managed = Project.objects.filter(pk=models.OuterRef('project_id'), manager=user)
+        return self.filter(
+            models.Q(assigned_to=user) | models.Exists(memberships) | models.Exists(managed)
+        )
+
+
+class Task(TrackedFieldsMixin, models.Model):
     """
     Modèle représentant une tâche dans un projet.
     Une tâche est associée à un projet, peut être assignée à un utilisateur,
@@ -80,6 +113,20 @@ class Task(models.Model):
         verbose_name="Priorité"
     )
 
+    # Rang numérique de la priorité, calculé et stocké par la base de données :
+    # il reste synchronisé lors des save(), update() et bulk_update(), et les
+    # lignes existantes sont calculées à l'ajout de la colonne
+    priority_rank = models.GeneratedField(
+        expression=models.Case(
+            *[models.When(priority=priority, then=models.Value(rank))
+              for priority, rank in PRIORITY_RANKS.items()],
+            default=models.Value(PRIORITY_RANKS['medium']),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+        verbose_name="Rang de priorité"
+    )
+
     # Champ pour la date de début de la tâche (optionnel)
     start_date = models.DateField(
         verbose_name="Date de début",
@@ -94,12 +141,24 @@ class Task(models.Model):
         blank=True
     )
 
+    # Premier jour de retard (lendemain de la date de fin), tenu à jour à
+    # l'écriture de la tâche et chaque nuit par la commande sweep_overdue_tasks ;
+    # vide si la tâche n'est pas en retard
+    overdue_since = models.DateField(
+        verbose_name="En retard depuis",
+        null=True,
+        blank=True,
+        editable=False
+    )
+
     # Champ pour la date de création de la tâche (automatique)
     created_at = models.DateTimeField(auto_now_add=True)
 
     # Champ pour la date de dernière mise à jour de la tâche (automatique)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
     @property
     def elapsed_time(self):
         """
@@ -120,11 +179,16 @@ class Task(models.Model):
     @property
     def is_overdue(self):
         """
-        Vérifie si la tâche est en retard (date de fin dépassée et statut non terminé).
+        Vérifie si la tâche est en retard (date de fin dépassée et statut non terminé),
+        d'après l'indicateur stocké overdue_since.
         """
-        if self.end_date and self.status != 'done':
-            return timezone.now().date() > self.end_date
-        return False
+        return self.overdue_since is not None
+
+    def update_overdue_since(self, today=None):
+        """
+        Recalcule overdue_since d'après la date de fin et le statut.
+        """
+        self.overdue_since = overdue_since_for(self.status, self.end_date, today or timezone.now().date())
 
     @property
     def progress_days(self):
@@ -142,7 +206,7 @@ class Task(models.Model):
         Retourne le nombre de jours de retard (si la tâche est en retard).
         """
         if self.is_overdue:
-            return (timezone.now().date() - self.end_date).days
+            return (timezone.now().date() - self.overdue_since).days + 1
         return 0
 
     @property
@@ -244,20 +308,89 @@ class Task(models.Model):
                 })
 
         if self.pk:  # Si la tâche existe déjà
-            old_task = Task.objects.get(pk=self.pk)
-            if old_task.status != self.status:  # Si le statut a changé
-                if self.status not in VALID_STATUS_TRANSITIONS.get(old_task.status, []):
+            # Statut tel que chargé depuis la base, sans nouvelle requête
+            old_status = self.get_loaded_value('status')
+            if old_status is None:
+                old_status = Task.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+            if old_status and old_status != self.status:  # Si le statut a changé
+                if self.status not in VALID_STATUS_TRANSITIONS.get(old_status, []):
                     raise ValidationError({
-                        'status': f"Impossible de passer directement de '{old_task.get_status_display()}' à '{self.get_status_display()}'"
+                        'status': f"Impossible de passer directement de '{dict(self.STATUS_CHOICES)[old_status]}' à '{self.get_status_display()}'"
                     })
 
+    def transition_to(self, new_status):
+        """
+        Applique une transition de statut par un UPDATE conditionnel unique,
+        sans verrou : la ligne n'est modifiée que si son statut en base est
+        encore celui chargé dans l'instance : tout changement de statut
+        concurrent fait échouer la transition.
+        Retourne True si la transition a été appliquée (l'instance reflète alors
+        la nouvelle ligne), False si la tâche a changé de statut entre-temps.
+        Lève ValueError si la transition n'est pas autorisée depuis ce statut.
+        """
+        old_status = self.get_loaded_value('status', self.status)
+        old_overdue = self.get_loaded_value('overdue_since', self.overdue_since) is not None
+        if new_status not in VALID_STATUS_TRANSITIONS.get(old_status, []):
+            raise ValueError(f"Transition '{old_status}' → '{new_status}' non autorisée")
+        now = timezone.now()
+        values = {
+            **status_update_values(new_status, now),
+            # Valeur calculée sur l'instance, comme dans save(), pour pouvoir l'y reporter
+            'overdue_since': overdue_since_for(new_status, self.end_date, now.date()),
+        }
+        updated = Task.objects.filter(pk=self.pk, status=old_status).update(**values)
+        if not updated:
+            return False
+        for name, value in values.items():
+            setattr(self, name, value)
+        self._remember_loaded_values(list(values))
+        task_status_changed.send(sender=Task, transitions=[{
+            'task_id': self.pk, 'project_id': self.project_id, 'title': self.title,
+            'old_status': old_status, 'new_status': new_status, 'end_date': self.end_date,
+            'old_overdue': old_overdue, 'new_overdue': self.overdue_since is not None,
+        }])
+        return True
+
+    def save(self, *args, **kwargs):
+        overdue_since = self.overdue_since
+        self.update_overdue_since()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.overdue_since != overdue_since:
+            kwargs['update_fields'] = {*update_fields, 'overdue_since'}
+        super().save(*args, **kwargs)
+
     class Meta:
         """
         Métadonnées pour le modèle Task.
         """
         verbose_name = "Tâche"
         verbose_name_plural = "Tâches"
-        ordering = ['-priority', 'end_date', '-created_at']
+        ordering = ['-priority_rank', 'end_date', '-created_at']
+        indexes = [
+            # Statistiques et tableaux kanban d'un projet
+            models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+            # Échéances d'un projet (retards, tri par date de fin)
+            models.Index(fields=['project', 'end_date'], name='task_project_end_date_idx'),
+            # Tâches ouvertes par échéance (détection des retards)
+            models.Index(
+                fields=['end_date'],
+                condition=~models.Q(status='done'),
+                name='task_open_end_date_idx'
+            ),
+            # Tâches en retard (?overdue=true, balayage nocturne)
+            models.Index(
+                fields=['overdue_since'],
+                condition=models.Q(overdue_since__isnull=False),
+                name='task_overdue_since_idx'
+            ),
+            # Chevauchement de dates du calendrier et filtres start_date/end_date
+            models.Index(fields=['start_date', 'end_date'], name='task_date_range_idx'),
+            # Tri par défaut (et pagination par curseur départagée par l'id)
+            models.Index(
+                fields=['-priority_rank', 'end_date', '-created_at', '-id'],
+                name='task_default_order_idx'
+            ),
+        ]
 
     def __str__(self):
         """
@@ -359,3 +492,34 @@ VALID_STATUS_TRANSITIONS = {
     'review': ['done', 'in_progress'],
     'done': ['review']
 }
+
+
+def overdue_since_for(status, end_date, today):
+    """Premier jour de retard d'une tâche (lendemain de l'échéance), None si elle n'est pas en retard"""
+    if end_date is None or end_date >= today or status == 'done':
+        return None
+    return end_date + timedelta(days=1)
+
+
+def first_overdue_day():
+    """Expression du premier jour de retard, pour les UPDATE en masse"""
+    return models.ExpressionWrapper(
+        models.F('end_date') + timedelta(days=1), output_field=models.DateField()
+    )
+
+
+def status_update_values(new_status, now):
+    """
+    Colonnes écrites par un changement de statut en UPDATE : une tâche
+    terminée n'est plus en retard ; une tâche rouverte (ou dont le statut
+    change) est signalée si son échéance est dépassée.
+    """
+    values = {'status': new_status, 'updated_at': now}
+    if new_status == 'done':
+        values['overdue_since'] = None
+    else:
+        values['overdue_since'] = models.Case(
+            models.When(end_date__lt=now.date(), then=first_overdue_day()),
+            default=None, output_field=models.DateField(),
+        )
+    return values
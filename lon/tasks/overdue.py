@@ -0,0 +1,72 @@
+"""
+Balayage des tâches en retard.
+
+Task.overdue_since est tenu à jour à chaque écriture de la tâche ; le
+passage du temps, lui, est pris en compte chaque nuit par sweep_overdue_tasks
+(commande du même nom, lancée par cron) : les tâches dont l'échéance vient
+d'être dépassée sont signalées par un seul UPDATE, leurs responsables sont
+notifiés en un seul bulk_create et les statistiques des projets concernés
+sont recalculées. Les lectures (listes, admin, statistiques) n'ont ainsi
+plus à comparer chaque tâche à la date du jour.
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.utils import notify_each
+from projects.stats import refresh_project_stats
+from .models import Task, first_overdue_day
+
+# Tâches lues par lot pour composer les notifications (écrites par lots de
+# accounts.utils.NOTIFICATION_BATCH_SIZE)
+NOTIFY_CHUNK_SIZE = 2000
+
+OVERDUE_MESSAGE = "La tâche « {title} » est en retard (échéance du {end_date:%d/%m/%Y})."
+
+
+def newly_overdue(today):
+    """Tâches ouvertes dont l'échéance est dépassée et qui ne sont pas encore signalées"""
+    return Task.objects.filter(
+        overdue_since__isnull=True, end_date__lt=today
+    ).exclude(status='done')
+
+
+def no_longer_overdue(today):
+    """Tâches signalées qui ne sont plus en retard (écritures hors save())"""
+    return Task.objects.filter(overdue_since__isnull=False).filter(
+        Q(status='done') | Q(end_date__isnull=True) | Q(end_date__gte=today)
+    )
+
+
+def sweep_overdue_tasks(today=None, notify=True):
+    """
+    Signale les tâches devenues en retard et retire l'indicateur de celles
+    qui ne le sont plus. Le responsable de chaque tâche nouvellement en
+    retard (à défaut le chef de projet) reçoit une notification par tâche
+    si `notify` est vrai.
+    Retourne {'flagged': ..., 'cleared': ..., 'notified': ...}.
+    """
+    today = today or timezone.now().date()
+    project_ids = set()
+    with transaction.atomic():
+        cleared = no_longer_overdue(today)
+        project_ids.update(cleared.values_list('project_id', flat=True).distinct())
+        cleared_count = cleared.update(overdue_since=None)
+
+        flagged = newly_overdue(today)
+        project_ids.update(flagged.order_by().values_list('project_id', flat=True).distinct())
+        notified = 0
+        if notify:
+            # Lues avant l'UPDATE, qui les rend indiscernables des tâches déjà
+            # signalées ; seules les colonnes du message sont chargées
+            rows = flagged.order_by().values_list(
+                'title', 'end_date', 'assigned_to_id', 'project__manager_id'
+            ).iterator(chunk_size=NOTIFY_CHUNK_SIZE)
+            notified = notify_each(
+                (assigned_to_id or manager_id, OVERDUE_MESSAGE.format(title=title, end_date=end_date))
+                for title, end_date, assigned_to_id, manager_id in rows
+                if assigned_to_id or manager_id
+            )
+        flagged_count = flagged.update(overdue_since=first_overdue_day())
+    refresh_project_stats(project_ids)
+    return {'flagged': flagged_count, 'cleared': cleared_count, 'notified': notified}
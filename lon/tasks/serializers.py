@@ -18,13 +18,57 @@ class TaskDocumentSerializer(serializers.ModelSerializer):
 from rest_framework import serializers
 from .models import Task
 from accounts.serializers import UserSerializer
-from projects.serializers import ProjectSerializer
+from projects.models import Project
+from projects.serializers import (
+    ProjectSerializer, ProjectSummarySerializer, UserSerializer as ProjectUserSerializer
+)
+
+
+def requested_expansions(request):
+    """Retourne l'ensemble des relations demandées via ?expand=project,..."""
+    if request is None:
+        return set()
+    expand = request.query_params.get('expand', '')
+    return {name.strip() for name in expand.split(',') if name.strip()}
+
+
+def is_sideload_requested(request):
+    """Indique si le client demande les objets liés dans une map `included`"""
+    if request is None:
+        return False
+    return request.query_params.get('sideload', '').lower() in ('1', 'true', 'yes')
+
+
+def serialize_included(tasks):
+    """
+    Sérialise une seule fois chaque projet et utilisateur référencé par les tâches,
+    indexés par identifiant.
+    """
+    project_ids = {task.project_id for task in tasks}
+    user_ids = {
+        user_id
+        for task in tasks
+        for user_id in (task.created_by_id, task.assigned_to_id)
+        if user_id
+    }
+    projects = Project.objects.filter(pk__in=project_ids).with_relations().with_stats()
+    users = User.objects.filter(pk__in=user_ids)
+    return {
+        'projects': {project.pk: ProjectSerializer(project).data for project in projects},
+        'users': {user.pk: ProjectUserSerializer(user).data for user in users},
+    }
+
 
 class TaskSerializer(serializers.ModelSerializer):
+    """
+    Par défaut le projet est représenté par un résumé (id, nom, statut).
+    ?expand=project renvoie le projet complet ; ?sideload=true remplace les
+    relations par leurs identifiants, les objets étant fournis par serialize_included.
+    """
     created_by = UserSerializer(read_only=True)
     assigned_to = UserSerializer(read_only=True)
-    project = ProjectSerializer(read_only=True)
-    project_id = serializers.IntegerField(write_only=True)
+    project = ProjectSummarySerializer(read_only=True)
+    project_id = serializers.IntegerField()
     assigned_to_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     priority_display = serializers.CharField(source='get_priority_display', read_only=True)
@@ -39,11 +83,21 @@ class TaskSerializer(serializers.ModelSerializer):
             'assigned_to', 'assigned_to_id',
             'status', 'status_display',
             'priority', 'priority_display',
-            'start_date', 'end_date',
+            'start_date', 'end_date', 'overdue_since',
             'created_at', 'updated_at',
             'assigned_to_name'
         ]
-        read_only_fields = ['created_by', 'created_at', 'updated_at']
+        read_only_fields = ['created_by', 'overdue_since', 'created_at', 'updated_at']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if is_sideload_requested(request):
+            for name in ('project', 'created_by', 'assigned_to'):
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        elif 'project' in requested_expansions(request):
+            fields['project'] = ProjectSerializer(read_only=True)
+        return fields
 
     def create(self, validated_data):
         project_id = validated_data.pop('project_id')
@@ -70,4 +124,16 @@ class TaskSerializer(serializers.ModelSerializer):
             if obj.assigned_to.first_name and obj.assigned_to.last_name:
                 return f"{obj.assigned_to.first_name} {obj.assigned_to.last_name}"
             return obj.assigned_to.username
-        return None
\ No newline at end of file
+        return None
+
+
+class BulkStatusItemSerializer(serializers.Serializer):
+    """Élément d'un changement de statut en masse"""
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES)
+
+
+class BulkReassignItemSerializer(serializers.Serializer):
+    """Élément d'une réassignation en masse"""
+    id = serializers.IntegerField()
+    assigned_to_id = serializers.IntegerField(allow_null=True)
@@ -0,0 +1,16 @@
+"""
+Signaux des écritures de tâches qui ne passent pas par save() et
+n'émettent donc pas post_save.
+"""
+from django.dispatch import Signal
+
+# Transitions appliquées par UPDATE conditionnel (Task.transition_to, une
+# transition ; bulk_change_status, toutes celles de la requête en un envoi).
+# Argument : transitions, liste de dicts task_id, project_id, title,
+# old_status, new_status, end_date, old_overdue, new_overdue (tâche signalée
+# en retard avant et après)
+task_status_changed = Signal()
+
+# Tâches écrites par bulk_create ou bulk_update.
+# Arguments : tasks, created, changes (par tâche : {champ: [ancienne, nouvelle valeur]})
+tasks_bulk_saved = Signal()
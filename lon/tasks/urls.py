@@ -5,8 +5,11 @@ from . import views
 router = DefaultRouter()
 router.register(r'', views.TaskViewSet, basename='task')
 
+# Les routes fixes doivent précéder le routeur, dont la route de détail
+# accepterait « calendar » ou « debug » comme identifiant de tâche
 urlpatterns = [
-    path('', include(router.urls)),
     path('calendar/', views.get_calendar_tasks, name='calendar-tasks'),
+    path('calendar/feed/', views.calendar_feed, name='calendar-feed'),
     path('debug/', views.debug_tasks, name='debug-tasks'),
+    path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,22 +1,55 @@
 import logging
-from django.db import models
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from .models import Task
-from .serializers import TaskSerializer
-from django.db.models import Q
-from datetime import datetime, timedelta
+from .models import Task, VALID_STATUS_TRANSITIONS
+from .serializers import (
+    TaskSerializer, requested_expansions, is_sideload_requested, serialize_included
+)
+from projects.models import Project
+from projects.access import request_project_ids
+from api.async_views import AsyncListMixin, async_read_view
+from api.pagination import TaskKeysetPagination
+from . import bulk, calendar
+from django.db.models import Prefetch
+from django.utils.http import parse_etags
 
 logger = logging.getLogger(__name__)
 
-class TaskViewSet(viewsets.ModelViewSet):
+
+def visible_tasks(request):
+    """
+    Tâches visibles par l'utilisateur de la requête ; les projets accessibles
+    sont calculés une seule fois par requête.
+    """
+    user = request.user
+    if user.is_staff:
+        return Task.objects.all()
+    return Task.objects.visible_to(user, request_project_ids(request))
+
+
+def filter_overdue(queryset, request):
+    """
+    ?overdue=true : tâches en retard, lues sur l'index partiel de
+    overdue_since ; ?overdue=false : tâches qui ne le sont pas.
+    """
+    overdue = request.query_params.get('overdue', '').lower()
+    if overdue in ('1', 'true', 'yes'):
+        return queryset.filter(overdue_since__isnull=False)
+    if overdue in ('0', 'false', 'no'):
+        return queryset.filter(overdue_since__isnull=True)
+    return queryset
+
+
+class TaskViewSet(AsyncListMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskKeysetPagination
 
     def get_queryset(self):
-        queryset = Task.objects.all()
+        queryset = self.plan_queryset(visible_tasks(self.request))
         
         # Filtrage par projet
         project_id = self.request.query_params.get('project', None)
@@ -31,41 +64,121 @@ class TaskViewSet(viewsets.ModelViewSet):
         end_date_before = self.request.query_params.get('end_date_before', None)
         if end_date_before:
             queryset = queryset.filter(end_date__lte=end_date_before)
-        
-        # Ajouter cette ligne pour déboguer
-        print(f"Requête SQL: {queryset.query}")
-        
-        return queryset
+
+        return filter_overdue(queryset, self.request)
+
+    def plan_queryset(self, queryset):
+        """
+        Charge les relations nécessaires à la représentation demandée :
+        le projet complet n'est préchargé qu'avec ?expand=project.
+        """
+        queryset = queryset.select_related('created_by', 'assigned_to')
+        if 'project' in requested_expansions(self.request):
+            return queryset.prefetch_related(
+                Prefetch('project', queryset=Project.objects.with_relations().with_stats())
+            )
+        return queryset.select_related('project')
+
+    def task_list_response(self, queryset):
+        """
+        Sérialise une page de tâches ; avec ?sideload=true les projets et
+        utilisateurs référencés sont renvoyés une seule fois dans `included`.
+        """
+        return self.task_page_response(self.paginate_queryset(queryset))
+
+    def task_page_response(self, tasks):
+        serializer = self.get_serializer(tasks, many=True)
+        response = self.get_paginated_response(serializer.data)
+        if is_sideload_requested(self.request):
+            response.data['included'] = serialize_included(tasks)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.task_list_response(self.filter_queryset(self.get_queryset()))
+
+    async def alist(self, request, *args, **kwargs):
+        """Variante asynchrone de list() (mode ASGI)"""
+        # Les projets accessibles viennent du cache ou de la base
+        queryset = await sync_to_async(lambda: self.filter_queryset(self.get_queryset()))()
+        tasks = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        return await sync_to_async(self.task_page_response)(tasks)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
     @action(detail=True, methods=['post'])
     def change_status(self, request, pk=None):
+        """
+        Change le statut d'une tâche par un UPDATE conditionnel : si la tâche
+        a changé de statut entre-temps (glisser-déposer concurrent sur le
+        kanban), la transition est refusée avec un 409.
+        """
         task = self.get_object()
         new_status = request.data.get('status')
         
         if new_status not in dict(Task.STATUS_CHOICES):
             return Response({'error': 'Invalid status'}, status=400)
-            
-        task.status = new_status
-        task.save()
+
+        if new_status == task.status:
+            return Response(TaskSerializer(task).data)
+
+        if new_status not in VALID_STATUS_TRANSITIONS.get(task.status, []):
+            return Response({
+                'error': f"Impossible de passer directement de '{task.get_status_display()}' à '{dict(Task.STATUS_CHOICES)[new_status]}'"
+            }, status=400)
+
+        if not task.transition_to(new_status):
+            current_status = Task.objects.filter(pk=task.pk).values_list('status', flat=True).first()
+            return Response({
+                'error': "La tâche a été modifiée entre-temps, veuillez recharger.",
+                'current_status': current_status
+            }, status=409)
+
         return Response(TaskSerializer(task).data)
 
+    def bulk_response(self, operation, *args):
+        """
+        Exécute une opération en masse sur le tableau JSON reçu et renvoie
+        le résultat de chaque élément (201/200 si tout est appliqué, 400 sinon).
+        """
+        items = self.request.data
+        if not isinstance(items, list):
+            return Response({'error': 'Un tableau JSON est attendu.'}, status=400)
+        if len(items) > bulk.MAX_BULK_ITEMS:
+            return Response(
+                {'error': f'Au plus {bulk.MAX_BULK_ITEMS} éléments par requête.'}, status=400
+            )
+        try:
+            results, applied = operation(items, *args)
+        except bulk.BulkConflict:
+            return Response({
+                'error': "Des tâches ont été modifiées entre-temps, aucune modification n'a été appliquée."
+            }, status=409)
+        success_status = 201 if operation is bulk.bulk_create_tasks else 200
+        return Response({'results': results}, status=success_status if applied else 400)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Crée plusieurs tâches en une transaction"""
+        project_ids = None if request.user.is_staff else request_project_ids(request)
+        return self.bulk_response(bulk.bulk_create_tasks, request.user, project_ids)
+
+    @action(detail=False, methods=['post'], url_path='bulk/status')
+    def bulk_status(self, request):
+        """Change le statut de plusieurs tâches : [{"id": 1, "status": "review"}, ...]"""
+        return self.bulk_response(bulk.bulk_change_status, visible_tasks(request))
+
+    @action(detail=False, methods=['post'], url_path='bulk/reassign')
+    def bulk_reassign(self, request):
+        """Réassigne plusieurs tâches : [{"id": 1, "assigned_to_id": 2}, ...]"""
+        return self.bulk_response(bulk.bulk_reassign, visible_tasks(request))
+
     @action(detail=False, methods=['GET'], url_path='project/(?P<project_id>[^/.]+)')
     def by_project(self, request, project_id=None):
         """Endpoint pour récupérer les tâches d'un projet spécifique"""
-        user = request.user
-        tasks = Task.objects.filter(
-            project_id=project_id
-        ).filter(
-            models.Q(assigned_to=user) |
-            models.Q(project__team_members=user) |
-            models.Q(project__manager=user)
-        ).distinct()
-        
-        serializer = self.get_serializer(tasks, many=True)
-        return Response(serializer.data)
+        tasks = filter_overdue(visible_tasks(request).filter(project_id=project_id), request)
+
+        return self.task_list_response(self.plan_queryset(tasks))
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -73,50 +186,118 @@ def get_calendar_tasks(request):
     """Récupère les tâches pour l'affichage dans le calendrier"""
     
     # Récupérer les paramètres de requête
-    start_date = request.query_params.get('start_date')
-    end_date = request.query_params.get('end_date')
     project_id = request.query_params.get('project_id')
     
     # Valider les dates
     try:
-        if start_date:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-        else:
-            # Par défaut, début du mois courant
-            today = datetime.now().date()
-            start_date = today.replace(day=1)
-            
-        if end_date:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-        else:
-            # Par défaut, fin du mois suivant
-            next_month = start_date.replace(day=28) + timedelta(days=4)
-            end_date = next_month.replace(day=1) - timedelta(days=1)
+        start_date, end_date = calendar.parse_window(request.query_params)
     except ValueError:
         return Response({"error": "Format de date invalide. Utilisez YYYY-MM-DD."}, status=400)
     
     # Construire la requête
-    query = Q(start_date__lte=end_date) & (
-        Q(end_date__gte=start_date) | Q(end_date__isnull=True)
-    )
+    tasks = calendar.overlapping(visible_tasks(request), start_date, end_date)
     
     # Filtrer par projet si spécifié
     if project_id:
-        query &= Q(project_id=project_id)
+        tasks = tasks.filter(project_id=project_id)
     
     # Récupérer les tâches
-    tasks = Task.objects.filter(query).select_related('project', 'assigned_to')
+    tasks = tasks.select_related('project', 'assigned_to', 'created_by')
     
     # Sérialiser les résultats
     serializer = TaskSerializer(tasks, many=True)
     
     return Response(serializer.data)
 
+
+async def aget_calendar_tasks(request):
+    """Variante asynchrone de get_calendar_tasks (mode ASGI)"""
+    project_id = request.query_params.get('project_id')
+    try:
+        start_date, end_date = calendar.parse_window(request.query_params)
+    except ValueError:
+        return Response({"error": "Format de date invalide. Utilisez YYYY-MM-DD."}, status=400)
+
+    tasks = calendar.overlapping(await sync_to_async(visible_tasks)(request), start_date, end_date)
+    if project_id:
+        tasks = tasks.filter(project_id=project_id)
+    tasks = [task async for task in tasks.select_related('project', 'assigned_to', 'created_by')]
+    return Response(TaskSerializer(tasks, many=True).data)
+
+
+get_calendar_tasks = async_read_view(get_calendar_tasks, aget_calendar_tasks)
+
+
+def feed_window(request):
+    """Lit et valide la fenêtre du flux ; retourne (début, fin, réponse d'erreur ou None)"""
+    try:
+        start_date, end_date = calendar.parse_window(request.query_params)
+    except ValueError:
+        return None, None, Response({"error": "Format de date invalide. Utilisez YYYY-MM-DD."}, status=400)
+    if start_date > end_date or (end_date - start_date).days > calendar.MAX_WINDOW_DAYS:
+        return None, None, Response(
+            {"error": f"La fenêtre doit être comprise entre 1 et {calendar.MAX_WINDOW_DAYS} jours."},
+            status=400
+        )
+    return start_date, end_date, None
+
+
+def is_not_modified(request, etag):
+    if_none_match = request.headers.get('If-None-Match')
+    return bool(if_none_match) and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def calendar_feed(request):
+    """
+    Flux compact du calendrier : projection des tâches de la fenêtre et index
+    par jour. Supporte If-None-Match : une fenêtre inchangée renvoie un 304.
+    """
+    project_id = request.query_params.get('project_id')
+    start_date, end_date, error = feed_window(request)
+    if error:
+        return error
+
+    tasks = calendar.overlapping(visible_tasks(request), start_date, end_date)
+    if project_id:
+        tasks = tasks.filter(project_id=project_id)
+
+    etag = calendar.compute_etag(tasks, request.user.pk, start_date, end_date, project_id)
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if is_not_modified(request, etag):
+        return Response(status=304, headers=headers)
+
+    return Response(calendar.build_feed(tasks, start_date, end_date), headers=headers)
+
+
+async def acalendar_feed(request):
+    """Variante asynchrone de calendar_feed (mode ASGI)"""
+    project_id = request.query_params.get('project_id')
+    start_date, end_date, error = feed_window(request)
+    if error:
+        return error
+
+    tasks = calendar.overlapping(await sync_to_async(visible_tasks)(request), start_date, end_date)
+    if project_id:
+        tasks = tasks.filter(project_id=project_id)
+
+    etag = await calendar.acompute_etag(tasks, request.user.pk, start_date, end_date, project_id)
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if is_not_modified(request, etag):
+        return Response(status=304, headers=headers)
+
+    return Response(await calendar.abuild_feed(tasks, start_date, end_date), headers=headers)
+
+
+calendar_feed = async_read_view(calendar_feed, acalendar_feed)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def debug_tasks(request):
     """Endpoint de débogage pour voir toutes les tâches avec leurs dates"""
-    tasks = Task.objects.all()
+    tasks = visible_tasks(request)
     data = [{
         'id': task.id,
         'title': task.title,
@@ -0,0 +1,131 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from activity.middleware import ActivityMiddleware
+from activity.models import ActivityEvent
+from activity.recorder import ActivityBuffer
+from projects.models import Project
+from tasks.models import Task, TaskDocument
+
+User = get_user_model()
+
+
+class ActivityFeedTest(TestCase):
+    """
+    Tests de l'alimentation et du flux du journal d'activité.
+    """
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='chef')
+        self.outsider = User.objects.create_user(username='externe')
+        self.project = Project.objects.create(name='Chantier A', manager=self.manager)
+        self.task = Task.objects.create(title='Coffrage', project=self.project)
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def test_change_status_records_event_with_actor(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/tasks/{self.task.pk}/change_status/', {'status': 'in_progress'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        event = ActivityEvent.objects.get()
+        self.assertEqual(event.verb, 'status_changed')
+        self.assertEqual(event.actor, self.manager)
+        self.assertEqual(event.project, self.project)
+        self.assertEqual(event.changes, {'status': ['todo', 'in_progress']})
+
+    def test_save_records_changed_fields(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.title = 'Coffrage niveau 1'
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+            Task.objects.get(pk=self.task.pk).save()  # Sans modification : pas d'événement
+        event = ActivityEvent.objects.get()
+        self.assertEqual(event.verb, 'updated')
+        self.assertEqual(event.changes, {'title': ['Coffrage', 'Coffrage niveau 1']})
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Task.objects.create(title='Annulée', project=self.project)
+                raise RuntimeError()
+        self.assertFalse(ActivityEvent.objects.exists())
+
+    def test_feed_is_scoped_and_paginated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title='Étaiement', project=self.project)
+            Task.objects.create(title='Ferraillage', project=self.project)
+            other = Project.objects.create(name='Chantier B', manager=self.outsider)
+
+        response = self.client.get('/api/activity/', {'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['summary'], 'Tâche « Ferraillage » créée')
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get('/api/activity/', {'project': other.pk})
+        self.assertEqual(response.data['results'], [])
+
+        response = self.client.get('/api/activity/', {'project': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/activity/', {'target_type': 'task', 'target_id': '1x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_journal_write_errors_are_not_swallowed(self):
+        url = f'/api/tasks/{self.task.pk}/change_status/'
+        with mock.patch.object(ActivityBuffer, 'write', side_effect=DatabaseError()):
+            with self.assertRaises(DatabaseError), self.captureOnCommitCallbacks(execute=True):
+                self.client.post(url, {'status': 'in_progress'}, format='json')
+
+    def test_document_event_reads_the_loaded_task(self):
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks() as callbacks:
+            TaskDocument.objects.create(task=self.task, title='Plan', file='task_documents/plan.pdf')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(ActivityEvent.objects.get(target_type='document').project, self.project)
+
+    def test_async_middleware_records_write_requests(self):
+        def create_task(request):
+            Task.objects.create(title='Ferraillage', project=self.project)
+            return HttpResponse(status=201)
+
+        middleware = ActivityMiddleware(sync_to_async(create_task))
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().post('/api/tasks/')
+        request.user = self.manager
+        with self.captureOnCommitCallbacks(execute=True):
+            response = async_to_sync(middleware)(request)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ActivityEvent.objects.get(target_type='task').actor, self.manager)
+
+
+class ActivityBatchingTest(TransactionTestCase):
+    """
+    Les événements d'une requête sont écrits en un seul INSERT.
+    """
+
+    def test_bulk_create_writes_events_in_one_insert(self):
+        manager = User.objects.create_user(username='chef')
+        project = Project.objects.create(name='Chantier A', manager=manager)
+        client = APIClient()
+        client.force_authenticate(manager)
+        items = [{'title': f'Tâche {i}', 'project_id': project.pk} for i in range(3)]
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/tasks/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "activity_activityevent"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            ActivityEvent.objects.filter(verb='created', target_type='task', actor=manager).count(), 3
+        )
@@ -0,0 +1,89 @@
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.test.client import AsyncRequestFactory
+from rest_framework.test import APIClient, force_authenticate
+
+from api.async_views import async_read_view
+from api.views import ahealth_check, health_check
+from projects.models import Project
+from projects.views import ProjectViewSet
+from tasks import views as task_views
+from tasks.models import Task
+
+User = get_user_model()
+
+
+@override_settings(ASYNC_VIEWS=True)
+class AsyncReadViewsTest(TestCase):
+    """
+    Les chemins de lecture asynchrones (mode ASGI) renvoient les mêmes
+    réponses que les vues synchrones.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='chef', password='secret')
+        self.other = User.objects.create_user(username='autre', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=self.user)
+        Project.objects.create(name='Chantier B', manager=self.other)
+        for index in range(3):
+            Task.objects.create(
+                title=f'Tâche {index}', project=self.project, assigned_to=self.user,
+                start_date=date(2025, 2, 1 + index), end_date=date(2025, 2, 10)
+            )
+        self.factory = AsyncRequestFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    async def call(self, view, path, data=None, **extra):
+        request = self.factory.get(path, data, **extra)
+        force_authenticate(request, user=self.user)
+        response = await view(request)
+        response.render()
+        return response
+
+    async def sync_get(self, path, data=None):
+        return await sync_to_async(self.client.get)(path, data)
+
+    async def test_task_list_matches_sync_view(self):
+        view = task_views.TaskViewSet.as_view({'get': 'list', 'post': 'create'})
+        response = await self.call(view, '/api/tasks/', {'page_size': 2, 'sideload': 'true'})
+        expected = await self.sync_get('/api/tasks/', {'page_size': 2, 'sideload': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], expected.data['results'])
+        self.assertEqual(response.data['included'], expected.data['included'])
+        self.assertIsNotNone(response.data['next'])
+
+    async def test_project_list_is_filtered_like_sync_view(self):
+        view = ProjectViewSet.as_view({'get': 'list'})
+        response = await self.call(view, '/api/projects/')
+        expected = await self.sync_get('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected.data)
+
+    async def test_calendar_feed_and_etag(self):
+        view = async_read_view(task_views.calendar_feed, task_views.acalendar_feed)
+        params = {'start_date': '2025-02-01', 'end_date': '2025-02-28'}
+        response = await self.call(view, '/api/tasks/calendar/feed/', params)
+        expected = await self.sync_get('/api/tasks/calendar/feed/', params)
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(response['ETag'], expected['ETag'])
+
+        response = await self.call(
+            view, '/api/tasks/calendar/feed/', params, headers={'If-None-Match': expected['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_unauthenticated_request_is_rejected(self):
+        view = async_read_view(task_views.get_calendar_tasks, task_views.aget_calendar_tasks)
+        response = await view(self.factory.get('/api/tasks/calendar/'))
+        response.render()
+        self.assertEqual(response.status_code, 401)
+
+    async def test_health_check(self):
+        view = async_read_view(health_check, ahealth_check)
+        response = await view(self.factory.get('/api/health-check/'))
+        response.render()
+        self.assertEqual(response.data, {'status': 'ok', 'database': 'connected'})
@@ -0,0 +1,88 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class CalendarFeedTest(TestCase):
+    """
+    Tests du flux compact /api/tasks/calendar/feed/.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='chef', password='secret', first_name='Jean', last_name='Dupont'
+        )
+        self.project = Project.objects.create(name='Chantier A', manager=self.user)
+        self.task = Task.objects.create(
+            title='Fondations', project=self.project, assigned_to=self.user,
+            start_date=date(2025, 1, 30), end_date=date(2025, 2, 2)
+        )
+        Task.objects.create(
+            title='Toiture', project=self.project,
+            start_date=date(2025, 3, 1), end_date=date(2025, 3, 5)
+        )
+        Task.objects.create(title='Ouverte', project=self.project, start_date=date(2025, 1, 1))
+        self.url = '/api/tasks/calendar/feed/'
+        self.params = {'start_date': '2025-02-01', 'end_date': '2025-02-28'}
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_compact_projection(self):
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = {task['title'] for task in response.data['tasks']}
+        self.assertEqual(titles, {'Fondations', 'Ouverte'})
+        task = next(task for task in response.data['tasks'] if task['id'] == self.task.pk)
+        self.assertEqual(task['project_name'], 'Chantier A')
+        self.assertEqual(task['assigned_to_id'], self.user.pk)
+        self.assertEqual(task['assigned_to_name'], 'Jean Dupont')
+        self.assertEqual(response.data['days']['2025-02-02'].count(self.task.pk), 1)
+        self.assertNotIn(self.task.pk, response.data['days']['2025-02-03'])
+        self.assertEqual(len(response.data['days']), 28)
+
+    def test_unchanged_window_returns_304(self):
+        response = self.client.get(self.url, self.params)
+        etag = response['ETag']
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.task.title = 'Fondations (modifiée)'
+        self.task.save()
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_renamed_project_changes_etag(self):
+        etag = self.client.get(self.url, self.params)['ETag']
+        self.project.name = 'Chantier A bis'
+        self.project.save()
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        task = next(task for task in response.data['tasks'] if task['id'] == self.task.pk)
+        self.assertEqual(task['project_name'], 'Chantier A bis')
+
+    def test_renamed_assignee_changes_etag(self):
+        etag = self.client.get(self.url, self.params)['ETag']
+        self.user.last_name = 'Martin'
+        self.user.save()
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        task = next(task for task in response.data['tasks'] if task['id'] == self.task.pk)
+        self.assertEqual(task['assigned_to_name'], 'Jean Martin')
+
+    def test_invalid_window(self):
+        response = self.client.get(self.url, {'start_date': '2025-02-01', 'end_date': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_legacy_calendar_route_is_reachable(self):
+        response = self.client.get('/api/tasks/calendar/', self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
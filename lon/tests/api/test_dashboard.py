@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients.models import Client
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class DashboardSummaryTest(TestCase):
+    """
+    Tests du résumé du tableau de bord.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user(username='chef')
+        self.staff = User.objects.create_user(username='admin', is_staff=True)
+        outsider = User.objects.create_user(username='externe')
+        # Les événements d'activité sont écrits au commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_data(outsider)
+        self.client = APIClient()
+
+    def create_data(self, outsider):
+        client = Client.objects.create(name='Client A', email='a@example.com', phone='0', address='-')
+        other_client = Client.objects.create(name='Client B', email='b@example.com', phone='0', address='-')
+        project = Project.objects.create(name='Chantier A', manager=self.manager, client=client)
+        Project.objects.create(name='Chantier B', manager=self.manager, client=client, status='SIGNED')
+        Project.objects.create(name='Chantier C', manager=outsider, client=other_client)
+        yesterday = timezone.now().date() - timedelta(days=1)
+        Task.objects.create(title='En retard', project=project, end_date=yesterday, created_by=self.manager)
+        Task.objects.create(title='Terminée', project=project, status='done', end_date=yesterday)
+
+    def get_summary(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_summary_scoped_to_user_projects(self):
+        summary = self.get_summary(self.manager)
+        self.assertEqual(summary['projects']['total'], 2)
+        self.assertEqual(summary['projects']['clients'], 1)
+        self.assertEqual(summary['projects']['by_status']['SIGNED'], 1)
+        self.assertEqual(summary['tasks']['total'], 2)
+        self.assertEqual(summary['tasks']['overdue'], 1)
+        self.assertEqual(summary['tasks']['by_status']['done'], 1)
+        self.assertEqual([p['name'] for p in summary['recent_projects']], ['Chantier B', 'Chantier A'])
+        self.assertEqual(summary['recent_projects'][0]['client_name'], 'Client A')
+        activities = summary['recent_activities']
+        self.assertEqual(len(activities), 4)
+        self.assertEqual(activities[0]['type'], 'TASK_CREATED')
+        self.assertEqual(activities[0]['description'], 'Tâche « Terminée » créée')
+        self.assertEqual({activity['type'] for activity in activities}, {'PROJECT_CREATED', 'TASK_CREATED'})
+
+    def test_staff_sees_everything(self):
+        summary = self.get_summary(self.staff)
+        self.assertEqual(summary['projects']['total'], 3)
+        self.assertEqual(summary['projects']['clients'], 2)
+
+    def test_summary_is_cached_per_user(self):
+        self.get_summary(self.manager)
+        with self.assertNumQueries(0):
+            self.client.get('/api/dashboard/summary/')
+        self.assertEqual(self.get_summary(self.staff)['projects']['total'], 3)
@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Notification
+from accounts.utils import increment_unread, notify_users
+
+User = get_user_model()
+
+
+class UnreadNotificationCountTest(TestCase):
+    """
+    Tests du compteur de notifications non lues.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='chef')
+        self.other = User.objects.create_user(username='membre')
+        Notification.objects.create(user=self.user, message='Ancienne', is_read=True)
+        Notification.objects.create(user=self.user, message='Nouvelle')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_count(self):
+        response = self.client.get('/api/notifications/unread_count/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['unread_count']
+
+    def test_count_is_cached_and_incremented(self):
+        self.assertEqual(self.get_count(), 1)
+        with self.assertNumQueries(0):
+            self.client.get('/api/notifications/unread_count/')
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_users([self.user, self.other], 'Planning modifié')
+            Notification.objects.create(user=self.user, message='Réunion')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_count(), 3)
+
+    def test_mark_all_read_resets_counter(self):
+        Notification.objects.create(user=self.other, message='Autre')
+        self.assertEqual(self.get_count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(self.get_count(), 0)
+        self.assertFalse(Notification.objects.get(user=self.other).is_read)
+
+    def test_notification_during_recount_is_not_lost(self):
+        add = cache.add
+
+        def add_after_concurrent_notification(*args, **kwargs):
+            # Notification validée par une autre requête entre le comptage et la mise en cache
+            patcher.stop()
+            Notification.objects.bulk_create([Notification(user=self.user, message='Réunion')])
+            increment_unread([self.user.pk])
+            return add(*args, **kwargs)
+
+        patcher = mock.patch.object(cache, 'add', side_effect=add_after_concurrent_notification)
+        patcher.start()
+        self.assertEqual(self.get_count(), 1)
+        self.assertEqual(self.get_count(), 2)
+
+    def test_mark_all_read_keeps_concurrent_notifications(self):
+        self.assertEqual(self.get_count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/notifications/mark_all_read/')
+            # Notification d'une autre transaction, incrémentée avant ce commit
+            Notification.objects.bulk_create([Notification(user=self.user, message='Réunion')])
+            increment_unread([self.user.pk])
+        self.assertEqual(self.get_count(), 1)
+
+    def test_reading_one_notification_recounts(self):
+        self.assertEqual(self.get_count(), 1)
+        notification = Notification.objects.get(message='Nouvelle')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/notifications/{notification.pk}/', {'is_read': True}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_count(), 0)
+
+    def test_list_is_paginated_newest_first(self):
+        response = self.client.get('/api/notifications/', {'is_read': 'false'})
+        self.assertEqual([n['message'] for n in response.data['results']], ['Nouvelle'])
+        self.assertIsNone(response.data['next'])
@@ -0,0 +1,60 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskKeysetPaginationTest(TestCase):
+    """
+    Tests de la pagination par curseur de /api/tasks/.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='chef', password='secret')
+        project = Project.objects.create(name='Chantier A', manager=self.user)
+        # Beaucoup d'égalités sur le tri (priorité, date de fin NULL) pour
+        # vérifier que le départage par l'id ne perd ni ne duplique de ligne
+        for index in range(7):
+            Task.objects.create(
+                title=f'Tâche {index}', project=project,
+                priority='high' if index % 2 else 'low',
+                end_date=date(2025, 1, 10) if index % 3 == 0 else None
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_walk_all_pages(self):
+        seen = []
+        url = '/api/tasks/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+
+        expected = list(
+            Task.objects.order_by('-priority_rank', 'end_date', '-created_at', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(sorted(seen), sorted(expected))
+        rank_by_id = dict(Task.objects.values_list('id', 'priority_rank'))
+        ranks = [rank_by_id[pk] for pk in seen]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get('/api/tasks/', {'cursor': 'pas-un-curseur'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_size_is_configurable(self):
+        response = self.client.get('/api/tasks/', {'page_size': 5})
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNotNone(response.data['next'])
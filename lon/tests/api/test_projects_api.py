@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients.models import Client
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class ProjectListQueryCountTest(TestCase):
+    """
+    Vérifie que la liste des projets s'exécute en un nombre constant de requêtes.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='chef', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_projects(self, count):
+        # Les statistiques des projets sont recalculées au commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_projects_in_transaction(count)
+
+    def create_projects_in_transaction(self, count):
+        for index in range(count):
+            client = Client.objects.create(
+                name=f'Client {index}', email=f'client{index}@example.com',
+                phone='0600000000', address='Adresse'
+            )
+            manager = User.objects.create_user(username=f'manager{Project.objects.count()}')
+            project = Project.objects.create(name=f'Projet {index}', manager=manager, client=client)
+            members = [
+                User.objects.create_user(username=f'membre{project.pk}-{member}')
+                for member in range(3)
+            ]
+            project.team_members.set(members)
+            Task.objects.create(title='Tâche', project=project, status='in_progress')
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/projects/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.create_projects(2)
+        small = self.count_list_queries()
+        self.create_projects(6)
+        large = self.count_list_queries()
+        self.assertEqual(small, large)
+
+    def test_list_serializes_nested_relations(self):
+        self.create_projects(1)
+        response = self.client.get('/api/projects/')
+        project = response.data['results'][0]
+        self.assertEqual(project['client_name'], 'Client 0')
+        self.assertEqual(len(project['team_members']), 3)
+        self.assertEqual(project['task_statistics']['in_progress'], 1)
+        self.assertEqual(project['progress'], 50.0)
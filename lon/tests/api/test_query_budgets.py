@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Notification
+from activity.models import ActivityEvent
+from api.datagen import DataGenerator
+from projects.models import Project
+from tests.querycount import QueryCountAssertionsMixin, read_routes
+
+User = get_user_model()
+
+# Nombre maximal de requêtes SQL par route en lecture (authentification forcée,
+# cache vide). Toute nouvelle route GET des routeurs doit être déclarée ici.
+# Hors staff, les routes filtrées par visibilité lisent en plus les projets
+# accessibles (une requête).
+QUERY_BUDGETS = {
+    'task-list': 2,
+    'task-by-project': 2,
+    'task-detail': 2,
+    'user-list': 1,
+    'user-detail': 1,
+    'notification-list': 1,
+    'notification-unread-count': 1,
+    'notification-detail': 1,
+    'projects:project-list': 2,
+    'projects:project-managed': 2,
+    'projects:project-detail': 2,
+    'client-list': 1,
+    'client-detail': 1,
+    'activity-list': 2,
+    'activity-detail': 2,
+}
+
+
+class QueryBudgetTest(QueryCountAssertionsMixin, TestCase):
+    """
+    Le nombre de requêtes de chaque route en lecture ne dépend pas du volume
+    de données et respecte son budget.
+    """
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username='admin', password='secret', is_staff=True)
+        self.member = User.objects.create_user(username='membre', password='secret')
+        self.batches = 0
+        data = self.seed(projects=2, tasks_per_project=2)
+        self.project = data['projects'][0]
+        self.task = self.project.tasks.order_by('pk').first()
+        self.client_pk = data['clients'][0].pk
+        self.notification = Notification.objects.filter(user=self.member).first()
+        self.event = ActivityEvent.objects.filter(project=self.project).first()
+        self.client = APIClient()
+
+    def seed(self, projects, tasks_per_project):
+        """
+        Ajoute des projets dont `member` est membre (et chef du premier),
+        leurs tâches, des notifications et des événements d'activité.
+        """
+        self.batches += 1
+        data = DataGenerator(seed=self.batches, prefix=f'lot{self.batches}').generate(
+            clients=projects, users=3, projects=projects, tasks_per_project=tasks_per_project, team_size=3
+        )
+        for project in data['projects']:
+            project.team_members.add(self.member)
+        Project.objects.filter(pk=data['projects'][0].pk).update(manager=self.member)
+        Notification.objects.bulk_create([
+            Notification(user=self.member, message=f"Message {index}")
+            for index in range(projects * tasks_per_project)
+        ])
+        ActivityEvent.objects.bulk_create([
+            ActivityEvent(
+                project=project, actor=project.manager, verb='created',
+                target_type='project', target_id=project.pk, summary=project.name
+            )
+            for project in data['projects']
+        ])
+        return data
+
+    def route_urls(self):
+        objects = {
+            'task': self.task.pk, 'user': self.member.pk, 'notification': self.notification.pk,
+            'project': self.project.pk, 'client': self.client_pk, 'activity': self.event.pk,
+        }
+        urls = {}
+        for name, params in read_routes().items():
+            basename = name.split(':')[-1].split('-')[0]
+            kwargs = {
+                param: self.project.pk if param == 'project_id' else objects[basename]
+                for param in params
+            }
+            urls[name] = reverse(name, kwargs=kwargs)
+        return urls
+
+    def test_every_read_route_has_a_budget(self):
+        self.assertEqual(set(read_routes()) - set(QUERY_BUDGETS), set())
+
+    def test_staff_queries_do_not_grow_with_rows(self):
+        self.client.force_authenticate(user=self.staff)
+        urls = self.route_urls()
+        # Un membre du staff ne voit que ses propres notifications
+        urls.pop('notification-detail')
+        self.assertQueriesIndependentOfRows(
+            urls, lambda: self.seed(projects=6, tasks_per_project=4), QUERY_BUDGETS
+        )
+
+    def test_member_queries_do_not_grow_with_rows(self):
+        self.client.force_authenticate(user=self.member)
+        urls = self.route_urls()
+        self.assertQueriesIndependentOfRows(
+            urls, lambda: self.seed(projects=6, tasks_per_project=4), QUERY_BUDGETS
+        )
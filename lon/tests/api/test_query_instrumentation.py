@@ -0,0 +1,64 @@
+import json
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.middleware import QueryInstrumentationMiddleware, QueryRecorder
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class QueryInstrumentationTest(TestCase):
+    """
+    Tests du middleware d'instrumentation des requêtes SQL.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', is_staff=True)
+        project = Project.objects.create(name='Chantier A', manager=self.user)
+        Task.objects.create(title='Tâche', project=project)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_disabled_by_default(self):
+        response = self.client.get('/api/tasks/')
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(QUERY_INSTRUMENTATION=True)
+    def test_server_timing_and_log(self):
+        with self.assertLogs('api.instrumentation', level='INFO') as logs:
+            response = self.client.get('/api/tasks/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], '/api/tasks/')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertEqual(record['duplicates'], [])
+
+    @override_settings(QUERY_INSTRUMENTATION=True)
+    def test_async_middleware_records_queries_of_sync_views(self):
+        def count_tasks(request):
+            return HttpResponse(Task.objects.count())
+
+        middleware = QueryInstrumentationMiddleware(sync_to_async(count_tasks))
+        self.assertTrue(iscoroutinefunction(middleware))
+        with self.assertLogs('api.instrumentation', level='INFO'):
+            response = async_to_sync(middleware)(RequestFactory().get('/api/tasks/'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+    def test_recorder_detects_repeated_queries(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for task in Task.objects.all():
+                for _ in range(3):
+                    Project.objects.filter(pk=task.project_id).exists()
+        self.assertEqual(len(recorder.queries), 4)
+        [(sql, count)] = recorder.duplicates(threshold=3)
+        self.assertEqual(count, 3)
+        self.assertIn('projects_project', sql)
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from accounts.serializers import TokenObtainPairWithClaimsSerializer
+from projects.models import Project
+from realtime.broker import check_broker_settings, get_broker
+
+User = get_user_model()
+
+
+class RealtimeStreamTest(TestCase):
+    """
+    Tests du flux Server-Sent Events.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='chef')
+        self.project = Project.objects.create(name='Chantier A', manager=self.user)
+        self.token = str(TokenObtainPairWithClaimsSerializer.get_token(self.user).access_token)
+
+    async def get_ticket(self):
+        response = await self.async_client.post(
+            '/api/realtime/ticket/', headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['ticket']
+
+    async def test_requires_token(self):
+        response = await self.async_client.get('/api/realtime/stream/')
+        self.assertEqual(response.status_code, 401)
+        # Le jeton d'accès n'est plus accepté dans l'URL
+        response = await self.async_client.get('/api/realtime/stream/', {'token': self.token})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_ticket_is_single_use(self):
+        ticket = await self.get_ticket()
+        response = await self.async_client.get('/api/realtime/stream/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 200)
+        await response.streaming_content.aclose()
+        response = await self.async_client.get('/api/realtime/stream/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_ticket_claimed_by_another_request_is_rejected(self):
+        ticket = await self.get_ticket()
+        # Une requête concurrente a supprimé le ticket après notre lecture
+        with mock.patch.object(cache, 'delete', return_value=False):
+            response = await self.async_client.get('/api/realtime/stream/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+    def test_not_served_under_wsgi(self):
+        headers = {'Authorization': f'Bearer {self.token}'}
+        self.assertEqual(self.client.post('/api/realtime/ticket/', headers=headers).status_code, 204)
+        self.assertEqual(self.client.get('/api/realtime/stream/', headers=headers).status_code, 204)
+
+    def test_in_process_broker_requires_a_single_worker(self):
+        with override_settings(REALTIME_BROKER='realtime.broker.InProcessBroker', WEB_CONCURRENCY=4):
+            with self.assertRaises(ImproperlyConfigured):
+                check_broker_settings()
+        with override_settings(REALTIME_BROKER='realtime.broker.RedisBroker', WEB_CONCURRENCY=4):
+            check_broker_settings()
+
+    async def test_streams_events_of_subscribed_channels(self):
+        response = await self.async_client.get('/api/realtime/stream/', {'ticket': await self.get_ticket()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = response.streaming_content
+        self.assertEqual(await anext(content), b': connected\n\n')
+
+        get_broker().publish('project:999', {'type': 'task.status_changed'})
+        get_broker().publish(f'project:{self.project.pk}', {'type': 'task.assigned', 'task_id': 1})
+        chunk = await anext(content)
+        self.assertEqual(chunk, b'event: task.assigned\ndata: {"type": "task.assigned", "task_id": 1}\n\n')
+        await content.aclose()
@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskBulkOperationsTest(TestCase):
+    """
+    Tests des opérations en masse de /api/tasks/bulk/.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='chef', password='secret')
+        self.other = User.objects.create_user(username='ouvrier', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create_uses_constant_queries(self):
+        items = [
+            {'title': f'Tâche {index}', 'project_id': self.project.pk, 'assigned_to_id': self.other.pk}
+            for index in range(50)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/tasks/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertLess(len(context.captured_queries), 10)
+        self.assertEqual(Task.objects.filter(created_by=self.user).count(), 50)
+        self.assertTrue(all(result['id'] for result in response.data['results']))
+
+    def test_bulk_create_is_all_or_nothing(self):
+        items = [
+            {'title': 'Valide', 'project_id': self.project.pk},
+            {'title': 'Projet inconnu', 'project_id': 999999},
+            {'title': 'Dates', 'project_id': self.project.pk,
+             'start_date': '2025-02-01', 'end_date': '2025-01-01'},
+        ]
+        response = self.client.post('/api/tasks/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        results = response.data['results']
+        self.assertIsNone(results[0]['errors'])
+        self.assertIn('project_id', results[1]['errors'])
+        self.assertIn('start_date', results[2]['errors'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_status_validates_transitions(self):
+        todo = Task.objects.create(title='A', project=self.project, status='todo')
+        review = Task.objects.create(title='B', project=self.project, status='review')
+        response = self.client.post('/api/tasks/bulk/status/', [
+            {'id': todo.pk, 'status': 'in_progress'},
+            {'id': review.pk, 'status': 'todo'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('status', response.data['results'][1]['errors'])
+        todo.refresh_from_db()
+        self.assertEqual(todo.status, 'todo')
+
+        response = self.client.post('/api/tasks/bulk/status/', [
+            {'id': todo.pk, 'status': 'in_progress'},
+            {'id': review.pk, 'status': 'done'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            dict(Task.objects.values_list('pk', 'status')),
+            {todo.pk: 'in_progress', review.pk: 'done'}
+        )
+
+    def test_bulk_reassign(self):
+        tasks = [Task.objects.create(title=f'T{index}', project=self.project) for index in range(3)]
+        response = self.client.post('/api/tasks/bulk/reassign/', [
+            {'id': task.pk, 'assigned_to_id': self.other.pk} for task in tasks
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.filter(assigned_to=self.other).count(), 3)
+
+    def test_bulk_reassign_rejects_repeated_ids(self):
+        task = Task.objects.create(title='T', project=self.project)
+        response = self.client.post('/api/tasks/bulk/reassign/', [
+            {'id': task.pk, 'assigned_to_id': self.other.pk},
+            {'id': task.pk, 'assigned_to_id': None},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNone(response.data['results'][0]['errors'])
+        self.assertIn('id', response.data['results'][1]['errors'])
+        task.refresh_from_db()
+        self.assertIsNone(task.assigned_to_id)
+
+    def test_payload_must_be_a_list(self):
+        response = self.client.post('/api/tasks/bulk/', {'title': 'Seule'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from tasks.models import Task
+from tasks.views import TaskViewSet
+
+User = get_user_model()
+
+
+class ChangeStatusTest(TestCase):
+    """
+    Tests des transitions de statut conditionnelles de /api/tasks/<id>/change_status/.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='chef', password='secret')
+        project = Project.objects.create(name='Chantier A', manager=self.user)
+        self.task = Task.objects.create(title='Tâche', project=project, status='todo')
+        self.url = f'/api/tasks/{self.task.pk}/change_status/'
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_valid_transition_is_a_single_update(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {'status': 'in_progress'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'in_progress')
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'in_progress')
+        updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"status" = ', updates[0])
+        # Statistiques du projet ajustées par incrément, sans recompter les tâches
+        stats_updates = [
+            q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "projects_projectstats"')
+        ]
+        self.assertEqual(len(stats_updates), 1)
+
+    def test_invalid_transition_is_rejected(self):
+        response = self.client.post(self.url, {'status': 'done'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'todo')
+
+    def test_lost_race_returns_conflict(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        # Un autre utilisateur a déplacé la tâche après notre lecture
+        Task.objects.filter(pk=self.task.pk).update(status='in_progress')
+        with mock.patch.object(TaskViewSet, 'get_object', return_value=stale):
+            response = self.client.post(self.url, {'status': 'in_progress'})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['current_status'], 'in_progress')
+
+    def test_transition_to_requires_the_loaded_status(self):
+        self.assertTrue(self.task.transition_to('in_progress'))
+        stale = Task.objects.get(pk=self.task.pk)
+        # Un autre utilisateur termine la tâche : depuis « terminé », le passage
+        # en révision serait permis, mais il ne doit pas rouvrir la tâche
+        Task.objects.filter(pk=self.task.pk).update(status='done')
+        self.assertFalse(stale.transition_to('review'))
+        self.assertEqual(stale.status, 'in_progress')
+
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertTrue(task.transition_to('review'))
+        self.assertEqual(task.get_loaded_value('status'), 'review')
+        with self.assertRaises(ValueError):
+            task.transition_to('todo')
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskVisibilityTest(TestCase):
+    """
+    Tests du filtrage des tâches selon l'utilisateur.
+    """
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='chef')
+        self.member = User.objects.create_user(username='membre')
+        self.assignee = User.objects.create_user(username='assigne')
+        self.outsider = User.objects.create_user(username='externe')
+        self.staff = User.objects.create_user(username='admin', is_staff=True)
+        self.project = Project.objects.create(name='Chantier A', manager=self.manager)
+        self.project.team_members.add(self.member)
+        other_project = Project.objects.create(name='Chantier B', manager=self.outsider)
+        self.team_task = Task.objects.create(title='Équipe', project=self.project)
+        self.assigned_task = Task.objects.create(
+            title='Assignée', project=other_project, assigned_to=self.assignee
+        )
+        self.client = APIClient()
+
+    def visible_ids(self, user):
+        return set(Task.objects.visible_to(user).values_list('pk', flat=True))
+
+    def test_visible_to(self):
+        self.assertEqual(self.visible_ids(self.manager), {self.team_task.pk})
+        self.assertEqual(self.visible_ids(self.member), {self.team_task.pk})
+        self.assertEqual(self.visible_ids(self.assignee), {self.assigned_task.pk})
+        self.assertEqual(self.visible_ids(self.outsider), {self.assigned_task.pk})
+        self.assertEqual(self.visible_ids(self.staff), {self.team_task.pk, self.assigned_task.pk})
+
+    def test_visible_to_uses_semi_joins(self):
+        sql = str(Task.objects.visible_to(self.member).query)
+        self.assertIn('EXISTS', sql)
+        self.assertNotIn('DISTINCT', sql)
+
+    def test_endpoints_apply_visibility(self):
+        self.client.force_authenticate(user=self.member)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/tasks/')
+        self.assertEqual([task['id'] for task in response.data['results']], [self.team_task.pk])
+        self.assertFalse(any('DISTINCT' in query['sql'] for query in context.captured_queries))
+
+        response = self.client.get(f'/api/tasks/{self.assigned_task.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(f'/api/tasks/project/{self.project.pk}/')
+        self.assertEqual([task['id'] for task in response.data['results']], [self.team_task.pk])
+
+        response = self.client.get('/api/tasks/calendar/feed/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_create_is_limited_to_accessible_projects(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.post('/api/tasks/bulk/', [
+            {'title': 'Intrusion', 'project_id': self.assigned_task.project_id}
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskRepresentationTest(TestCase):
+    """
+    Tests des modes de représentation de la liste des tâches.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='chef', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=self.user)
+        # Les statistiques du projet sont recalculées au commit
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(3):
+                Task.objects.create(
+                    title=f'Tâche {index}', project=self.project,
+                    created_by=self.user, assigned_to=self.user
+                )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_default_representation_is_compact(self):
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        task = response.data['results'][0]
+        self.assertEqual(task['project_id'], self.project.pk)
+        self.assertEqual(task['project'], {'id': self.project.pk, 'name': 'Chantier A', 'status': 'NEW'})
+
+    def test_expand_project_returns_full_project(self):
+        response = self.client.get('/api/tasks/', {'expand': 'project'})
+        project = response.data['results'][0]['project']
+        self.assertEqual(project['task_statistics']['total'], 3)
+        self.assertEqual(project['manager']['username'], 'chef')
+
+    def test_sideload_returns_related_objects_once(self):
+        response = self.client.get('/api/tasks/', {'sideload': 'true'})
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][0]['project'], self.project.pk)
+        self.assertEqual(response.data['results'][0]['assigned_to'], self.user.pk)
+        self.assertEqual(list(response.data['included']['projects']), [self.project.pk])
+        self.assertEqual(list(response.data['included']['users']), [self.user.pk])
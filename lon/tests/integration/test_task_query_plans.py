@@ -0,0 +1,125 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Assertions basées sur EXPLAIN pour détecter les parcours séquentiels.
+    Sous PostgreSQL, les parcours séquentiels sont désactivés pendant
+    l'EXPLAIN : le planificateur ne les choisit alors que si aucun index
+    n'est utilisable, ce qui rend le test indépendant du volume de données.
+    """
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan TO off')
+            try:
+                return queryset.explain()
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET enable_seqscan TO on')
+        return queryset.explain()
+
+    def is_sequential_scan(self, line, table):
+        if connection.vendor == 'postgresql':
+            return f'Seq Scan on {table}' in line
+        if connection.vendor == 'sqlite':
+            # « SCAN table » sans index ; « SEARCH ... USING INDEX » est attendu
+            words = line.split()
+            return 'SCAN' in words and table in words and 'USING' not in words
+        return False
+
+    def is_sort_step(self, line):
+        if connection.vendor == 'postgresql':
+            return line.strip().startswith('Sort') or '->  Sort' in line
+        if connection.vendor == 'sqlite':
+            return 'USE TEMP B-TREE FOR ORDER BY' in line
+        return False
+
+    def assertNoSequentialScan(self, queryset, table=None):
+        """
+        Vérifie le chemin d'accès du filtre ; le tri est neutralisé car il est
+        vérifié séparément par assertOrderingUsesIndex.
+        """
+        table = table or queryset.model._meta.db_table
+        plan = self.explain(queryset.order_by())
+        scans = [line for line in plan.splitlines() if self.is_sequential_scan(line, table)]
+        self.assertFalse(scans, f"Parcours séquentiel de {table} :\n{plan}")
+
+    def assertOrderingUsesIndex(self, queryset):
+        plan = self.explain(queryset)
+        sorts = [line for line in plan.splitlines() if self.is_sort_step(line)]
+        self.assertFalse(sorts, f"Tri effectué hors index :\n{plan}")
+
+
+class TaskQueryPlanTest(QueryPlanAssertionsMixin, TestCase):
+    """
+    Vérifie que les requêtes fréquentes sur les tâches utilisent un index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        manager = User.objects.create_user(username='chef', password='secret')
+        projects = [
+            Project.objects.create(name=f'Chantier {index}', manager=manager)
+            for index in range(10)
+        ]
+        cls.project = projects[0]
+        start = date(2025, 1, 1)
+        Task.objects.bulk_create([
+            Task(
+                title=f'Tâche {index}', project=projects[index % len(projects)],
+                status=['todo', 'in_progress', 'review', 'done'][index % 4],
+                start_date=start + timedelta(days=index),
+                end_date=start + timedelta(days=index + 5)
+            )
+            for index in range(200)
+        ])
+
+    def test_project_status_filter(self):
+        self.assertNoSequentialScan(Task.objects.filter(project=self.project, status='todo'))
+
+    def test_project_statistics(self):
+        self.assertNoSequentialScan(
+            Project.objects.filter(pk=self.project.pk).with_task_stats(), table='tasks_task'
+        )
+
+    def test_project_end_date_range(self):
+        self.assertNoSequentialScan(
+            Task.objects.filter(project=self.project, end_date__lte=date(2025, 2, 1))
+        )
+
+    def test_open_overdue_tasks(self):
+        self.assertNoSequentialScan(
+            Task.objects.filter(end_date__lt=date(2025, 1, 20)).exclude(status='done')
+        )
+
+    def test_flagged_overdue_tasks(self):
+        self.assertNoSequentialScan(Task.objects.filter(overdue_since__isnull=False))
+
+    def test_calendar_overlap(self):
+        window_start, window_end = date(2025, 1, 10), date(2025, 1, 31)
+        self.assertNoSequentialScan(Task.objects.filter(
+            Q(start_date__lte=window_end) & (Q(end_date__gte=window_start) | Q(end_date__isnull=True))
+        ))
+
+    def test_start_date_filter(self):
+        self.assertNoSequentialScan(Task.objects.filter(start_date__gte=date(2025, 1, 15)))
+
+    def test_default_ordering(self):
+        self.assertOrderingUsesIndex(Task.objects.all())
+
+    def test_detects_sequential_scan(self):
+        """Garde-fou : le harnais doit signaler un filtre sans index"""
+        with self.assertRaises(AssertionError):
+            self.assertNoSequentialScan(Task.objects.filter(title='Tâche 1'))
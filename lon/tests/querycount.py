@@ -0,0 +1,80 @@
+"""
+Outils de test du nombre de requêtes SQL des routes de l'API.
+
+read_routes() énumère les routes en lecture (GET) des ViewSets enregistrés
+dans les routeurs ; QueryCountAssertionsMixin appelle une route sur deux
+volumes de données et vérifie que le nombre de requêtes ne dépend pas du
+nombre de lignes et reste dans le budget déclaré.
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from django.urls.resolvers import URLResolver
+from rest_framework.viewsets import ViewSetMixin
+
+
+def _walk(patterns, namespace=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            nested = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+            yield from _walk(pattern.url_patterns, nested)
+        else:
+            yield namespace, pattern
+
+
+def read_routes():
+    """
+    Noms (avec espace de noms) des routes des routeurs DRF acceptant GET,
+    avec les paramètres d'URL attendus : {nom: (paramètres, ...)}.
+    Une route enregistrée dans plusieurs routeurs n'apparaît qu'une fois,
+    sous le premier nom rencontré.
+    """
+    routes = {}
+    seen = set()
+    for namespace, pattern in _walk(get_resolver().url_patterns):
+        view_class = getattr(pattern.callback, 'cls', None)
+        actions = getattr(pattern.callback, 'actions', None) or {}
+        if view_class is None or not issubclass(view_class, ViewSetMixin) or 'get' not in actions:
+            continue
+        params = tuple(name for name in pattern.pattern.regex.groupindex if name != 'format')
+        if pattern.name not in seen:
+            seen.add(pattern.name)
+            routes[namespace + pattern.name] = params
+    return routes
+
+
+class QueryCountAssertionsMixin:
+    """
+    `client` doit être authentifié. Le cache est vidé avant chaque appel :
+    les données de test étant écrites par bulk_create, aucun signal
+    n'invalide les projets accessibles mis en cache.
+    """
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, f"{url} : {response.status_code}")
+        return len(captured)
+
+    def assertQueriesIndependentOfRows(self, urls, seed_more, budgets):
+        """
+        Appelle chaque URL de `urls` ({nom: url}), ajoute des données avec
+        seed_more(), puis les rappelle : pour chaque route, le nombre de
+        requêtes doit être identique et ne pas dépasser budgets[nom].
+        """
+        small = {name: self.count_queries(url) for name, url in urls.items()}
+        seed_more()
+        large = {name: self.count_queries(url) for name, url in urls.items()}
+        for name in urls:
+            with self.subTest(route=name):
+                self.assertEqual(
+                    small[name], large[name],
+                    f"{name} : {small[name]} requêtes sur le petit jeu de données, "
+                    f"{large[name]} sur le grand (N+1 ?)"
+                )
+                self.assertLessEqual(
+                    large[name], budgets[name],
+                    f"{name} : {large[name]} requêtes pour un budget de {budgets[name]}"
+                )
@@ -0,0 +1,86 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from accounts.models import Notification
+from api import benchmark
+from api.datagen import DataGenerator
+from projects.models import Project
+from tasks.models import Task, TaskDocument
+
+
+class DataGeneratorTest(TestCase):
+    """
+    Tests du générateur de données synthétiques.
+    """
+
+    def generate(self, prefix):
+        return DataGenerator(seed=7, today=date(2025, 6, 1), prefix=prefix).generate(
+            clients=2, users=4, projects=3, tasks_per_project=5, team_size=2
+        )
+
+    def test_sizes(self):
+        data = self.generate('a')
+        self.assertEqual(data['tasks'], 15)
+        self.assertEqual(Project.objects.count(), 3)
+        self.assertEqual(Task.objects.filter(project__in=data['projects']).count(), 15)
+
+    def test_same_seed_produces_same_data(self):
+        rows = []
+        for prefix in ('a', 'b'):
+            data = self.generate(prefix)
+            rows.append(list(
+                Task.objects.filter(project__in=data['projects']).order_by('pk')
+                .values_list('title', 'status', 'priority', 'start_date', 'end_date')
+            ))
+        self.assertEqual(rows[0], rows[1])
+
+    def test_spread_keeps_total(self):
+        counts = DataGenerator(seed=3).spread(1000, 7)
+        self.assertEqual(sum(counts), 1000)
+        self.assertEqual(len(counts), 7)
+
+    def test_seed_scale_command(self):
+        options = dict(
+            clients=2, users=5, projects=4, tasks=50, documents_per_task=1,
+            notifications_per_user=3, batch_size=7, stdout=StringIO()
+        )
+        call_command('seed_scale', **options)
+        self.assertEqual(Task.objects.count(), 50)
+        self.assertEqual(Notification.objects.count(), 15)
+        self.assertGreater(TaskDocument.objects.count(), 0)
+        with self.assertRaises(CommandError):
+            call_command('seed_scale', **options)
+
+
+class BenchmarkTest(TestCase):
+    """
+    Tests de la mesure des endpoints et de la comparaison à une référence.
+    """
+
+    def test_measure_every_endpoint(self):
+        data = DataGenerator(seed=1).generate(clients=1, users=3, projects=2, tasks_per_project=3)
+        user, project, task = benchmark.benchmark_target(data['users'])
+        results = benchmark.measure(user, project, task, iterations=2, warmup=1)
+        self.assertEqual(set(results), set(benchmark.endpoints(project, task)))
+        for result in results.values():
+            self.assertGreater(result['queries'], 0)
+            self.assertLessEqual(result['p50'], result['p99'])
+
+    def test_compare_flags_latency_and_query_regressions(self):
+        baseline = {
+            'tasks_list': {'p95': 10.0, 'queries': 3},
+            'projects_list': {'p95': 10.0, 'queries': 2},
+        }
+        current = {
+            'tasks_list': {'p95': 11.0, 'queries': 4},
+            'projects_list': {'p95': 13.0, 'queries': 2},
+            'tasks_calendar': {'p95': 5.0, 'queries': 1},
+        }
+        rows = {row['endpoint']: row for row in benchmark.compare(baseline, current, tolerance=0.2)}
+        self.assertEqual(rows['tasks_list']['regressions'], ['queries'])
+        self.assertEqual(rows['projects_list']['regressions'], ['latency'])
+        self.assertEqual(rows['tasks_calendar']['regressions'], [])
+        self.assertIsNone(rows['tasks_calendar']['baseline'])
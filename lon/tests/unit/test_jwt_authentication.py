@@ -0,0 +1,116 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends import locmem
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts.authentication import CachedJWTAuthentication
+from accounts.models import TokenPrincipal
+from accounts.serializers import TokenObtainPairWithClaimsSerializer
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    """
+    Tests de l'authentification JWT par claims et du cache des utilisateurs
+    (cache partagé entre les workers, comme Redis).
+    """
+    cache_is_shared = True
+
+    def setUp(self):
+        patcher = mock.patch('accounts.authentication.cache_is_shared', return_value=self.cache_is_shared)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='chef', password='secret', email='chef@example.com', is_staff=True
+        )
+        refresh = TokenObtainPairWithClaimsSerializer.get_token(self.user)
+        self.refresh = str(refresh)
+        self.token = str(refresh.access_token)
+        # La création de l'utilisateur le marque comme modifié
+        cache.clear()
+
+    def authenticate(self, token=None):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token or self.token}')
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_token_carries_claims(self):
+        token = AccessToken(self.token)
+        self.assertEqual(token['username'], 'chef')
+        self.assertTrue(token['is_staff'])
+
+    def test_principal_built_without_query(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertIsInstance(user, TokenPrincipal)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.username, 'chef')
+            self.assertTrue(user.is_staff)
+
+    def test_extra_fields_loaded_once(self):
+        user = self.authenticate()
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'chef@example.com')
+            self.assertTrue(user.is_active)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().email, 'chef@example.com')
+
+    def test_deactivation_applies_to_issued_tokens(self):
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_claims_overridden_after_change(self):
+        self.user.is_staff = False
+        self.user.save()
+        self.assertFalse(self.authenticate().is_staff)
+
+    def test_refreshed_token_does_not_restore_removed_rights(self):
+        self.user.is_staff = False
+        self.user.save()
+        # Jeton rafraîchi après la durée de vie des jetons d'accès émis avant le retrait
+        later = locmem.time.time() + api_settings.ACCESS_TOKEN_LIFETIME.total_seconds() + 60
+        with mock.patch.object(locmem, 'time', mock.Mock(time=mock.Mock(return_value=later))):
+            token = str(RefreshToken(self.refresh).access_token)
+            self.assertTrue(AccessToken(token)['is_staff'])
+            self.assertFalse(self.authenticate(token).is_staff)
+
+    def test_token_without_claims_loads_user(self):
+        token = AccessToken.for_user(self.user)
+        with self.assertNumQueries(1):
+            user = self.authenticate(str(token))
+        self.assertEqual(user.username, 'chef')
+
+
+class ProcessLocalCacheAuthenticationTest(CachedJWTAuthenticationTest):
+    """
+    Avec un cache propre au processus, les claims ne font pas foi : la ligne
+    de l'utilisateur est lue en base à chaque requête.
+    """
+    cache_is_shared = False
+
+    def test_principal_built_without_query(self):
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+        self.assertTrue(user.is_staff)
+
+    def test_extra_fields_loaded_once(self):
+        user = self.authenticate()
+        with self.assertNumQueries(0):
+            self.assertEqual(user.email, 'chef@example.com')
+
+    def test_change_in_another_worker_applies_immediately(self):
+        # Écriture faite par un autre processus : aucune invalidation locale
+        User.objects.filter(pk=self.user.pk).update(is_staff=False)
+        self.assertFalse(self.authenticate().is_staff)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
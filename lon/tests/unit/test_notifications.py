@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Notification
+from accounts.utils import notify_project_team, notify_users
+from projects.models import Project
+
+User = get_user_model()
+
+
+class NotificationFanOutTest(TestCase):
+    """
+    Tests de l'envoi groupé des notifications.
+    """
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='chef')
+        self.members = [User.objects.create_user(username=f'membre{i}') for i in range(5)]
+        self.project = Project.objects.create(name='Chantier A', manager=self.manager)
+        self.project.team_members.add(*self.members)
+
+    def test_team_notified_in_constant_queries(self):
+        # Une requête pour l'équipe, une pour l'INSERT groupé
+        with self.assertNumQueries(2):
+            count = notify_project_team(self.project, 'Réunion de chantier', exclude=[self.manager])
+        self.assertEqual(count, 5)
+        self.assertEqual(
+            set(Notification.objects.values_list('user_id', flat=True)),
+            {member.pk for member in self.members}
+        )
+
+    def test_background_notifications_wait_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            notify_users(User.objects.filter(username__startswith='membre'), 'Planning modifié', background=True)
+            self.assertFalse(Notification.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(Notification.objects.filter(message='Planning modifié').count(), 5)
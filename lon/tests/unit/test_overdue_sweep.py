@@ -0,0 +1,126 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Notification
+from projects.models import Project, ProjectStats
+from tasks.models import Task
+from tasks.overdue import sweep_overdue_tasks
+
+User = get_user_model()
+
+
+class OverdueSweepTest(TestCase):
+    """
+    Tests de l'indicateur de retard stocké (overdue_since) et du balayage nocturne.
+    """
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='chef', password='secret')
+        self.worker = User.objects.create_user(username='ouvrier', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=self.manager)
+        self.today = timezone.now().date()
+        self.due_today = Task.objects.create(
+            title='Fondations', project=self.project, assigned_to=self.worker, end_date=self.today
+        )
+        self.unassigned = Task.objects.create(title='Murs', project=self.project, end_date=self.today)
+        Task.objects.create(title='Toiture', project=self.project, end_date=self.today + timedelta(days=5))
+
+    def test_save_keeps_the_flag_up_to_date(self):
+        task = Task.objects.create(
+            title='Dalle', project=self.project, end_date=self.today - timedelta(days=3)
+        )
+        self.assertEqual(task.overdue_since, self.today - timedelta(days=2))
+        self.assertEqual(task.delay_days, 3)
+
+        # Échéance repoussée mais toujours dépassée : la date suit l'échéance
+        task.end_date = self.today - timedelta(days=1)
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual((task.overdue_since, task.delay_days), (self.today, 1))
+
+        task.end_date = self.today + timedelta(days=1)
+        task.save()
+        task.refresh_from_db()
+        self.assertIsNone(task.overdue_since)
+        self.assertFalse(task.is_overdue)
+
+    def test_sweep_flags_notifies_and_refreshes_stats(self):
+        tomorrow = self.today + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            result = sweep_overdue_tasks(tomorrow)
+        self.assertEqual(result, {'flagged': 2, 'cleared': 0, 'notified': 2})
+
+        self.due_today.refresh_from_db()
+        self.assertEqual(self.due_today.overdue_since, tomorrow)
+        self.assertEqual(
+            set(Notification.objects.values_list('user__username', flat=True)), {'ouvrier', 'chef'}
+        )
+        self.assertEqual(ProjectStats.objects.get(project=self.project).overdue, 2)
+        self.assertTrue(Project.objects.with_stats().get(pk=self.project.pk).is_delayed)
+
+        # Les tâches déjà signalées ne sont pas notifiées deux fois
+        self.assertEqual(sweep_overdue_tasks(tomorrow)['flagged'], 0)
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_completed_tasks_are_no_longer_overdue(self):
+        sweep_overdue_tasks(self.today + timedelta(days=1), notify=False)
+        self.due_today.refresh_from_db()
+        for status in ['in_progress', 'review', 'done']:
+            self.assertTrue(self.due_today.transition_to(status))
+        self.due_today.refresh_from_db()
+        self.assertIsNone(self.due_today.overdue_since)
+
+        # Réouverture : la tâche est de nouveau signalée, sans attendre le balayage
+        tomorrow = self.today + timedelta(days=1)
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=1)):
+            self.assertTrue(self.due_today.transition_to('review'))
+        self.assertEqual(self.due_today.overdue_since, tomorrow)
+        self.due_today.refresh_from_db()
+        self.assertEqual(self.due_today.overdue_since, tomorrow)
+
+        # Écriture directe : l'indicateur est levé au balayage suivant
+        Task.objects.filter(pk=self.unassigned.pk).update(status='done')
+        result = sweep_overdue_tasks(self.today + timedelta(days=1))
+        self.assertEqual((result['flagged'], result['cleared']), (0, 1))
+
+    def test_sweep_flags_with_a_single_update(self):
+        with CaptureQueriesContext(connection) as context:
+            result = sweep_overdue_tasks(self.today + timedelta(days=1), notify=False)
+        self.assertEqual(result['flagged'], 2)
+        updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 2)  # indicateurs levés, puis tâches signalées
+        self.assertNotIn('SELECT "tasks_task"."id"', ' '.join(q['sql'] for q in context.captured_queries))
+
+    def test_one_notification_per_task_written_in_batches(self):
+        # Même titre, même échéance, même responsable que « Fondations »
+        Task.objects.create(
+            title='Fondations', project=self.project, assigned_to=self.worker, end_date=self.today
+        )
+        with mock.patch('accounts.utils.NOTIFICATION_BATCH_SIZE', 2), \
+                mock.patch.object(Notification.objects, 'bulk_create', wraps=Notification.objects.bulk_create) as bulk_create:
+            result = sweep_overdue_tasks(self.today + timedelta(days=1))
+        self.assertEqual((result['flagged'], result['notified']), (3, 3))
+        self.assertEqual([len(call.args[0]) for call in bulk_create.call_args_list], [2, 1])
+        self.assertEqual(Notification.objects.filter(user=self.worker).count(), 2)
+
+    def test_command_and_overdue_filter(self):
+        out = StringIO()
+        call_command('sweep_overdue_tasks', date=str(self.today + timedelta(days=1)), no_notify=True, stdout=out)
+        self.assertIn('2 tâches signalées', out.getvalue())
+        self.assertFalse(Notification.objects.exists())
+
+        client = APIClient()
+        client.force_authenticate(user=self.manager)
+        response = client.get('/api/tasks/', {'overdue': 'true'})
+        self.assertEqual({task['title'] for task in response.data['results']}, {'Fondations', 'Murs'})
+        response = client.get('/api/tasks/', {'overdue': 'false'})
+        self.assertEqual([task['title'] for task in response.data['results']], ['Toiture'])
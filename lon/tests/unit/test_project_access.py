@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from projects.access import accessible_project_ids
+from projects.models import Project
+
+User = get_user_model()
+
+
+class AccessibleProjectsCacheTest(TestCase):
+    """
+    Tests du cache des projets accessibles et de son invalidation.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user(username='chef', password='secret')
+        self.member = User.objects.create_user(username='ouvrier', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=self.manager)
+
+    def assertAccessible(self, user, projects):
+        self.assertEqual(accessible_project_ids(user), {project.pk for project in projects})
+
+    def test_second_lookup_is_served_from_cache(self):
+        self.assertAccessible(self.manager, [self.project])
+        with self.assertNumQueries(0):
+            self.assertAccessible(self.manager, [self.project])
+
+    def test_team_changes_invalidate(self):
+        self.assertAccessible(self.member, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.team_members.add(self.member)
+        self.assertAccessible(self.member, [self.project])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.projects.remove(self.project)
+        self.assertAccessible(self.member, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.projects.add(self.project)
+        self.assertAccessible(self.member, [self.project])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.team_members.clear()
+        self.assertAccessible(self.member, [])
+
+    def test_manager_change_invalidates_both_managers(self):
+        self.assertAccessible(self.manager, [self.project])
+        self.assertAccessible(self.member, [])
+        project = Project.objects.get(pk=self.project.pk)
+        project.manager = self.member
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertAccessible(self.manager, [])
+        self.assertAccessible(self.member, [self.project])
+
+    def test_delete_invalidates_members(self):
+        self.project.team_members.add(self.member)
+        self.assertAccessible(self.member, [self.project])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(accessible_project_ids(self.member), frozenset())
+        self.assertEqual(accessible_project_ids(self.manager), frozenset())
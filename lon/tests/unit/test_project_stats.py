@@ -0,0 +1,176 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_migrate
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from projects.models import Project, ProjectStats
+from projects.stats import refresh_project_stats
+from tasks import bulk
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class ProjectTaskStatsTest(TestCase):
+    """
+    Tests des statistiques de tâches calculées par agrégation.
+    """
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='chef', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=self.manager)
+        yesterday = timezone.now().date() - timedelta(days=1)
+        for status in ['todo', 'todo', 'in_progress', 'review', 'done']:
+            Task.objects.create(title=f'Tâche {status}', project=self.project, status=status)
+        Task.objects.create(title='En retard', project=self.project, status='todo', end_date=yesterday)
+        Task.objects.create(title='Terminée', project=self.project, status='done', end_date=yesterday)
+
+    def test_annotated_stats_use_a_single_query(self):
+        """Les statistiques annotées ne déclenchent aucune requête supplémentaire"""
+        with self.assertNumQueries(1):
+            project = Project.objects.with_task_stats().get(pk=self.project.pk)
+            stats = project.task_statistics
+            progress = project.progress
+            delayed = project.is_delayed
+
+        self.assertEqual(stats['total'], 7)
+        self.assertEqual(stats['todo'], 3)
+        self.assertEqual(stats['in_progress'], 1)
+        self.assertEqual(stats['review'], 1)
+        self.assertEqual(stats['done'], 2)
+        self.assertAlmostEqual(stats['completion_rate'], 2 / 7 * 100)
+        self.assertEqual(progress, round((2 * 1.0 + 0.75 + 0.5) / 7 * 100, 1))
+        self.assertTrue(delayed)
+
+    def test_fallback_uses_one_grouped_query(self):
+        """Sans annotation, une seule requête groupée est effectuée"""
+        project = Project.objects.get(pk=self.project.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(project.task_statistics['total'], 7)
+            self.assertEqual(project.progress, round(3.25 / 7 * 100, 1))
+            self.assertTrue(project.is_delayed)
+
+    def test_project_without_tasks(self):
+        project = Project.objects.create(name='Vide', manager=self.manager)
+        project = Project.objects.with_task_stats().get(pk=project.pk)
+        self.assertEqual(project.task_statistics['completion_rate'], 0)
+        self.assertEqual(project.progress, 0)
+        self.assertFalse(project.is_delayed)
+
+
+class MaterializedProjectStatsTest(TestCase):
+    """
+    Tests de la table ProjectStats, tenue à jour après chaque écriture de tâche.
+    """
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username='chef', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=self.manager)
+        self.tomorrow = timezone.now().date() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task = Task.objects.create(title='Fondations', project=self.project, end_date=self.tomorrow)
+            Task.objects.create(title='Murs', project=self.project, status='done')
+
+    def stats(self):
+        return ProjectStats.objects.get(project=self.project)
+
+    def test_stats_follow_task_writes(self):
+        stats = self.stats()
+        self.assertEqual((stats.total, stats.todo, stats.done), (2, 1, 1))
+        self.assertEqual(stats.progress, 50.0)
+        self.assertEqual(stats.next_due_date, self.tomorrow)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(self.task.transition_to('in_progress'))
+        self.assertEqual((self.stats().todo, self.stats().in_progress), (0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.bulk_change_status([{'id': self.task.pk, 'status': 'review'}], Task.objects.all())
+        self.assertEqual(self.stats().review, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        self.assertEqual((self.stats().total, self.stats().progress), (1, 100.0))
+
+    def test_transitions_apply_deltas_without_recounting(self):
+        """Une transition ajuste la ligne du projet sans recompter ses tâches"""
+        with self.captureOnCommitCallbacks(execute=True):
+            overdue = Task.objects.create(
+                title='Dalle', project=self.project, end_date=timezone.now().date() - timedelta(days=2)
+            )
+        self.assertEqual((self.stats().todo, self.stats().overdue), (2, 1))
+        # Rappels après commit non exécutés : les valeurs sont celles des UPDATE
+        with self.captureOnCommitCallbacks():
+            self.assertTrue(self.task.transition_to('in_progress'))
+            self.assertTrue(overdue.transition_to('in_progress'))
+            self.assertTrue(overdue.transition_to('review'))
+            self.assertTrue(overdue.transition_to('done'))
+            stats = self.stats()
+        self.assertEqual((stats.todo, stats.in_progress, stats.done, stats.overdue), (0, 1, 2, 0))
+        self.assertEqual(stats.progress, round((2 * 1.0 + 0.5) / 3 * 100, 1))
+        self.assertEqual(stats.next_due_date, self.tomorrow)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.transition_to('review')
+            self.task.transition_to('done')
+        self.assertIsNone(self.stats().next_due_date)
+
+    def test_task_writes_apply_deltas_without_counting_tasks(self):
+        other = Project.objects.create(name='Chantier B', manager=self.manager)
+        with CaptureQueriesContext(connection) as context, self.captureOnCommitCallbacks() as callbacks:
+            task = Task.objects.create(
+                title='Dalle', project=self.project, status='in_progress',
+                end_date=timezone.now().date() - timedelta(days=1),
+            )
+            self.assertEqual((self.stats().total, self.stats().in_progress, self.stats().overdue), (3, 1, 1))
+            task.project = other
+            task.save()
+            other_stats = ProjectStats.objects.get(project=other)
+            self.assertEqual((other_stats.total, other_stats.overdue, other_stats.progress), (1, 1, 50.0))
+            self.assertEqual((self.stats().total, self.stats().overdue, self.stats().progress), (2, 0, 50.0))
+            Task.objects.get(pk=self.task.pk).delete()
+            stats = self.stats()
+            self.assertEqual((stats.total, stats.todo, stats.progress, stats.next_due_date), (1, 0, 100.0, None))
+        self.assertFalse([q for q in context.captured_queries if 'COUNT(' in q['sql']])
+        # Aucun recalcul planifié après le commit
+        self.assertFalse([callback for callback in callbacks if callback.__module__ == 'projects.stats'])
+
+    def test_bulk_transition_updates_each_project_once(self):
+        tasks = Task.objects.bulk_create(
+            [Task(title=f'Tâche {i}', project=self.project) for i in range(100)]
+        )
+        refresh_project_stats([self.project.pk])
+        items = [{'id': task.pk, 'status': 'in_progress'} for task in tasks]
+        # Lecture des statuts, savepoint, UPDATE des tâches, UPDATE des statistiques, libération
+        with self.assertNumQueries(5):
+            results, ok = bulk.bulk_change_status(items, Task.objects.all())
+        self.assertTrue(ok)
+        stats = self.stats()
+        self.assertEqual((stats.todo, stats.in_progress, stats.done), (1, 100, 1))
+        self.assertEqual(stats.progress, round((100 * 0.5 + 1.0) / 102 * 100, 1))
+
+    def test_missing_stats_are_created_after_migrate(self):
+        ProjectStats.objects.all().delete()
+        post_migrate.send(sender=apps.get_app_config('projects'), app_config=apps.get_app_config('projects'))
+        self.assertEqual((self.stats().total, self.stats().done), (2, 1))
+
+    def test_serializer_reads_stats_without_counting_tasks(self):
+        with self.assertNumQueries(1):
+            project = Project.objects.with_stats().get(pk=self.project.pk)
+            self.assertEqual(project.task_statistics['total'], 2)
+            self.assertEqual(project.progress, 50.0)
+            self.assertEqual(project.next_due_date, self.tomorrow)
+            self.assertFalse(project.is_delayed)
+
+    def test_rebuild_command_repairs_stats(self):
+        Task.objects.filter(pk=self.task.pk).update(status='done')
+        ProjectStats.objects.all().delete()
+        call_command('rebuild_project_stats', stdout=StringIO())
+        self.assertEqual((self.stats().done, self.stats().progress), (2, 100.0))
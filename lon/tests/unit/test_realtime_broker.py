@@ -0,0 +1,44 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from projects.models import Project
+from realtime.broker import InProcessBroker, get_broker
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class InProcessBrokerTest(TestCase):
+    """
+    Tests du broker en mémoire et des événements publiés par les tâches.
+    """
+
+    async def test_publish_reaches_channel_subscribers_only(self):
+        broker = InProcessBroker()
+        async with broker.subscribe(['project:1']) as subscription:
+            broker.publish('project:2', {'type': 'ignored'})
+            broker.publish('project:1', {'type': 'task.status_changed'})
+            event = await subscription.get(timeout=1)
+            self.assertEqual(event['type'], 'task.status_changed')
+            with self.assertRaises(asyncio.TimeoutError):
+                await subscription.get(timeout=0.01)
+        self.assertEqual(broker._subscriptions, {})
+
+    async def test_task_transition_is_published_on_commit(self):
+        manager = await User.objects.acreate(username='chef')
+        project = await Project.objects.acreate(name='Chantier A', manager=manager)
+        task = await Task.objects.acreate(title='Coffrage', project=project)
+        async with get_broker().subscribe([f'project:{project.pk}']) as subscription:
+            def transition():
+                with self.captureOnCommitCallbacks(execute=True):
+                    task.transition_to('in_progress')
+            await sync_to_async(transition)()
+            event = await subscription.get(timeout=1)
+        self.assertEqual(event, {
+            'type': 'task.status_changed', 'task_id': task.pk, 'project_id': project.pk,
+            'old_status': 'todo', 'new_status': 'in_progress',
+        })
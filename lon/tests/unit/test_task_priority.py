@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from projects.models import Project
+from tasks.models import Task, PRIORITY_RANKS
+
+User = get_user_model()
+
+
+class TaskPriorityRankTest(TestCase):
+    """
+    Tests du rang numérique de priorité des tâches.
+    """
+
+    def setUp(self):
+        manager = User.objects.create_user(username='chef', password='secret')
+        self.project = Project.objects.create(name='Chantier A', manager=manager)
+
+    def test_default_ordering_follows_priority_rank(self):
+        for priority in ['medium', 'urgent', 'low', 'high']:
+            Task.objects.create(title=priority, project=self.project, priority=priority)
+        self.assertEqual(
+            list(Task.objects.values_list('priority', flat=True)),
+            ['urgent', 'high', 'medium', 'low']
+        )
+
+    def test_rank_stays_in_sync_on_save_and_bulk_updates(self):
+        task = Task.objects.create(title='Tâche', project=self.project, priority='low')
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, PRIORITY_RANKS['low'])
+
+        task.priority = 'high'
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, PRIORITY_RANKS['high'])
+
+        Task.objects.filter(pk=task.pk).update(priority='urgent')
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, PRIORITY_RANKS['urgent'])
+
+        task.priority = 'medium'
+        Task.objects.bulk_update([task], ['priority'])
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, PRIORITY_RANKS['medium'])
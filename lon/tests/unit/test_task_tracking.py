@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from projects.models import Project
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskFieldTrackingTest(TestCase):
+    """
+    Tests du suivi des valeurs chargées des tâches.
+    """
+
+    def setUp(self):
+        manager = User.objects.create_user(username='chef', password='secret')
+        project = Project.objects.create(name='Chantier A', manager=manager)
+        self.task = Task.objects.create(title='Tâche', project=project, status='todo')
+
+    def test_clean_checks_transition_without_query(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.status = 'done'
+        with self.assertNumQueries(0):
+            with self.assertRaises(ValidationError) as context:
+                task.clean()
+        self.assertIn('status', context.exception.message_dict)
+
+        task.status = 'in_progress'
+        with self.assertNumQueries(0):
+            task.clean()
+
+    def test_save_writes_only_changed_columns(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.status = 'in_progress'
+        with CaptureQueriesContext(connection) as context:
+            task.save()
+        sql = context.captured_queries[0]['sql']
+        self.assertIn('"status"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"title"', sql)
+        self.assertEqual(task.get_loaded_value('status'), 'in_progress')
+
+    def test_changed_fields(self):
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual(task.changed_fields(), [])
+        task.title = 'Nouveau titre'
+        task.assigned_to_id = None
+        self.assertEqual(task.changed_fields(), ['title'])
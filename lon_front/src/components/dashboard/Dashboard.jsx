@@ -52,39 +52,16 @@ function Dashboard() {
         const fetchDashboardData = async () => {
             setLoading(true);
             try {
-                // Récupérer les projets au lieu des statistiques
-                const projectsResponse = await axios.get('/api/projects/');
-                
-                if (Array.isArray(projectsResponse.data)) {
-                    // Calculer les statistiques à partir des projets
-                    setStats({
-                        projects: projectsResponse.data.length,
-                        clients: new Set(projectsResponse.data.map(p => p.client)).size,
-                        invoices: 0,
-                        quotes: 0
-                    });
-                    
-                    // Utiliser les projets récents
-                    setRecentProjects(projectsResponse.data.slice(0, 5));
-                }
-                
-                // Données d'activités fictives pour le moment
-                setRecentActivities([
-                    {
-                        id: 1,
-                        type: 'PROJECT_CREATED',
-                        description: 'Nouveau projet créé',
-                        user_name: user?.username || 'Utilisateur',
-                        created_at: new Date().toISOString()
-                    },
-                    {
-                        id: 2,
-                        type: 'CLIENT_CREATED',
-                        description: 'Nouveau client ajouté',
-                        user_name: user?.username || 'Utilisateur',
-                        created_at: new Date(Date.now() - 86400000).toISOString()
-                    }
-                ]);
+                // Résumé calculé côté serveur
+                const { data } = await axios.get('/api/dashboard/summary/');
+                setStats({
+                    projects: data.projects.total,
+                    clients: data.projects.clients,
+                    invoices: 0,
+                    quotes: 0
+                });
+                setRecentProjects(data.recent_projects);
+                setRecentActivities(data.recent_activities);
             } catch (error) {
                 console.error('Erreur lors de la récupération des données du tableau de bord:', error);
                 // Données de secours en cas d'erreur
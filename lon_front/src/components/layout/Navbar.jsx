@@ -32,6 +32,7 @@ import {
     Clear as ClearIcon
 } from '@mui/icons-material';
 import { useAuth } from '../../hooks/useAuth';
+import { useRealtime } from '../../hooks/useRealtime';
 import { useNavigate } from 'react-router-dom';
 import { alpha, styled } from '@mui/material/styles';
 import axios from 'axios';
@@ -87,58 +88,45 @@ function Navbar() {
     const [searchAnchorEl, setSearchAnchorEl] = useState(null);
     const [isSearching, setIsSearching] = useState(false);
 
-    // Récupérer les notifications
+    // Notifications poussées par le serveur
+    const realtimeConnected = useRealtime(() => setUnreadCount(count => count + 1));
+
+    // Interroger le compteur de notifications non lues (servi depuis le cache)
     useEffect(() => {
-        const fetchNotifications = async () => {
+        const fetchUnreadCount = async () => {
             try {
-                // Utiliser des notifications fictives au lieu de l'API
-                const mockNotifications = [
-                    {
-                        id: 1,
-                        title: 'Nouveau projet',
-                        message: 'Un nouveau projet a été créé',
-                        created_at: new Date().toISOString(),
-                        read: false
-                    },
-                    {
-                        id: 2,
-                        title: 'Tâche terminée',
-                        message: 'Une tâche a été marquée comme terminée',
-                        created_at: new Date(Date.now() - 3600000).toISOString(),
-                        read: false
-                    }
-                ];
-                
-                setNotifications(mockNotifications);
-                setUnreadCount(mockNotifications.filter(n => !n.read).length);
+                const { data } = await axios.get('/api/notifications/unread_count/');
+                setUnreadCount(data.unread_count);
             } catch (error) {
                 console.error('Erreur lors de la récupération des notifications:', error);
-                setNotifications([]);
                 setUnreadCount(0);
             }
         };
 
-        fetchNotifications();
+        fetchUnreadCount();
         
-        // Rafraîchir les notifications toutes les 30 secondes
-        const interval = setInterval(fetchNotifications, 30000);
+        // Flux temps réel ouvert : simple resynchronisation toutes les 5 minutes ;
+        // sinon (serveur WSGI, flux coupé), interrogation toutes les 30 secondes
+        const interval = setInterval(fetchUnreadCount, realtimeConnected ? 300000 : 30000);
         
         return () => clearInterval(interval);
-    }, []);
+    }, [realtimeConnected]);
+
+    // Charger les dernières notifications à l'ouverture du menu
+    const fetchNotifications = async () => {
+        try {
+            const { data } = await axios.get('/api/notifications/', { params: { page_size: 10 } });
+            setNotifications(data.results.map(notif => ({ ...notif, read: notif.is_read })));
+        } catch (error) {
+            console.error('Erreur lors de la récupération des notifications:', error);
+            setNotifications([]);
+        }
+    };
 
     // Marquer les notifications comme lues
     const markNotificationsAsRead = async () => {
         try {
-            await axios.post('/api/notifications/mark-read', {}, {
-                headers: {
-                    Authorization: `Bearer ${localStorage.getItem('token')}`
-                }
-            });
-            
-            // Mettre à jour l'état local
-            setNotifications(prev => 
-                prev.map(notif => ({ ...notif, read: true }))
-            );
+            await axios.post('/api/notifications/mark_all_read/');
             setUnreadCount(0);
         } catch (error) {
             console.error('Erreur lors du marquage des notifications:', error);
@@ -215,6 +203,7 @@ function Navbar() {
     // Gestion des notifications
     const handleNotificationOpen = (event) => {
         setNotificationAnchorEl(event.currentTarget);
+        fetchNotifications();
         // Marquer les notifications comme lues
         if (unreadCount > 0) {
             markNotificationsAsRead();
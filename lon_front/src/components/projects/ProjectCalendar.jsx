@@ -31,7 +31,7 @@ import { Calendar, dateFnsLocalizer } from 'react-big-calendar';
 import { format, parse, startOfWeek, getDay, addMonths, subMonths } from 'date-fns';
 import { fr } from 'date-fns/locale';
 import 'react-big-calendar/lib/css/react-big-calendar.css';
-import api from '../../services/api';
+import api, { fetchAll } from '../../services/api';
 import TaskDialog from '../tasks/TaskDialog';
 import TaskDetailsDialog from '../tasks/TaskDetailsDialog';
 
@@ -161,8 +161,7 @@ function ProjectCalendar() {
 
     const fetchProjects = async () => {
         try {
-            const response = await api.get('/api/projects/');
-            setProjects(response.data);
+            setProjects(await fetchAll('/api/projects/'));
         } catch (err) {
             console.error('Erreur lors de la récupération des projets:', err);
         }
@@ -186,14 +185,11 @@ function ProjectCalendar() {
             
             if (selectedProject) params.project = selectedProject;
 
-            // Construire l'URL avec les paramètres
-            const queryString = new URLSearchParams(params).toString();
-            const url = `/api/tasks/${queryString ? `?${queryString}` : ''}`;
-
-            const response = await api.get(url);
+            // Toutes les pages de la liste filtrée
+            const tasks = await fetchAll('/api/tasks/', { params });
             
             // Filtrer les tâches selon les filtres actuels
-            let filteredTasks = response.data;
+            let filteredTasks = tasks;
             
             if (filters.statuses.length > 0) {
                 filteredTasks = filteredTasks.filter(task => filters.statuses.includes(task.status));
@@ -16,7 +16,7 @@ import {
     Autocomplete,
     Chip
 } from '@mui/material';
-import api from '../../services/api';
+import api, { fetchAll } from '../../services/api';
 
 function ProjectDialog({ open, onClose, project = null }) {
     const [formData, setFormData] = useState({
@@ -73,8 +73,7 @@ function ProjectDialog({ open, onClose, project = null }) {
     const fetchClients = async () => {
         try {
             setClientsLoading(true);
-            const response = await api.get('/api/clients/');
-            setClients(response.data);
+            setClients(await fetchAll('/api/clients/'));
         } catch (error) {
             console.error('Erreur lors de la récupération des clients:', error);
         } finally {
@@ -85,8 +84,7 @@ function ProjectDialog({ open, onClose, project = null }) {
     const fetchUsers = async () => {
         try {
             setUsersLoading(true);
-            const response = await api.get('/api/users/');
-            setUsers(response.data);
+            setUsers(await fetchAll('/api/users/'));
         } catch (error) {
             console.error('Erreur lors de la récupération des utilisateurs:', error);
         } finally {
@@ -42,7 +42,7 @@ import {
 } from '@mui/icons-material';
 import { styled } from '@mui/material/styles';
 import { DragDropContext, Droppable, Draggable } from '@hello-pangea/dnd';
-import api from '../../services/api';
+import api, { fetchAll } from '../../services/api';
 import ProjectDialog from './ProjectDialog';
 
 // Styles pour le tableau Kanban
@@ -117,7 +117,7 @@ function ProjectKanban() {
             setLoading(true);
             setError(null);
             
-            const response = await api.get('/api/projects/');
+            const projectList = await fetchAll('/api/projects/');
             
             // Réinitialiser les projets avant de les regrouper par statut
             const groupedProjects = {
@@ -129,7 +129,7 @@ function ProjectKanban() {
             };
             
             // Regrouper les projets par statut
-            response.data.forEach(project => {
+            projectList.forEach(project => {
                 if (groupedProjects[project.status]) {
                     groupedProjects[project.status].push(project);
                 }
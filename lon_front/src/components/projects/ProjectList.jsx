@@ -27,12 +27,13 @@ import {
     Visibility as ViewIcon,
     Refresh as RefreshIcon
 } from '@mui/icons-material';
-import api from '../../services/api';
+import api, { fetchPage } from '../../services/api';
 import ProjectDialog from './ProjectDialog';
 
 function ProjectList() {
     const navigate = useNavigate();
     const [projects, setProjects] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [openDialog, setOpenDialog] = useState(false);
@@ -44,13 +45,15 @@ function ProjectList() {
         fetchProjects();
     }, []);
 
-    const fetchProjects = async () => {
+    // Première page, puis les suivantes à la demande ("Afficher plus")
+    const fetchProjects = async (url = null) => {
         try {
             setLoading(true);
             setError(null);
-            const response = await api.get('/api/projects/');
-            console.log('Projets récupérés:', response.data);
-            setProjects(response.data);
+            const page = await fetchPage(url || '/api/projects/');
+            console.log('Projets récupérés:', page.results);
+            setProjects(url ? [...projects, ...page.results] : page.results);
+            setNextPage(page.next);
         } catch (error) {
             console.error('Erreur lors de la récupération des projets:', error);
             setError("Impossible de charger les projets. Veuillez réessayer.");
@@ -133,7 +136,7 @@ function ProjectList() {
                     <Button 
                         variant="outlined"
                         startIcon={<RefreshIcon />}
-                        onClick={fetchProjects}
+                        onClick={() => fetchProjects()}
                         sx={{ mr: 1 }}
                     >
                         Actualiser
@@ -225,6 +228,14 @@ function ProjectList() {
                 </TableContainer>
             )}
 
+            {nextPage && (
+                <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+                    <Button onClick={() => fetchProjects(nextPage)} disabled={loading}>
+                        Afficher plus
+                    </Button>
+                </Box>
+            )}
+
             <ProjectDialog 
                 open={openDialog} 
                 onClose={handleCloseDialog} 
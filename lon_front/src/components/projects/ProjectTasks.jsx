@@ -33,12 +33,13 @@ import {
     Refresh as RefreshIcon,
     Assignment as AssignmentIcon
 } from '@mui/icons-material';
-import api from '../../services/api';
+import api, { fetchPage } from '../../services/api';
 import TaskDialog from '../tasks/TaskDialog';
 import ConfirmDialog from '../common/ConfirmDialog';
 
 function ProjectTasks({ projectId }) {
     const [tasks, setTasks] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [taskDialogOpen, setTaskDialogOpen] = useState(false);
@@ -53,14 +54,16 @@ function ProjectTasks({ projectId }) {
         fetchTasks();
     }, [projectId]);
 
-    const fetchTasks = async () => {
+    // Première page, puis les suivantes à la demande ("Afficher plus")
+    const fetchTasks = async (url = null) => {
         try {
             setLoading(true);
             setError(null);
             
-            const response = await api.get(`/api/tasks/project/${projectId}/`);
+            const page = await fetchPage(url || `/api/tasks/project/${projectId}/`);
             
-            setTasks(response.data);
+            setTasks(url ? [...tasks, ...page.results] : page.results);
+            setNextPage(page.next);
         } catch (err) {
             console.error('Erreur lors de la récupération des tâches:', err);
             setError('Impossible de charger les tâches');
@@ -279,6 +282,14 @@ function ProjectTasks({ projectId }) {
                 </TableContainer>
             )}
 
+            {nextPage && (
+                <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+                    <Button onClick={() => fetchTasks(nextPage)} disabled={loading}>
+                        Afficher plus
+                    </Button>
+                </Box>
+            )}
+
             <TaskDialog
                 open={taskDialogOpen} 
                 onClose={handleTaskDialogClose} 
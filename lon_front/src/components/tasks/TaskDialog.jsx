@@ -18,7 +18,7 @@ import {
     IconButton
 } from '@mui/material';
 import { CalendarToday as CalendarIcon } from '@mui/icons-material';
-import api from '../../services/api';
+import api, { fetchAll } from '../../services/api';
 
 function TaskDialog({ open, onClose, task, projectId, initialDate }) {
     const [formData, setFormData] = useState({
@@ -77,8 +77,7 @@ function TaskDialog({ open, onClose, task, projectId, initialDate }) {
     const fetchUsers = async () => {
         try {
             setFetchingUsers(true);
-            const response = await api.get('/api/users/');
-            setUsers(response.data);
+            setUsers(await fetchAll('/api/users/'));
         } catch (err) {
             console.error('Erreur lors de la récupération des utilisateurs:', err);
         } finally {
@@ -90,8 +89,7 @@ function TaskDialog({ open, onClose, task, projectId, initialDate }) {
     const fetchProjects = async () => {
         try {
             setFetchingProjects(true);
-            const response = await api.get('/api/projects/');
-            setProjects(response.data);
+            setProjects(await fetchAll('/api/projects/'));
         } catch (err) {
             console.error('Erreur lors de la récupération des projets:', err);
         } finally {
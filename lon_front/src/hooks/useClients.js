@@ -1,13 +1,12 @@
 import { useQuery } from '@tanstack/react-query';
-import api from '../services/api';
+import { fetchAll } from '../services/api';
 
 export function useClients() {
     return useQuery({
         queryKey: ['clients'],
         queryFn: async () => {
             try {
-                const response = await api.get('/api/clients/');
-                return response.data;
+                return await fetchAll('/api/clients/');
             } catch (error) {
                 console.error('Erreur lors de la récupération des clients:', error);
                 throw error;
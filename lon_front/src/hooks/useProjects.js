@@ -2,17 +2,25 @@ import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 
 async function fetchProjects() {
     const token = localStorage.getItem('access_token');
-    const response = await fetch('http://127.0.0.1:8000/api/projects/', {
-        headers: {
-            'Authorization': `Bearer ${token}`
+    // Liste paginée ({ next, results }) : suivre les liens `next` jusqu'à la fin
+    const projects = [];
+    let url = 'http://127.0.0.1:8000/api/projects/?page_size=500';
+    while (url) {
+        const response = await fetch(url, {
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+
+        if (!response.ok) {
+            throw new Error('Erreur lors de la récupération des projets');
         }
-    });
-    
-    if (!response.ok) {
-        throw new Error('Erreur lors de la récupération des projets');
+
+        const page = await response.json();
+        projects.push(...page.results);
+        url = page.next;
     }
-    
-    return response.json();
+    return projects;
 }
 
 async function fetchProject(id) {
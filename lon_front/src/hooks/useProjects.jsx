@@ -7,9 +7,9 @@ export const useProjects = () => {
         queryFn: async () => {
             try {
                 console.log('Fetching projects...');
-                const response = await projectsApi.getAll();
-                console.log('Projects response:', response);
-                return response.data;
+                const projects = await projectsApi.getAll();
+                console.log('Projects response:', projects);
+                return projects;
             } catch (error) {
                 console.error('Error fetching projects:', error);
                 throw error;
@@ -0,0 +1,75 @@
+import { useEffect, useRef, useState } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import axios from 'axios';
+import api from '../services/api';
+
+// Événements poussés par le serveur (voir lon/realtime)
+const TASK_EVENTS = ['task.status_changed', 'task.assigned'];
+const NOTIFICATION_EVENTS = ['notification.created'];
+
+// Délai avant une nouvelle tentative après la fermeture du flux
+const RECONNECT_DELAY = 10000;
+
+// S'abonne au flux Server-Sent Events : les événements de tâches invalident
+// le cache des tâches, les nouvelles notifications sont transmises à onNotification.
+// Retourne true tant que le flux est ouvert ; sinon (serveur WSGI, flux
+// coupé), l'appelant se rabat sur l'interrogation périodique.
+export function useRealtime(onNotification) {
+    const queryClient = useQueryClient();
+    const onNotificationRef = useRef(onNotification);
+    onNotificationRef.current = onNotification;
+    const [connected, setConnected] = useState(false);
+
+    useEffect(() => {
+        if (!localStorage.getItem('token') || typeof EventSource === 'undefined') return undefined;
+
+        let source = null;
+        let retry = null;
+        let cancelled = false;
+
+        const connect = async () => {
+            // EventSource ne permet pas d'envoyer l'en-tête Authorization :
+            // ticket à usage unique, le jeton d'accès ne figure pas dans l'URL
+            let response;
+            try {
+                response = await api.post('/api/realtime/ticket/');
+            } catch (error) {
+                if (!cancelled) retry = setTimeout(connect, RECONNECT_DELAY);
+                return;
+            }
+            // 204 : flux non servi (WSGI)
+            if (cancelled || response.status === 204) return;
+
+            const base = axios.defaults.baseURL || '';
+            source = new EventSource(
+                `${base}/api/realtime/stream/?ticket=${encodeURIComponent(response.data.ticket)}`
+            );
+            source.onopen = () => setConnected(true);
+            source.onerror = () => {
+                // Le ticket est consommé : reconnexion avec un nouveau ticket
+                setConnected(false);
+                source.close();
+                if (!cancelled) retry = setTimeout(connect, RECONNECT_DELAY);
+            };
+            TASK_EVENTS.forEach(type => source.addEventListener(type, () => {
+                queryClient.invalidateQueries({ queryKey: ['tasks'] });
+            }));
+            NOTIFICATION_EVENTS.forEach(type => source.addEventListener(type, event => {
+                if (onNotificationRef.current) {
+                    onNotificationRef.current(JSON.parse(event.data));
+                }
+            }));
+        };
+
+        connect();
+
+        return () => {
+            cancelled = true;
+            clearTimeout(retry);
+            if (source) source.close();
+            setConnected(false);
+        };
+    }, [queryClient]);
+
+    return connected;
+}
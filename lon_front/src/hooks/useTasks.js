@@ -6,18 +6,26 @@ export function useTasks(projectId) {
         queryKey: ['tasks', projectId],
         queryFn: async () => {
             const token = localStorage.getItem('access_token');
-            // Utiliser le filtre par projet
-            const response = await fetch(`http://127.0.0.1:8000/api/tasks/?project=${projectId}`, {
-                headers: {
-                    'Authorization': `Bearer ${token}`
+            // Utiliser le filtre par projet ; liste paginée ({ next, results }) :
+            // suivre les liens `next` jusqu'à la fin
+            const tasks = [];
+            let url = `http://127.0.0.1:8000/api/tasks/?project=${projectId}&page_size=500`;
+            while (url) {
+                const response = await fetch(url, {
+                    headers: {
+                        'Authorization': `Bearer ${token}`
+                    }
+                });
+
+                if (!response.ok) {
+                    throw new Error('Erreur lors de la récupération des tâches');
                 }
-            });
-            
-            if (!response.ok) {
-                throw new Error('Erreur lors de la récupération des tâches');
+
+                const page = await response.json();
+                tasks.push(...page.results);
+                url = page.next;
             }
-            
-            return response.json();
+            return tasks;
         },
         enabled: !!projectId
     });
@@ -6,9 +6,9 @@ export const useTasks = () => {
     return useQuery({
         queryKey: ['tasks'],
         queryFn: async () => {
-            const response = await tasksApi.getAll();
-            console.log('Réponse API tasks:', response.data);
-            return response.data;
+            const tasks = await tasksApi.getAll();
+            console.log('Réponse API tasks:', tasks);
+            return tasks;
         },
         refetchOnWindowFocus: true,
         refetchOnMount: true
@@ -1,13 +1,12 @@
 import { useQuery } from '@tanstack/react-query';
-import api from '../services/api';
+import { fetchAll } from '../services/api';
 
 export function useUsers() {
     return useQuery({
         queryKey: ['users'],
         queryFn: async () => {
             try {
-                const response = await api.get('/api/users/');
-                return response.data;
+                return await fetchAll('/api/users/');
             } catch (error) {
                 console.error('Erreur lors de la récupération des utilisateurs:', error);
                 throw error;
@@ -1,12 +1,11 @@
 import { useQuery } from '@tanstack/react-query';
-import api from '../services/api';
+import { fetchAll } from '../services/api';
 
 export const useUsers = () => {
     return useQuery({
         queryKey: ['users'],
         queryFn: async () => {
-            const response = await api.get('/api/users/');
-            return response.data;
+            return fetchAll('/api/users/');
         }
     });
 };
\ No newline at end of file
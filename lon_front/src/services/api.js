@@ -84,4 +84,31 @@ api.interceptors.response.use(
     }
 );
 
-export default api;
\ No newline at end of file
+// Taille de page maximale acceptée par l'API
+export const MAX_PAGE_SIZE = 500;
+
+// Lit une seule page d'une liste paginée ({ next, results }) à la taille de
+// page par défaut du serveur ; passer `next` pour obtenir la page suivante.
+export async function fetchPage(url, config = {}) {
+    const response = await api.get(url, config);
+    return response.data;
+}
+
+// Réservé aux sélecteurs qui ont besoin de la liste entière : lit toutes les pages
+// en suivant les liens `next` et retourne le tableau complet des éléments.
+export async function fetchAll(url, config = {}) {
+    const items = [];
+    let response = await api.get(url, {
+        ...config,
+        params: { page_size: MAX_PAGE_SIZE, ...config.params }
+    });
+    items.push(...response.data.results);
+    while (response.data.next) {
+        // Le lien `next` contient déjà tous les paramètres de la requête
+        response = await api.get(response.data.next, { ...config, params: undefined });
+        items.push(...response.data.results);
+    }
+    return items;
+}
+
+export default api;
@@ -1,7 +1,8 @@
-import api from './api';
+import api, { fetchAll } from './api';
 
 export const projectsApi = {
-    getAll: () => api.get('/api/projects/'),
+    // Tableau de tous les projets (toutes les pages)
+    getAll: () => fetchAll('/api/projects/'),
     getById: (id) => api.get(`/api/projects/${id}/`),
     create: (data) => api.post('/api/projects/', data),
     update: (id, data) => api.put(`/api/projects/${id}/`, data),
@@ -1,10 +1,11 @@
-import api from './api';
+import api, { fetchAll } from './api';
 
 export const tasksApi = {
+    // Tableau de toutes les tâches (toutes les pages)
     getAll: async () => {
-        const response = await api.get('/api/tasks/');
-        console.log('Réponse getAll:', response.data);
-        return response;
+        const tasks = await fetchAll('/api/tasks/');
+        console.log('Réponse getAll:', tasks);
+        return tasks;
     },
     getById: (id) => api.get(`/api/tasks/${id}/`),
     create: async (data) => {